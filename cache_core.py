@@ -7,6 +7,11 @@ if current_dir not in sys.path:
     sys.path.append(current_dir)
 
 if __name__ == "__main__":
+    # Modo sin interfaz: python -m cache_core bench --suite cpu,disk --json
+    from cli import COMMANDS, run_cli
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS + ("-h", "--help"):
+        sys.exit(run_cli(sys.argv[1:]))
+
     try:
         from main import main
     except ImportError as e:
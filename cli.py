@@ -0,0 +1,435 @@
+"""Interfaz de línea de comandos sin Qt.
+
+Ejemplos:
+    python -m cache_core bench --suite cpu,disk --json
+    python -m cache_core bench --suite general --ndjson
+    python -m cache_core maintenance --ndjson
+    python -m cache_core cleanup --dry-run --older-than 24 --exclude "*.log" --json
+    python -m cache_core optimize --profile gamer --json
+    python -m cache_core optimize --profile gamer --dry-run
+    python -m cache_core optimize --profile gamer --verify --json
+    python -m cache_core rollback --list
+    python -m cache_core experiment --profile gamer --metric scheduler_jitter --mode bisect --json
+    python -m cache_core reports --days 30 --metric freed_bytes --json
+    python -m cache_core diskusage --path D:\\ --top 30 --ndjson
+"""
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+
+COMMANDS = ("bench", "maintenance", "cleanup", "optimize", "reports", "diskusage", "rollback", "experiment")
+
+# Alias de suite -> benchmarks individuales
+SUITES = {
+    "cpu": ["cpu_single", "cpu_multi"],
+    "ram": ["ram_write", "ram_read"],
+    "disk": ["disk_write", "disk_read"],
+    "network": ["network_latency"],
+    "general": ["general"],
+    "all": ["cpu_single", "cpu_multi", "ram_write", "ram_read",
+            "disk_write", "disk_read", "network_latency"]
+}
+
+
+class OutputWriter:
+    """Emite progreso y resultados como texto, JSON o NDJSON"""
+
+    def __init__(self, mode):
+        self.mode = mode
+
+    def _emit(self, record):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    def log(self, message):
+        if self.mode == "ndjson":
+            self._emit({"event": "log", "time": datetime.now().isoformat(), "message": message})
+        elif self.mode == "json":
+            # En modo JSON stdout sólo lleva el documento final
+            sys.stderr.write(message + "\n")
+        else:
+            print(message, flush=True)
+
+    def result(self, name, result):
+        if self.mode == "ndjson":
+            self._emit({"event": "result", "name": name, "result": result})
+        elif self.mode == "text":
+            print(f"[RESULT] {name}: {json.dumps(result, ensure_ascii=False)}", flush=True)
+
+    def finish(self, document):
+        if self.mode == "ndjson":
+            self._emit(dict(document, event="done"))
+        elif self.mode == "json":
+            sys.stdout.write(json.dumps(document, ensure_ascii=False, indent=2) + "\n")
+        else:
+            print(f"[OK] Finalizado en {document['elapsed_s']:.1f}s", flush=True)
+
+
+def _resolve_suite(suite):
+    names = []
+    for item in suite.split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        for name in SUITES.get(item, [item]):
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def _run_bench(args, out):
+    from features.benchmarks import (CPUBenchmark, RAMBenchmark, DiskBenchmark,
+                                     NetworkBenchmark, GeneralBenchmark, BenchmarkManager)
+
+    functions = {
+        "cpu_single": CPUBenchmark.run_single_core,
+        "cpu_multi": CPUBenchmark.run_multi_core,
+        "ram_write": RAMBenchmark.run_write_test,
+        "ram_read": RAMBenchmark.run_read_test,
+        "disk_write": DiskBenchmark.run_sequential_write,
+        "disk_read": DiskBenchmark.run_sequential_read,
+        "network_latency": NetworkBenchmark.run_latency_test,
+        "general": lambda cb: GeneralBenchmark.run(cb, reuse=not args.no_reuse, save=not args.no_save,
+                                                   preflight=not args.no_preflight)
+    }
+
+    names = _resolve_suite(args.suite)
+    unknown = [n for n in names if n not in functions]
+    if unknown:
+        out.log(f"[ERR] Benchmark desconocido: {', '.join(unknown)}")
+        return {}, False
+
+    results = {}
+    ok = True
+    for name in names:
+        try:
+            if name == "general":
+                # El general hace su propio chequeo de reposo por componente
+                result = functions[name](out.log)
+            else:
+                result = BenchmarkManager.run_benchmark(functions[name], out.log,
+                                                        preflight=not args.no_preflight)
+        except Exception as e:
+            out.log(f"[ERR] Error en {name}: {e}")
+            ok = False
+            continue
+
+        if result and not args.no_save:
+            BenchmarkManager.save_result(name, result)
+        results[name] = result
+        out.result(name, result)
+
+    return results, ok
+
+
+def _build_cleanup_filter(args):
+    from features.cleanup import CleanupFilter
+
+    if args.older_than is None and args.min_size is None and args.max_size is None and not args.exclude:
+        return None
+    return CleanupFilter(older_than_hours=args.older_than, min_size=args.min_size,
+                         max_size=args.max_size, exclude=args.exclude)
+
+
+def _run_maintenance(args, out):
+    from features.maintenance import SystemMaintenance
+
+    disk_usage_root = None
+    if args.disk_usage is not None:
+        from features.diskusage import DiskUsageAnalyzer
+        disk_usage_root = args.disk_usage or DiskUsageAnalyzer.default_root()
+    record = SystemMaintenance.run_maintenance(out.log, cleanup_filter=_build_cleanup_filter(args),
+                                               disk_usage_root=disk_usage_root,
+                                               disk_usage_max_age=args.disk_usage_max_age)
+    out.result("maintenance", record)
+    return record, True
+
+
+def _run_cleanup(args, out):
+    from features.maintenance import SystemMaintenance
+
+    result = SystemMaintenance.run_temp_cleanup(out.log, dry_run=args.dry_run,
+                                                file_filter=_build_cleanup_filter(args),
+                                                use_index=not args.full)
+    out.result("cleanup", result)
+    return result, True
+
+
+def _run_optimize(args, out):
+    from utils.system import is_admin
+    from features.optimization import SystemOptimizer
+
+    if args.dry_run:
+        diff = SystemOptimizer.preview(args.profile)
+        for entry in diff:
+            if entry["pending"]:
+                out.log(f"[DIFF] {entry['name']}: {entry['current']} -> {entry['desired']}")
+        result = {"profile": args.profile, "dry_run": True,
+                  "pending": sum(1 for entry in diff if entry["pending"]), "diff": diff}
+        out.result("optimize", result)
+        return result, True
+
+    if not is_admin():
+        out.log("[ERR] Se necesitan permisos de administrador")
+        return {}, False
+
+    if args.profile == "gamer":
+        out.log("[GAMER] Iniciando OPTIMIZACIÓN GAMER...")
+    else:
+        out.log("[GENERAL] Iniciando OPTIMIZACIÓN GENERAL...")
+
+    if args.verify:
+        from features.verification import ImpactVerifier
+        result = ImpactVerifier.optimize_with_verification(args.profile, out.log)
+    else:
+        result = SystemOptimizer.apply_profile(args.profile, out.log)
+    out.result("optimize", result)
+    return result, result["success"]
+
+
+def _run_rollback(args, out):
+    from utils.system import is_admin
+    from features.journal import TweakJournal
+    from features.optimization import SystemOptimizer
+
+    if args.list:
+        sessions = [
+            {"id": s["id"], "label": s["label"], "started": s["started"],
+             "active": sum(1 for e in s["entries"] if e["status"] in ("pending", "applied")),
+             "entries": len(s["entries"])}
+            for s in TweakJournal(SystemOptimizer.journal_file).sessions
+        ]
+        result = {"sessions": sessions}
+        out.result("rollback", result)
+        return result, True
+
+    if not is_admin():
+        out.log("[ERR] Se necesitan permisos de administrador")
+        return {}, False
+
+    try:
+        summary = SystemOptimizer.rollback(out.log, session_id=args.session, tweak_name=args.tweak)
+    except KeyError as e:
+        out.log(f"[ERR] {e.args[0]}")
+        return {}, False
+    out.result("rollback", summary)
+    return summary, summary["failed"] == 0
+
+
+def _run_experiment(args, out):
+    from utils.system import is_admin
+    from features.benchmarks import BenchmarkManager
+    from features.experiments import TweakExperiment
+    from features.tweak_catalog import tweaks_for, find_tweak
+
+    if not is_admin():
+        out.log("[ERR] Se necesitan permisos de administrador")
+        return {}, False
+
+    if args.tweak:
+        tweaks = []
+        for name in args.tweak:
+            tweak = find_tweak(name)
+            if tweak is None:
+                out.log(f"[ERR] Ajuste desconocido: {name}")
+                return {}, False
+            tweaks.append(tweak)
+    else:
+        tweaks = tweaks_for(args.profile)
+
+    try:
+        experiment = TweakExperiment.for_probe(args.metric)
+    except ValueError as e:
+        out.log(f"[ERR] {e}")
+        return {}, False
+    result = experiment.run(tweaks, out.log, mode=args.mode)
+    if result["ranking"] and not args.no_save:
+        BenchmarkManager.save_result(TweakExperiment.RESULT_NAME, result)
+    out.result("experiment", result)
+    return result, True
+
+
+def _run_reports(args, out):
+    from datetime import timedelta
+    from features.environment import EnvironmentCapture
+    from features.reports import MaintenanceReportStore
+
+    store = MaintenanceReportStore()
+    if args.reindex:
+        out.log(f"[INFO] Índice reconstruido: {store.reindex()} informes")
+
+    # Por defecto, todo el historial de este equipo; --environment lo acota
+    # a informes con los mismos ajustes y fuente de energía
+    fingerprint = None if args.all_machines else EnvironmentCapture.machine_fingerprint()
+    environment_id = EnvironmentCapture.environment_id() if args.environment else None
+    since = (datetime.now() - timedelta(days=args.days)).isoformat(timespec="seconds") if args.days else None
+
+    if args.metric:
+        if args.metric not in MaintenanceReportStore.METRICS:
+            out.log(f"[ERR] Métrica desconocida: {args.metric} "
+                    f"(disponibles: {', '.join(MaintenanceReportStore.METRICS)})")
+            return {}, False
+        result = {"metric": args.metric,
+                  "trend": [{"timestamp": t, "value": v} for t, v in store.trend(args.metric, fingerprint, since, environment_id)]}
+    else:
+        result = {"reports": store.query(fingerprint, since, limit=args.limit,
+                                               environment_id=environment_id)}
+    out.result("reports", result)
+    return result, True
+
+
+def _run_diskusage(args, out):
+    from features.diskusage import DiskUsageAnalyzer
+
+    def progress(partial):
+        if out.mode == "ndjson":
+            out.result("partial", partial)
+        else:
+            out.log(f"[...] {partial['scanned_dirs']} carpetas, {partial['bytes'] / (1024**3):.1f} GB")
+
+    analyzer = DiskUsageAnalyzer(progress_callback=progress)
+    analysis = analyzer.analyze(args.path, use_cache=args.cached, max_age_hours=args.max_age)
+    if analysis["cached"]:
+        out.log(f"[INFO] Árbol de la caché ({datetime.fromtimestamp(analysis['timestamp']):%Y-%m-%d %H:%M})")
+
+    result = {
+        "root": analysis["root"],
+        "bytes": analysis["tree"]["bytes"],
+        "files": analysis["tree"]["files"],
+        "scanned_dirs": analysis["scanned_dirs"],
+        "cached": analysis["cached"],
+        "hotspots": DiskUsageAnalyzer.hotspots(analysis, args.top)
+    }
+    if args.tree:
+        result["tree"] = analysis["tree"]
+    out.result("diskusage", result)
+    return result, True
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cache_core", description="CacheCore sin interfaz gráfica")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_output_flags(sub):
+        group = sub.add_mutually_exclusive_group()
+        group.add_argument("--json", dest="output", action="store_const", const="json",
+                           help="Documento JSON final en stdout (progreso en stderr)")
+        group.add_argument("--ndjson", dest="output", action="store_const", const="ndjson",
+                           help="Progreso y resultados como JSON por línea")
+        sub.set_defaults(output="text")
+
+    bench = subparsers.add_parser("bench", help="Ejecuta benchmarks")
+    bench.add_argument("--suite", default="all",
+                       help="Lista separada por comas: cpu, ram, disk, network, general, all "
+                            "o nombres individuales (cpu_single, disk_read...)")
+    bench.add_argument("--no-save", action="store_true", help="No guardar en el historial")
+    bench.add_argument("--no-preflight", action="store_true", help="No esperar a que el sistema esté en reposo")
+    bench.add_argument("--no-reuse", action="store_true", help="El benchmark general re-mide todos los componentes")
+    add_output_flags(bench)
+
+    def add_filter_flags(sub):
+        sub.add_argument("--older-than", type=float, metavar="HORAS",
+                         help="Sólo archivos con más de N horas sin modificar")
+        sub.add_argument("--min-size", type=int, metavar="BYTES", help="Tamaño mínimo")
+        sub.add_argument("--max-size", type=int, metavar="BYTES", help="Tamaño máximo")
+        sub.add_argument("--exclude", action="append", metavar="GLOB",
+                         help="Patrón a excluir (se puede repetir)")
+
+    maintenance = subparsers.add_parser("maintenance", help="Ejecuta el mantenimiento completo")
+    maintenance.add_argument("--disk-usage", nargs="?", const="", metavar="RUTA",
+                             help="Incluye el análisis de espacio (por defecto la unidad del sistema)")
+    maintenance.add_argument("--disk-usage-max-age", type=float, metavar="HORAS",
+                             help="Reutiliza el último análisis de espacio si no es más viejo que esto")
+    add_filter_flags(maintenance)
+    add_output_flags(maintenance)
+
+    cleanup = subparsers.add_parser("cleanup", help="Limpia o analiza sólo los archivos temporales")
+    cleanup.add_argument("--dry-run", action="store_true",
+                         help="Sólo analiza: archivos, bytes recuperables, extensiones y antigüedad")
+    cleanup.add_argument("--full", action="store_true",
+                         help="Ignora el índice de directorios y recorre todo de nuevo")
+    add_filter_flags(cleanup)
+    add_output_flags(cleanup)
+
+    optimize = subparsers.add_parser("optimize", help="Aplica la optimización del sistema")
+    optimize.add_argument("--profile", choices=["general", "gamer"], default="general")
+    optimize.add_argument("--dry-run", action="store_true",
+                          help="Sólo muestra qué valores cambiarían (valor actual -> deseado)")
+    optimize.add_argument("--verify", action="store_true",
+                          help="Mide jitter, CPU y disco antes y después y guarda la comparación")
+    add_output_flags(optimize)
+
+    rollback = subparsers.add_parser("rollback", help="Deshace cambios usando el diario de valores previos")
+    rollback.add_argument("--session", help="Sesión a deshacer (por defecto la última con cambios vigentes)")
+    rollback.add_argument("--tweak", metavar="NOMBRE", help="Deshace sólo este ajuste (ruta\\valor o 'bcdedit ...')")
+    rollback.add_argument("--list", action="store_true", help="Lista las sesiones del diario")
+    add_output_flags(rollback)
+
+    experiment = subparsers.add_parser("experiment", help="Mide el efecto de cada ajuste por separado")
+    experiment.add_argument("--profile", choices=["general", "gamer"], default="general")
+    experiment.add_argument("--tweak", action="append", metavar="NOMBRE",
+                            help="Sólo estos ajustes (ruta\\valor; se puede repetir)")
+    experiment.add_argument("--metric", default="scheduler_jitter",
+                            help="Sonda a medir: scheduler_jitter, cpu_single_short o disk_random_io")
+    experiment.add_argument("--mode", choices=["bisect", "individual"], default="bisect",
+                            help="bisect prueba por grupos; individual mide cada ajuste por separado")
+    experiment.add_argument("--no-save", action="store_true", help="No guardar en el historial")
+    add_output_flags(experiment)
+
+    reports = subparsers.add_parser("reports", help="Consulta el historial de mantenimientos")
+    reports.add_argument("--days", type=float, help="Sólo los últimos N días")
+    reports.add_argument("--limit", type=int, default=20, help="Máximo de informes a listar")
+    reports.add_argument("--metric", help="Serie temporal de una métrica (freed_bytes, disk_write_mbs...)")
+    reports.add_argument("--all-machines", action="store_true", help="Incluye informes de otros equipos")
+    reports.add_argument("--environment", action="store_true",
+                         help="Sólo informes con el entorno actual (mismos ajustes y fuente de energía)")
+    reports.add_argument("--reindex", action="store_true", help="Reconstruye el índice desde el NDJSON")
+    add_output_flags(reports)
+
+    diskusage = subparsers.add_parser("diskusage", help="Busca las carpetas que más espacio ocupan")
+    diskusage.add_argument("--path", help="Carpeta o unidad a analizar (por defecto la unidad del sistema)")
+    diskusage.add_argument("--top", type=int, default=20, help="Cantidad de carpetas a listar")
+    diskusage.add_argument("--cached", action="store_true", help="Reabre el último árbol guardado si existe")
+    diskusage.add_argument("--max-age", type=float, metavar="HORAS", help="Antigüedad máxima aceptada con --cached")
+    diskusage.add_argument("--tree", action="store_true", help="Incluye el árbol completo (podado) en el resultado")
+    add_output_flags(diskusage)
+
+    return parser
+
+
+def run_cli(argv=None):
+    """Punto de entrada sin Qt. Devuelve el código de salida."""
+    args = build_parser().parse_args(argv)
+    out = OutputWriter(args.output)
+
+    handlers = {
+        "bench": _run_bench,
+        "maintenance": _run_maintenance,
+        "cleanup": _run_cleanup,
+        "optimize": _run_optimize,
+        "reports": _run_reports,
+        "diskusage": _run_diskusage,
+        "rollback": _run_rollback,
+        "experiment": _run_experiment
+    }
+
+    start = time.perf_counter()
+    try:
+        results, ok = handlers[args.command](args, out)
+    except Exception as e:
+        out.log(f"[ERR] {e}")
+        results, ok = {}, False
+
+    out.finish({
+        "command": args.command,
+        "success": ok,
+        "elapsed_s": round(time.perf_counter() - start, 3),
+        "results": results
+    })
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli())
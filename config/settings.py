@@ -1,7 +1,9 @@
 import os
 import sys
 import json
+import atexit
 import hashlib
+import threading
 
 # Configuración - Contraseña universal: 10020302
 CONFIG_FILE = "cache_core_config.cfg"
@@ -30,29 +32,133 @@ COLOR_HOVER = "#4C007D"
 
 MULTI_LINE_FONT = "Consolas"
 
-def load_config():
-    """Carga la configuración desde archivo"""
-    config_path = os.path.join(os.path.dirname(sys.argv[0]), CONFIG_FILE)
-    default_config = {
+# Ventana (minutos) en la que un sub-benchmark reciente se reutiliza en el
+# benchmark general. Se puede sobreescribir con 'benchmark_reuse_minutes'.
+BENCHMARK_REUSE_MINUTES = 30
+
+class ConfigManager:
+    """Configuración en memoria con escrituras atómicas y agrupadas.
+
+    El archivo se lee una sola vez y se combina con DEFAULTS (un archivo
+    parcial conserva los valores por defecto que no define). Los cambios
+    actualizan la copia en memoria; update() programa una escritura
+    diferida, así varios cambios seguidos se guardan juntos en una sola
+    escritura (archivo temporal + fsync + os.replace, nunca queda un
+    archivo a medias). replace() escribe al momento y devuelve si pudo.
+    flush() escribe lo pendiente al momento y se ejecuta también al salir.
+    Se puede usar desde cualquier hilo.
+    """
+
+    DEFAULTS = {
         'no_lazy_mode': False,
         'win_priority_control': False
     }
-    
-    try:
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                return json.load(f)
-    except Exception as e:
-        print(f"Error al cargar configuración: {e}")
-    return default_config
+    SAVE_DELAY = 0.5
 
-def save_config(config):
-    """Guarda la configuración en archivo"""
-    try:
-        config_path = os.path.join(os.path.dirname(sys.argv[0]), CONFIG_FILE)
-        with open(config_path, 'w') as f:
+    def __init__(self, path=None, save_delay=SAVE_DELAY):
+        self._path = path
+        self.save_delay = save_delay
+        self._lock = threading.RLock()
+        self._config = None
+        self._timer = None
+        self._dirty = False
+        self._atexit_registered = False
+
+    @property
+    def path(self):
+        return self._path or os.path.join(os.path.dirname(sys.argv[0]), CONFIG_FILE)
+
+    def _ensure_loaded(self):
+        if self._config is not None:
+            return
+        config = dict(self.DEFAULTS)
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    stored = json.load(f)
+                if isinstance(stored, dict):
+                    config.update(stored)
+        except Exception as e:
+            print(f"Error al cargar configuración: {e}")
+        self._config = config
+
+    def load(self):
+        """Copia de la configuración actual (se puede modificar sin afectar la caché)"""
+        with self._lock:
+            self._ensure_loaded()
+            return dict(self._config)
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._ensure_loaded()
+            return self._config.get(key, default)
+
+    def update(self, values=None, **kwargs):
+        """Modifica algunas claves y programa el guardado"""
+        with self._lock:
+            self._ensure_loaded()
+            self._config.update(values or {}, **kwargs)
+            self._schedule_save()
+
+    def replace(self, config):
+        """Reemplaza la configuración completa y la escribe ya. Devuelve False si falló"""
+        with self._lock:
+            self._config = dict(config)
+            self._dirty = True
+            return self.flush()
+
+    def reload(self):
+        """Descarta la caché: la próxima lectura vuelve al archivo (tras guardar lo pendiente)"""
+        with self._lock:
+            self.flush()
+            self._config = None
+
+    def _schedule_save(self):
+        self._dirty = True
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.save_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Escribe ya los cambios pendientes. Devuelve False si la escritura falló"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return True
+            try:
+                self._write(self._config)
+                self._dirty = False
+                return True
+            except Exception as e:
+                print(f"Error al guardar configuración: {e}")
+                return False
+
+    def _write(self, config):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(config, f)
-        return True
-    except Exception as e:
-        print(f"Error al guardar configuración: {e}")
-        return False
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+config_manager = ConfigManager()
+
+def load_config():
+    """Carga la configuración (desde la caché en memoria)"""
+    return config_manager.load()
+
+def save_config(config):
+    """Guarda la configuración en el momento y devuelve si la escritura funcionó.
+
+    Es sincrónica para que el resultado sea real y un cierre inesperado no
+    pierda el cambio; las escrituras agrupadas quedan para update().
+    """
+    return config_manager.replace(config)
@@ -1,19 +1,33 @@
+import gc
+import sys
 import time
 import os
 import json
+import math
 import psutil
 import threading
+from contextlib import contextmanager
 from datetime import datetime
 import multiprocessing
 
+from config.settings import BENCHMARK_REUSE_MINUTES, load_config
+from features.environment import EnvironmentCapture
+from features.quiescence import SystemQuiescence, LoadMonitor
+from features.monitor import SystemMonitor
+
 class BenchmarkManager:
     """Gestiona la ejecución y almacenamiento de benchmarks"""
     
     RESULTS_FILE = "data/benchmark_results.json"
     
+    @staticmethod
+    def machine_fingerprint():
+        """Huella del equipo (se calcula una vez por sesión)"""
+        return EnvironmentCapture.machine_fingerprint()
+    
     @staticmethod
     def save_result(benchmark_name, result):
-        """Guarda resultado de benchmark con timestamp"""
+        """Guarda resultado de benchmark con timestamp y referencia al entorno"""
         os.makedirs("data", exist_ok=True)
         
         # Cargar resultados existentes
@@ -25,6 +39,9 @@ class BenchmarkManager:
         
         results[benchmark_name].append({
             "timestamp": datetime.now().isoformat(),
+            "fingerprint": BenchmarkManager.machine_fingerprint(),
+            "environment": EnvironmentCapture.store(),
+            "cpu_freq_mhz": EnvironmentCapture.current_frequency(),
             "result": result
         })
         
@@ -52,6 +69,173 @@ class BenchmarkManager:
             if bench_results:
                 latest[bench_name] = bench_results[-1]
         return latest
+    
+    @staticmethod
+    def run_benchmark(benchmark_func, progress_callback=None, preflight=True):
+        """Ejecuta un benchmark tras el chequeo de reposo y registra la carga de fondo.
+        
+        Las ejecuciones contaminadas quedan marcadas con "noisy" y no se usan
+        como referencia ni para detectar regresiones.
+        """
+        preflight_result = None
+        if preflight:
+            preflight_result = SystemQuiescence.wait_until_quiet(progress_callback)
+        
+        monitor = LoadMonitor()
+        monitor.start()
+        try:
+            # El monitor de la aplicación no muestrea mientras corre el benchmark
+            with SystemMonitor.paused():
+                result = benchmark_func(progress_callback)
+        finally:
+            load = monitor.stop()
+        
+        if not result:
+            return result
+        
+        noisy = LoadMonitor.is_contaminated(load)
+        if preflight_result is not None:
+            load["preflight_quiet"] = preflight_result["quiet"]
+            load["preflight_wait_s"] = preflight_result["waited_s"]
+            noisy = noisy or not preflight_result["quiet"]
+        
+        result["background_load"] = load
+        result["noisy"] = noisy or bool(result.get("noisy"))
+        
+        if result["noisy"] and progress_callback:
+            progress_callback(f"[WARN] Ejecución con carga de fondo (CPU ajena {load['background_cpu_avg']}%): "
+                              "se excluye de referencias y comparaciones")
+        return result
+    
+    @staticmethod
+    def clean_entries(entries):
+        """Filtra las ejecuciones marcadas como ruidosas"""
+        return [e for e in entries if not e.get("result", {}).get("noisy")]
+    
+    @staticmethod
+    def get_fresh_result(benchmark_name, max_age_minutes=None, results=None):
+        """Devuelve (resultado, edad en minutos) si hay uno reciente y reutilizable.
+        
+        Es reutilizable si es de este mismo equipo, está dentro de la ventana
+        configurada y no se aplicó ninguna optimización después de medirlo.
+        """
+        if max_age_minutes is None:
+            max_age_minutes = load_config().get('benchmark_reuse_minutes', BENCHMARK_REUSE_MINUTES)
+        if max_age_minutes <= 0:
+            return None
+        
+        if results is None:
+            results = BenchmarkManager.load_results()
+        entries = BenchmarkManager.clean_entries(results.get(benchmark_name) or [])
+        if not entries:
+            return None
+        
+        latest = entries[-1]
+        if latest.get("fingerprint") != BenchmarkManager.machine_fingerprint():
+            return None
+        
+        try:
+            measured_at = datetime.fromisoformat(latest["timestamp"])
+        except (KeyError, ValueError):
+            return None
+        
+        age_minutes = (datetime.now() - measured_at).total_seconds() / 60
+        if age_minutes < 0 or age_minutes > max_age_minutes:
+            return None
+        
+        last_optimization = load_config().get('last_optimization')
+        if last_optimization:
+            try:
+                if datetime.fromisoformat(last_optimization) >= measured_at:
+                    return None
+            except ValueError:
+                pass
+        
+        return latest["result"], age_minutes
+
+
+class BenchmarkIsolation:
+    """Aísla el proceso durante un benchmark: prioridad, afinidad, GC y monitor.
+    
+    Uso:
+        with BenchmarkIsolation(cores=[0]) as isolation:
+            with isolation.timed():
+                ...  # sección medida, sin recolector de basura
+    
+    El monitor de fondo (SystemMonitor) se pausa mientras dura el bloque.
+    Todo se restaura al salir, también si el benchmark lanza una excepción.
+    """
+    
+    PAGE_SIZE = 4096
+    
+    def __init__(self, cores=None, raise_priority=True):
+        self.cores = cores
+        self.raise_priority = raise_priority
+        self._process = psutil.Process()
+        self._original_priority = None
+        self._original_affinity = None
+        self._paused_monitor = None
+    
+    def __enter__(self):
+        # El muestreo (y sus recorridos de procesos) corre en este mismo proceso
+        self._paused_monitor = SystemMonitor.current()
+        if self._paused_monitor is not None:
+            self._paused_monitor.pause()
+        
+        if self.raise_priority:
+            try:
+                self._original_priority = self._process.nice()
+                if sys.platform == "win32":
+                    self._process.nice(psutil.HIGH_PRIORITY_CLASS)
+                else:
+                    self._process.nice(max(-20, self._original_priority - 5))
+            except (psutil.AccessDenied, OSError):
+                self._original_priority = None
+        
+        if self.cores is not None:
+            try:
+                self._original_affinity = self._process.cpu_affinity()
+                self._process.cpu_affinity(self.cores)
+            except (AttributeError, psutil.AccessDenied, ValueError, OSError):
+                self._original_affinity = None
+        
+        # Partir de un heap limpio para que el GC no se dispare en mitad de una medición
+        gc.collect()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._paused_monitor is not None:
+            self._paused_monitor.resume()
+            self._paused_monitor = None
+        if self._original_affinity is not None:
+            try:
+                self._process.cpu_affinity(self._original_affinity)
+            except Exception:
+                pass
+        if self._original_priority is not None:
+            try:
+                self._process.nice(self._original_priority)
+            except Exception:
+                pass
+        return False
+    
+    @contextmanager
+    def timed(self):
+        """Sección medida: desactiva el GC y lo restaura al terminar"""
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            yield
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    
+    @staticmethod
+    def prefault(buffer):
+        """Toca cada página del buffer para que los page faults no caigan en la medición"""
+        for i in range(0, len(buffer), BenchmarkIsolation.PAGE_SIZE):
+            buffer[i] = 0
+        return buffer
 
 
 class CPUBenchmark:
@@ -63,34 +247,29 @@ class CPUBenchmark:
         if progress_callback:
             progress_callback("[>>] Iniciando benchmark CPU Single-Core (15 mediciones)...")
         
-        # Fijar a un solo core
-        p = psutil.Process()
-        original_affinity = p.cpu_affinity()
-        p.cpu_affinity([0])
-        
         measurements = []
         
-        for measurement in range(15):
-            if progress_callback:
-                progress_callback(f"[PROG] Medición {measurement + 1}/15...")
-            
-            start_time = time.perf_counter()
-            
-            # Cálculo matemático intensivo más realista
-            result = 0.0
-            iterations = 2000000
-            for i in range(iterations):
-                result += (i ** 0.5) * 1.234567
-                result = result % 1000000
-            
-            elapsed = time.perf_counter() - start_time
-            score = int(1000000 / elapsed)
-            measurements.append(score)
-            
-            time.sleep(0.1)  # Pequeña pausa entre mediciones
-        
-        # Restaurar affinity
-        p.cpu_affinity(original_affinity)
+        # Fijar a un solo core (la afinidad se restaura aunque falle el bucle)
+        with BenchmarkIsolation(cores=[0]) as isolation:
+            for measurement in range(15):
+                if progress_callback:
+                    progress_callback(f"[PROG] Medición {measurement + 1}/15...")
+                
+                with isolation.timed():
+                    start_time = time.perf_counter()
+                    
+                    # Cálculo matemático intensivo más realista
+                    result = 0.0
+                    iterations = 2000000
+                    for i in range(iterations):
+                        result += (i ** 0.5) * 1.234567
+                        result = result % 1000000
+                    
+                    elapsed = time.perf_counter() - start_time
+                score = int(1000000 / elapsed)
+                measurements.append(score)
+                
+                time.sleep(0.1)  # Pequeña pausa entre mediciones
         
         # Calcular promedio
         avg_score = int(sum(measurements) / len(measurements))
@@ -121,29 +300,31 @@ class CPUBenchmark:
         
         measurements = []
         
-        for measurement in range(15):
-            if progress_callback:
-                progress_callback(f"[PROG] Medición {measurement + 1}/15 ({cpu_count} threads)...")
-            
-            start_time = time.perf_counter()
-            
-            # Usar threading en vez de multiprocessing (mejor para Windows)
-            threads = []
-            iterations_per_thread = 500000
-            
-            for _ in range(cpu_count):
-                thread = threading.Thread(target=worker, args=(iterations_per_thread,))
-                threads.append(thread)
-                thread.start()
-            
-            for thread in threads:
-                thread.join()
-            
-            elapsed = time.perf_counter() - start_time
-            score = int((cpu_count * 1000000) / elapsed)
-            measurements.append(score)
-            
-            time.sleep(0.1)
+        with BenchmarkIsolation() as isolation:
+            for measurement in range(15):
+                if progress_callback:
+                    progress_callback(f"[PROG] Medición {measurement + 1}/15 ({cpu_count} threads)...")
+                
+                # Usar threading en vez de multiprocessing (mejor para Windows)
+                threads = []
+                iterations_per_thread = 500000
+                
+                with isolation.timed():
+                    start_time = time.perf_counter()
+                    
+                    for _ in range(cpu_count):
+                        thread = threading.Thread(target=worker, args=(iterations_per_thread,))
+                        threads.append(thread)
+                        thread.start()
+                    
+                    for thread in threads:
+                        thread.join()
+                    
+                    elapsed = time.perf_counter() - start_time
+                score = int((cpu_count * 1000000) / elapsed)
+                measurements.append(score)
+                
+                time.sleep(0.1)
         
         avg_score = int(sum(measurements) / len(measurements))
         
@@ -170,24 +351,28 @@ class RAMBenchmark:
         size_mb = 200
         measurements = []
         
-        for measurement in range(15):
-            if progress_callback:
-                progress_callback(f"[PROG] Medición {measurement + 1}/15...")
-            
-            array_size = size_mb * 1024 * 1024 // 8
-            
-            start_time = time.perf_counter()
-            
-            # Escritura más realista con diferentes patrones
-            data = bytearray(array_size)
-            for i in range(0, array_size, 1000):
-                data[i] = (i % 256)
-            
-            elapsed = time.perf_counter() - start_time
-            speed_mbs = size_mb / elapsed
-            measurements.append(speed_mbs)
-            
-            time.sleep(0.05)
+        with BenchmarkIsolation() as isolation:
+            for measurement in range(15):
+                if progress_callback:
+                    progress_callback(f"[PROG] Medición {measurement + 1}/15...")
+                
+                array_size = size_mb * 1024 * 1024 // 8
+                
+                # La reserva forma parte de la escritura medida; sólo se excluye el GC
+                with isolation.timed():
+                    start_time = time.perf_counter()
+                    
+                    # Escritura más realista con diferentes patrones
+                    data = bytearray(array_size)
+                    for i in range(0, array_size, 1000):
+                        data[i] = (i % 256)
+                    
+                    elapsed = time.perf_counter() - start_time
+                speed_mbs = size_mb / elapsed
+                measurements.append(speed_mbs)
+                del data
+                
+                time.sleep(0.05)
         
         avg_speed = sum(measurements) / len(measurements)
         
@@ -209,25 +394,28 @@ class RAMBenchmark:
         size_mb = 200
         measurements = []
         
-        for measurement in range(15):
-            if progress_callback:
-                progress_callback(f"[PROG] Medición {measurement + 1}/15...")
-            
-            array_size = size_mb * 1024 * 1024 // 8
-            data = bytes(array_size)
-            
-            start_time = time.perf_counter()
-            
-            # Lectura más realista
-            suma = 0
-            for i in range(0, array_size, 1000):
-                suma += data[i]
-            
-            elapsed = time.perf_counter() - start_time
-            speed_mbs = size_mb / elapsed
-            measurements.append(speed_mbs)
-            
-            time.sleep(0.05)
+        with BenchmarkIsolation() as isolation:
+            for measurement in range(15):
+                if progress_callback:
+                    progress_callback(f"[PROG] Medición {measurement + 1}/15...")
+                
+                array_size = size_mb * 1024 * 1024 // 8
+                data = BenchmarkIsolation.prefault(bytearray(array_size))
+                
+                with isolation.timed():
+                    start_time = time.perf_counter()
+                    
+                    # Lectura más realista
+                    suma = 0
+                    for i in range(0, array_size, 1000):
+                        suma += data[i]
+                    
+                    elapsed = time.perf_counter() - start_time
+                speed_mbs = size_mb / elapsed
+                measurements.append(speed_mbs)
+                del data
+                
+                time.sleep(0.05)
         
         avg_speed = sum(measurements) / len(measurements)
         
@@ -252,33 +440,36 @@ class DiskBenchmark:
         
         test_file = "benchmark_disk_test.tmp"
         file_size_mb = 50
+        chunk_size = 1024 * 1024
         measurements = []
         
-        for measurement in range(15):
-            if progress_callback:
-                progress_callback(f"[PROG] Medición {measurement + 1}/15...")
-            
-            chunk_size = 1024 * 1024
-            
-            start_time = time.perf_counter()
-            
-            with open(test_file, 'wb') as f:
-                data = os.urandom(chunk_size)
-                for _ in range(file_size_mb):
-                    f.write(data)
-                f.flush()
-                os.fsync(f.fileno())  # Asegurar escritura real al disco
-            
-            elapsed = time.perf_counter() - start_time
-            speed_mbs = file_size_mb / elapsed
-            measurements.append(speed_mbs)
-            
-            try:
-                os.remove(test_file)
-            except Exception:
-                pass
-            
-            time.sleep(0.1)
+        # Generar los datos fuera de la sección medida
+        data = BenchmarkIsolation.prefault(bytearray(os.urandom(chunk_size)))
+        
+        with BenchmarkIsolation() as isolation:
+            for measurement in range(15):
+                if progress_callback:
+                    progress_callback(f"[PROG] Medición {measurement + 1}/15...")
+                
+                with isolation.timed():
+                    start_time = time.perf_counter()
+                    
+                    with open(test_file, 'wb') as f:
+                        for _ in range(file_size_mb):
+                            f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())  # Asegurar escritura real al disco
+                    
+                    elapsed = time.perf_counter() - start_time
+                speed_mbs = file_size_mb / elapsed
+                measurements.append(speed_mbs)
+                
+                try:
+                    os.remove(test_file)
+                except Exception:
+                    pass
+                
+                time.sleep(0.1)
         
         avg_speed = sum(measurements) / len(measurements)
         
@@ -308,32 +499,35 @@ class DiskBenchmark:
                 f.write(data)
         
         measurements = []
+        buffer = BenchmarkIsolation.prefault(bytearray(chunk_size))
         
-        for measurement in range(15):
-            if progress_callback:
-                progress_callback(f"[PROG] Medición {measurement + 1}/15...")
-            
-            start_time = time.perf_counter()
-            
-            with open(test_file, 'rb') as f:
-                while True:
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-            
-            elapsed = time.perf_counter() - start_time
-            speed_mbs = file_size_mb / elapsed
-            measurements.append(speed_mbs)
-            
-            time.sleep(0.1)
+        try:
+            with BenchmarkIsolation() as isolation:
+                for measurement in range(15):
+                    if progress_callback:
+                        progress_callback(f"[PROG] Medición {measurement + 1}/15...")
+                    
+                    with isolation.timed():
+                        start_time = time.perf_counter()
+                        
+                        # Leer sobre un buffer ya reservado para no medir reservas de memoria
+                        with open(test_file, 'rb', buffering=0) as f:
+                            while f.readinto(buffer):
+                                pass
+                        
+                        elapsed = time.perf_counter() - start_time
+                    speed_mbs = file_size_mb / elapsed
+                    measurements.append(speed_mbs)
+                    
+                    time.sleep(0.1)
+        finally:
+            try:
+                os.remove(test_file)
+            except Exception:
+                pass
         
         avg_speed = sum(measurements) / len(measurements)
         
-        try:
-            os.remove(test_file)
-        except Exception:
-            pass
-        
         if progress_callback:
             progress_callback(f"[OK] Disk Read completado: {avg_speed:,.0f} MB/s")
         
@@ -355,22 +549,24 @@ class NetworkBenchmark:
         
         set_measurements = []
         
-        for set_num in range(15):
-            if progress_callback:
-                progress_callback(f"[PROG] Set {set_num + 1}/15...")
-            
-            latencies = []
-            for _ in range(10):
-                start = time.perf_counter_ns()
-                _ = psutil.net_io_counters()
-                end = time.perf_counter_ns()
-                latency_us = (end - start) / 1000
-                latencies.append(latency_us)
-                time.sleep(0.001)
-            
-            avg_in_set = sum(latencies) / len(latencies)
-            set_measurements.append(avg_in_set)
-            time.sleep(0.05)
+        with BenchmarkIsolation() as isolation:
+            for set_num in range(15):
+                if progress_callback:
+                    progress_callback(f"[PROG] Set {set_num + 1}/15...")
+                
+                latencies = []
+                for _ in range(10):
+                    with isolation.timed():
+                        start = time.perf_counter_ns()
+                        _ = psutil.net_io_counters()
+                        end = time.perf_counter_ns()
+                    latency_us = (end - start) / 1000
+                    latencies.append(latency_us)
+                    time.sleep(0.001)
+                
+                avg_in_set = sum(latencies) / len(latencies)
+                set_measurements.append(avg_in_set)
+                time.sleep(0.05)
         
         avg_latency = sum(set_measurements) / len(set_measurements)
         min_latency = min(set_measurements)
@@ -386,3 +582,247 @@ class NetworkBenchmark:
             "measurements": set_measurements,
             "unit": "μs"
         }
+
+
+class QuickBenchmark:
+    """Sondas cortas y de baja varianza para medir el efecto de una optimización.
+
+    Cada una toma 15 muestras breves en lugar de una medición larga, así el
+    antes/después se compara con intervalos de confianza y no con un único
+    número. Todas devuelven {"value", "measurements", "unit", "higher_is_better"}.
+    """
+    
+    SAMPLES = 15
+    
+    @staticmethod
+    def _result(measurements, unit, higher_is_better):
+        return {
+            "value": round(sum(measurements) / len(measurements), 2),
+            "measurements": [round(m, 2) for m in measurements],
+            "unit": unit,
+            "higher_is_better": higher_is_better
+        }
+    
+    @staticmethod
+    def run_scheduler_jitter(progress_callback=None):
+        """Retraso medio al despertar de sleep(1 ms): refleja timer y planificador"""
+        if progress_callback:
+            progress_callback("[>>] Midiendo jitter del planificador...")
+        
+        sleeps_per_sample = 20
+        measurements = []
+        with BenchmarkIsolation() as isolation:
+            for _ in range(QuickBenchmark.SAMPLES):
+                overshoot = 0
+                with isolation.timed():
+                    for _ in range(sleeps_per_sample):
+                        start = time.perf_counter_ns()
+                        time.sleep(0.001)
+                        overshoot += time.perf_counter_ns() - start - 1_000_000
+                measurements.append(overshoot / sleeps_per_sample / 1000)
+        
+        result = QuickBenchmark._result(measurements, "μs", False)
+        if progress_callback:
+            progress_callback(f"[OK] Jitter del planificador: {result['value']:,.1f} μs")
+        return result
+    
+    @staticmethod
+    def run_single_core_short(progress_callback=None):
+        """Versión corta del single-core (mismo cálculo, menos iteraciones)"""
+        if progress_callback:
+            progress_callback("[>>] Midiendo CPU single-core (corto)...")
+        
+        iterations = 300000
+        measurements = []
+        with BenchmarkIsolation(cores=[0]) as isolation:
+            for _ in range(QuickBenchmark.SAMPLES):
+                with isolation.timed():
+                    start_time = time.perf_counter()
+                    result = 0.0
+                    for i in range(iterations):
+                        result += (i ** 0.5) * 1.234567
+                        result = result % 1000000
+                    elapsed = time.perf_counter() - start_time
+                measurements.append(iterations / 2 / elapsed)
+        
+        result = QuickBenchmark._result(measurements, "ops/s", True)
+        if progress_callback:
+            progress_callback(f"[OK] Single-core corto: {result['value']:,.0f} ops/s")
+        return result
+    
+    @staticmethod
+    def run_disk_random_io(progress_callback=None):
+        """IOPS de escrituras aleatorias de 4 KiB confirmadas con fsync.
+
+        La lectura aleatoria desde Python cae en la caché del sistema; la
+        escritura con fsync sí llega al disco en cada muestra.
+        """
+        if progress_callback:
+            progress_callback("[>>] Midiendo I/O aleatorio de disco (4 KiB)...")
+        
+        import random
+        test_file = "benchmark_random_io.tmp"
+        block = 4096
+        blocks = 16 * 1024 * 1024 // block
+        writes_per_sample = 32
+        rng = random.Random(0)
+        data = BenchmarkIsolation.prefault(bytearray(os.urandom(block)))
+        measurements = []
+        
+        try:
+            with open(test_file, "wb") as f:
+                f.truncate(blocks * block)
+            with open(test_file, "r+b", buffering=0) as f, BenchmarkIsolation() as isolation:
+                for _ in range(QuickBenchmark.SAMPLES):
+                    offsets = [rng.randrange(blocks) * block for _ in range(writes_per_sample)]
+                    with isolation.timed():
+                        start_time = time.perf_counter()
+                        for offset in offsets:
+                            f.seek(offset)
+                            f.write(data)
+                        os.fsync(f.fileno())
+                        elapsed = time.perf_counter() - start_time
+                    measurements.append(writes_per_sample / elapsed)
+        finally:
+            try:
+                os.remove(test_file)
+            except Exception:
+                pass
+        
+        result = QuickBenchmark._result(measurements, "IOPS", True)
+        if progress_callback:
+            progress_callback(f"[OK] I/O aleatorio: {result['value']:,.0f} IOPS")
+        return result
+
+
+class GeneralBenchmark:
+    """Benchmark general - score calibrado contra una máquina de referencia"""
+    
+    # Máquina de referencia (score 100). Cada métrica se divide por su valor
+    # de referencia y los ratios se combinan con una media geométrica ponderada,
+    # así ninguna unidad (ops/s, MB/s, μs) domina el resultado.
+    REFERENCE_VERSION = "ref-2026.1"
+    REFERENCE_BASELINE = {
+        "cpu_single":      {"field": "score", "reference": 4500000,  "weight": 0.25, "higher_is_better": True},
+        "cpu_multi":       {"field": "score", "reference": 14500000, "weight": 0.20, "higher_is_better": True},
+        "ram_write":       {"field": "speed", "reference": 44000,    "weight": 0.10, "higher_is_better": True},
+        "ram_read":        {"field": "speed", "reference": 120000,   "weight": 0.10, "higher_is_better": True},
+        "disk_write":      {"field": "speed", "reference": 1000,     "weight": 0.125, "higher_is_better": True},
+        "disk_read":       {"field": "speed", "reference": 4000,     "weight": 0.125, "higher_is_better": True},
+        "network_latency": {"field": "avg",   "reference": 20,       "weight": 0.10, "higher_is_better": False},
+    }
+    
+    COMPONENTS = [
+        ("cpu_single", "CPU Single-Core", CPUBenchmark.run_single_core),
+        ("cpu_multi", "CPU Multi-Core", CPUBenchmark.run_multi_core),
+        ("ram_write", "RAM Write", RAMBenchmark.run_write_test),
+        ("ram_read", "RAM Read", RAMBenchmark.run_read_test),
+        ("disk_write", "Disk Write", DiskBenchmark.run_sequential_write),
+        ("disk_read", "Disk Read", DiskBenchmark.run_sequential_read),
+        ("network_latency", "Network Latency", NetworkBenchmark.run_latency_test)
+    ]
+    
+    @staticmethod
+    def normalize(metric, result):
+        """Devuelve el ratio contra la referencia (>1 = mejor que la referencia)"""
+        baseline = GeneralBenchmark.REFERENCE_BASELINE[metric]
+        value = result.get(baseline["field"]) if result else None
+        if not value or value <= 0:
+            return None
+        if baseline["higher_is_better"]:
+            return value / baseline["reference"]
+        return baseline["reference"] / value
+    
+    @staticmethod
+    def compute_score(component_results):
+        """Calcula el score general a partir de {metrica: resultado}"""
+        components = {}
+        log_sum = 0.0
+        weight_sum = 0.0
+        
+        for metric, result in component_results.items():
+            baseline = GeneralBenchmark.REFERENCE_BASELINE.get(metric)
+            if baseline is None:
+                continue
+            ratio = GeneralBenchmark.normalize(metric, result)
+            if ratio is None:
+                continue
+            
+            log_sum += baseline["weight"] * math.log(ratio)
+            weight_sum += baseline["weight"]
+            components[metric] = {
+                "value": result[baseline["field"]],
+                "unit": result.get("unit", ""),
+                "reference": baseline["reference"],
+                "normalized": round(ratio * 100, 2),
+                "weight": baseline["weight"],
+                "higher_is_better": baseline["higher_is_better"]
+            }
+        
+        if weight_sum == 0:
+            return {"score": 0, "detail": "No se pudo calcular", "components": {}}
+        
+        score = 100 * math.exp(log_sum / weight_sum)
+        return {
+            "score": round(score, 1),
+            "detail": f"Media geométrica ponderada de {len(components)} benchmarks",
+            "reference": GeneralBenchmark.REFERENCE_VERSION,
+            "components": components
+        }
+    
+    @staticmethod
+    def run(progress_callback=None, reuse=True, save=True, preflight=True):
+        """Ejecuta todos los benchmarks y calcula el score general.
+        
+        Con reuse=True los sub-resultados recientes del mismo equipo se
+        reutilizan en vez de volver a medirlos. Con save=False no se
+        escribe nada en el historial (ni los sub-resultados medidos) y con
+        preflight=False no se espera el reposo antes de cada componente.
+        """
+        if progress_callback:
+            progress_callback("[>>] Ejecutando suite completa de benchmarks...")
+        
+        component_results = {}
+        reused = []
+        measured = []
+        history = BenchmarkManager.load_results() if reuse else {}
+        
+        for metric, name, bench_func in GeneralBenchmark.COMPONENTS:
+            fresh = BenchmarkManager.get_fresh_result(metric, results=history) if reuse else None
+            if fresh:
+                component_results[metric], age_minutes = fresh
+                reused.append(metric)
+                if progress_callback:
+                    progress_callback(f"[INFO] {name} reutilizado (medido hace {age_minutes:.0f} min)")
+                continue
+            
+            try:
+                if progress_callback:
+                    progress_callback(f"[...] Ejecutando {name}...")
+                component_results[metric] = BenchmarkManager.run_benchmark(bench_func, progress_callback,
+                                                                          preflight=preflight)
+                measured.append(metric)
+                # Guardar el sub-resultado para que también pueda reutilizarse
+                if save:
+                    BenchmarkManager.save_result(metric, component_results[metric])
+                if progress_callback:
+                    progress_callback(f"[OK] {name} completado")
+            except Exception as e:
+                if progress_callback:
+                    progress_callback(f"[ERR] Error en {name}: {str(e)}")
+        
+        result = GeneralBenchmark.compute_score(component_results)
+        result["reused"] = reused
+        result["measured"] = measured
+        result["noisy"] = any(r.get("noisy") for r in component_results.values() if r)
+        
+        if progress_callback:
+            progress_callback(f"[INFO] Reutilizados: {', '.join(reused) or 'ninguno'}")
+            progress_callback(f"[INFO] Re-medidos: {', '.join(measured) or 'ninguno'}")
+        
+        if progress_callback and result["components"]:
+            for metric, component in result["components"].items():
+                progress_callback(f"[INFO] {metric}: {component['normalized']:.1f}% de la referencia")
+            progress_callback(f"[OK] Score General: {result['score']:.1f} (referencia = 100)")
+        
+        return result
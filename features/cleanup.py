@@ -0,0 +1,689 @@
+import os
+import re
+import json
+import stat
+import time
+import random
+import fnmatch
+import sqlite3
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CleanupFilter:
+    """Filtro de archivos elegibles: antigüedad, tamaño y exclusiones.
+
+    Todos los patrones de exclusión se compilan en una única expresión
+    regular; se comparan contra el nombre y contra la ruta completa.
+    """
+
+    def __init__(self, older_than_hours=None, min_size=None, max_size=None, exclude=None):
+        self.older_than_hours = older_than_hours
+        self.min_size = min_size
+        self.max_size = max_size
+        self.exclude = list(exclude or [])
+        self._exclude_re = None
+        if self.exclude:
+            pattern = "|".join(f"(?:{fnmatch.translate(os.path.normcase(p))})" for p in self.exclude)
+            self._exclude_re = re.compile(pattern)
+
+    def is_excluded(self, name, path):
+        if self._exclude_re is None:
+            return False
+        return bool(self._exclude_re.match(os.path.normcase(name))
+                    or self._exclude_re.match(os.path.normcase(path)))
+
+    def accepts(self, name, path, size, mtime, now=None):
+        """True si el archivo es elegible para borrarse"""
+        if self.is_excluded(name, path):
+            return False
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if self.older_than_hours is not None:
+            now = now or time.time()
+            if now - mtime < self.older_than_hours * 3600:
+                return False
+        return True
+
+    def key(self):
+        """Clave estable del filtro (para saber si cambió entre ejecuciones)"""
+        return json.dumps([self.older_than_hours, self.min_size, self.max_size, self.exclude])
+
+    def describe(self):
+        parts = []
+        if self.older_than_hours is not None:
+            parts.append(f"más de {self.older_than_hours}h")
+        if self.min_size is not None:
+            parts.append(f">= {self.min_size} bytes")
+        if self.max_size is not None:
+            parts.append(f"<= {self.max_size} bytes")
+        if self.exclude:
+            parts.append(f"excluye {', '.join(self.exclude)}")
+        return "; ".join(parts) or "sin filtros"
+
+
+def iter_files(roots, file_filter=None):
+    """Recorre las raíces con os.scandir y genera (raíz, ruta, nombre, tamaño, mtime).
+
+    Es un generador: nunca construye la lista completa de archivos. Los
+    directorios excluidos por el filtro no se recorren.
+    """
+    now = time.time()
+    for root in roots:
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not (file_filter and file_filter.is_excluded(entry.name, entry.path)):
+                                    stack.append(entry.path)
+                                continue
+                            # En Windows scandir ya trae el stat: no cuesta una llamada extra
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if file_filter and not file_filter.accepts(entry.name, entry.path,
+                                                                   st.st_size, st.st_mtime, now):
+                            continue
+                        yield root, entry.path, entry.name, st.st_size, st.st_mtime
+            except OSError:
+                continue
+
+
+class CleanupErrors:
+    """Agregado acotado de fallos de borrado.
+
+    En vez de guardar cada ruta fallida, cuenta los fallos por tipo de error
+    y por directorio de primer nivel, y conserva una muestra (reservoir
+    sampling) de tamaño fijo con ejemplos. La memoria no crece con el número
+    de fallos.
+    """
+
+    SAMPLE_SIZE = 20
+    MAX_DIRECTORIES = 200
+    OTHER_DIRECTORIES = "(otros)"
+
+    def __init__(self, sample_size=None, rng=None):
+        self.sample_size = sample_size or self.SAMPLE_SIZE
+        self.total = 0
+        self.by_type = Counter()
+        self.by_directory = Counter()
+        self.sample = []
+        self._rng = rng or random.Random()
+
+    @staticmethod
+    def _top_directory(root, path):
+        relative = os.path.relpath(os.path.dirname(path), root)
+        if relative in (".", ""):
+            return root
+        return os.path.join(root, relative.split(os.sep, 1)[0])
+
+    def add(self, root, path, error):
+        self.total += 1
+        self.by_type[type(error).__name__] += 1
+
+        directory = self._top_directory(root, path)
+        if directory not in self.by_directory and len(self.by_directory) >= self.MAX_DIRECTORIES:
+            directory = self.OTHER_DIRECTORIES
+        self.by_directory[directory] += 1
+
+        # Algoritmo R: cada fallo tiene la misma probabilidad de quedar en la muestra
+        if len(self.sample) < self.sample_size:
+            self.sample.append((path, f"{type(error).__name__}: {error}"))
+        else:
+            slot = self._rng.randrange(self.total)
+            if slot < self.sample_size:
+                self.sample[slot] = (path, f"{type(error).__name__}: {error}")
+
+    def summary(self, top=10):
+        return {
+            "total": self.total,
+            "by_type": dict(self.by_type.most_common()),
+            "by_directory": dict(self.by_directory.most_common(top)),
+            "examples": [{"path": path, "error": message} for path, message in self.sample]
+        }
+
+    def write_report(self, log_file, top=10):
+        """Escribe el resumen línea a línea en el informe"""
+        if not self.total:
+            return
+        log_file.write(f"Errores de borrado: {self.total}\n")
+        for error_type, count in self.by_type.most_common():
+            log_file.write(f"  {error_type}: {count}\n")
+        log_file.write("Directorios con más errores:\n")
+        for directory, count in self.by_directory.most_common(top):
+            log_file.write(f"  {directory}: {count}\n")
+        log_file.write(f"Ejemplos ({len(self.sample)}):\n")
+        for path, message in self.sample:
+            log_file.write(f"  {path} -> {message}\n")
+
+
+class DirStats:
+    """Totales del contenido directo de un directorio (sin subdirectorios)"""
+
+    __slots__ = ("files", "bytes", "extensions", "hours")
+
+    def __init__(self, files=0, total_bytes=0, extensions=None, hours=None):
+        self.files = files
+        self.bytes = total_bytes
+        self.extensions = extensions if extensions is not None else {}
+        self.hours = hours if hours is not None else {}
+
+    def add(self, name, size, mtime):
+        self.files += 1
+        self.bytes += size
+        ext = os.path.splitext(name)[1].lower() or "(sin extensión)"
+        totals = self.extensions.setdefault(ext, [0, 0])
+        totals[0] += 1
+        totals[1] += size
+        # Histograma por hora de modificación: basta para los rangos de antigüedad
+        hour = str(int(mtime // 3600))
+        totals = self.hours.setdefault(hour, [0, 0])
+        totals[0] += 1
+        totals[1] += size
+
+
+class DirectoryIndex:
+    """Índice persistente (SQLite) de directorios temporales.
+
+    Guarda por directorio su mtime, el número de archivos y bytes que
+    contiene, sus subdirectorios e histogramas compactos. Si el mtime de un
+    directorio no cambió, no se crearon, borraron ni renombraron archivos:
+    se reutilizan los totales sin volver a listarlo. Reescribir un archivo
+    existente no cambia el mtime del directorio, así que los bytes
+    reutilizados son una estimación (el análisis los informa aparte como
+    "reused_bytes"); comprobarlos exigiría listar el directorio. Cada fila lleva la clave del filtro con
+    que se armó (antigüedad, tamaños y exclusiones): con otro filtro no se
+    reutiliza. Todos los cambios de una ejecución se escriben en una única
+    transacción.
+    """
+
+    INDEX_FILE = "data/temp_index.sqlite"
+    # Pasado este tiempo se vuelve a intentar borrar lo que quedó (archivos bloqueados)
+    MAX_AGE_HOURS = 24
+
+    def __init__(self, path=None):
+        self.path = path or self.INDEX_FILE
+        # {ruta: {clave del filtro: fila}}
+        self._rows = {}
+        self._meta = {}
+        self._updates = {}
+        self._meta_updates = {}
+        self._removed = set()
+        self._seen = set()
+        self._load()
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(dirs)")}
+        if columns and "filter_key" not in columns:
+            # Índice anterior a la clave de filtro: es una caché, se rehace
+            conn.execute("DROP TABLE dirs")
+        conn.execute("""CREATE TABLE IF NOT EXISTS dirs (
+            path TEXT, mtime REAL, files INTEGER, bytes INTEGER,
+            subdirs TEXT, extensions TEXT, hours TEXT, retry_after REAL,
+            filter_key TEXT, PRIMARY KEY (path, filter_key))""")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        return conn
+
+    def _load(self):
+        try:
+            conn = self._connect()
+            try:
+                for row in conn.execute("SELECT path, mtime, files, bytes, subdirs, extensions, hours, "
+                                        "retry_after, filter_key FROM dirs"):
+                    self._rows.setdefault(row[0], {})[row[8]] = row
+                self._meta = dict(conn.execute("SELECT key, value FROM meta"))
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            # Índice corrupto o ilegible: se reconstruye en esta ejecución
+            self._rows = {}
+            self._meta = {}
+
+    def get(self, path, mtime, filter_key=""):
+        """Fila del directorio si su mtime no cambió y se armó con el mismo filtro, si no None"""
+        self._seen.add(path)
+        row = self._rows.get(path, {}).get(filter_key)
+        if row is None or row[1] != mtime:
+            return None
+        return row
+
+    @staticmethod
+    def subdirs(row):
+        return [name for name in row[4].split("\n") if name] if row[4] else []
+
+    @staticmethod
+    def stats(row):
+        return DirStats(row[2], row[3], json.loads(row[5] or "{}"), json.loads(row[6] or "{}"))
+
+    def put(self, path, mtime, stats, subdirs, retry_after=0.0, filter_key=""):
+        self._seen.add(path)
+        self._removed.discard(path)
+        row = (path, mtime, stats.files, stats.bytes, "\n".join(subdirs),
+               json.dumps(stats.extensions, separators=(",", ":")),
+               json.dumps(stats.hours, separators=(",", ":")), retry_after, filter_key)
+        self._rows.setdefault(path, {})[filter_key] = row
+        self._updates.setdefault(path, {})[filter_key] = row
+
+    def remove(self, path):
+        """Descarta el directorio con todos sus filtros"""
+        self._removed.add(path)
+        self._updates.pop(path, None)
+        self._rows.pop(path, None)
+
+    def get_meta(self, key):
+        return self._meta.get(key)
+
+    def set_meta(self, key, value):
+        self._meta[key] = value
+        self._meta_updates[key] = value
+
+    def commit(self, roots):
+        """Escribe los cambios en una transacción y descarta directorios desaparecidos"""
+        prefixes = [os.path.join(root, "") for root in roots]
+        for path in list(self._rows):
+            if path in self._seen:
+                continue
+            if path in roots or any(path.startswith(prefix) for prefix in prefixes):
+                self.remove(path)
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany("DELETE FROM dirs WHERE path = ?", [(p,) for p in self._removed])
+                conn.executemany(
+                    "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [row for rows in self._updates.values() for row in rows.values()]
+                )
+                conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", list(self._meta_updates.items()))
+        finally:
+            conn.close()
+        self._updates = {}
+        self._meta_updates = {}
+        self._removed = set()
+
+
+def _dir_mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class TempScanner:
+    """Análisis en seco: cuánto espacio se recuperaría sin borrar nada"""
+
+    AGE_BUCKETS = [
+        ("< 1h", 3600),
+        ("1h - 24h", 86400),
+        ("1d - 7d", 7 * 86400),
+        ("7d - 30d", 30 * 86400),
+        ("> 30d", None)
+    ]
+    TOP_EXTENSIONS = 10
+
+    def __init__(self, file_filter=None, index=None):
+        self.file_filter = file_filter
+        # El índice guarda el contenido sin filtrar: sólo sirve para análisis sin filtros
+        self.index = index if file_filter is None else None
+        self.reused_dirs = 0
+        self.reused_bytes = 0
+        self.scanned_dirs = 0
+
+    @staticmethod
+    def _age_bucket(age_seconds):
+        for label, limit in TempScanner.AGE_BUCKETS:
+            if limit is None or age_seconds < limit:
+                return label
+
+    def _walk_indexed(self, root):
+        """Genera DirStats por directorio reutilizando los que no cambiaron"""
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            mtime = _dir_mtime(path)
+            if mtime is None:
+                continue
+
+            row = self.index.get(path, mtime)
+            if row is not None:
+                self.reused_dirs += 1
+                self.reused_bytes += row[3]
+                stack.extend(os.path.join(path, name) for name in DirectoryIndex.subdirs(row))
+                yield DirectoryIndex.stats(row)
+                continue
+
+            self.scanned_dirs += 1
+            stats = DirStats()
+            subdirs = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.name)
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        stats.add(entry.name, st.st_size, st.st_mtime)
+            except OSError:
+                continue
+            self.index.put(path, mtime, stats, subdirs)
+            stack.extend(os.path.join(path, name) for name in subdirs)
+            yield stats
+
+    def scan(self, roots):
+        """Recorre las raíces acumulando totales sobre la marcha"""
+        start = time.perf_counter()
+        now = time.time()
+        files = 0
+        total_bytes = 0
+        per_root = {root: {"files": 0, "bytes": 0} for root in roots}
+        ext_files = Counter()
+        ext_bytes = Counter()
+        age_files = Counter()
+        age_bytes = Counter()
+
+        if self.index is not None:
+            for root in roots:
+                for stats in self._walk_indexed(root):
+                    files += stats.files
+                    total_bytes += stats.bytes
+                    per_root[root]["files"] += stats.files
+                    per_root[root]["bytes"] += stats.bytes
+                    for ext, (count, size) in stats.extensions.items():
+                        ext_files[ext] += count
+                        ext_bytes[ext] += size
+                    for hour, (count, size) in stats.hours.items():
+                        bucket = self._age_bucket(now - (int(hour) * 3600 + 1800))
+                        age_files[bucket] += count
+                        age_bytes[bucket] += size
+            self.index.commit(roots)
+        else:
+            for root, _, name, size, mtime in iter_files(roots, self.file_filter):
+                files += 1
+                total_bytes += size
+                per_root[root]["files"] += 1
+                per_root[root]["bytes"] += size
+                ext = os.path.splitext(name)[1].lower() or "(sin extensión)"
+                ext_files[ext] += 1
+                ext_bytes[ext] += size
+                bucket = self._age_bucket(now - mtime)
+                age_files[bucket] += 1
+                age_bytes[bucket] += size
+
+        return {
+            "files": files,
+            "bytes": total_bytes,
+            "per_root": per_root,
+            "per_extension": {
+                ext: {"files": ext_files[ext], "bytes": size}
+                for ext, size in ext_bytes.most_common(self.TOP_EXTENSIONS)
+            },
+            "age_histogram": {
+                label: {"files": age_files[label], "bytes": age_bytes[label]}
+                for label, _ in self.AGE_BUCKETS
+            },
+            "filter": self.file_filter.describe() if self.file_filter else "sin filtros",
+            "reused_dirs": self.reused_dirs,
+            "reused_bytes": self.reused_bytes,
+            "scanned_dirs": self.scanned_dirs,
+            "elapsed_s": round(time.perf_counter() - start, 3)
+        }
+
+
+class TempCleaner:
+    """Motor de limpieza de temporales: os.scandir + pool de hilos acotado.
+
+    Los archivos de cada directorio se borran en lotes dentro del pool mientras
+    el hilo principal sigue enumerando; los directorios se eliminan de abajo
+    hacia arriba, cuando ya terminaron todos los borrados de su subárbol.
+    Con un DirectoryIndex, los directorios que no cambiaron desde la última
+    limpieza con el mismo filtro (sólo quedaron archivos bloqueados o
+    filtrados) no se vuelven a listar. Lo que se indexa sale de volver a
+    listar el directorio después de sus borrados, entre dos lecturas del
+    mtime: si algo lo modifica mientras tanto, no se indexa. Sólo usa la
+    librería estándar, así que puede probarse en Linux con un árbol
+    generado en un directorio temporal.
+    """
+
+    BATCH_SIZE = 256
+    PROGRESS_INTERVAL = 0.5
+
+    def __init__(self, logger_func=None, max_workers=None, remove_roots=False, file_filter=None, index=None):
+        self.logger_func = logger_func
+        self.file_filter = file_filter
+        self.index = index
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.remove_roots = remove_roots
+        self.deleted_files = 0
+        self.deleted_dirs = 0
+        self.deleted_bytes = 0
+        self.skipped = 0
+        self.errors = CleanupErrors()
+        self.unchanged_dirs = 0
+        self._last_progress = 0.0
+        self._last_reported = 0
+        self._filter_key = file_filter.key() if file_filter else ""
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except PermissionError:
+            # Archivos de sólo lectura: quitar el atributo y reintentar
+            os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+            os.remove(path)
+        except IsADirectoryError:
+            # Enlaces simbólicos / junctions a directorios
+            os.rmdir(path)
+
+    @staticmethod
+    def _delete_batch(batch):
+        """Borra un lote de (ruta, tamaño). Devuelve (borrados, bytes, [(ruta, excepción)])"""
+        deleted = 0
+        freed = 0
+        errors = []
+        for path, size in batch:
+            try:
+                TempCleaner._remove_file(path)
+                deleted += 1
+                freed += size
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                errors.append((path, e))
+        return deleted, freed, errors
+
+    def _collect(self, futures, root):
+        failed = []
+        for future in futures:
+            deleted, freed, errors = future.result()
+            self.deleted_files += deleted
+            self.deleted_bytes += freed
+            self.skipped += len(errors)
+            for path, error in errors:
+                self.errors.add(root, path, error)
+                failed.append(path)
+        self._report_progress()
+        return failed
+
+    def _report_progress(self, force=False):
+        now = time.perf_counter()
+        total = self.deleted_files + self.deleted_dirs
+        if not self.logger_func or total == self._last_reported:
+            return
+        if force or now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self.logger_func(f"[INFO] Eliminados {total} archivos...")
+            self._last_progress = now
+            self._last_reported = total
+
+    def _can_skip(self, path, mtime, now):
+        """El directorio no cambió desde la última limpieza con el mismo filtro"""
+        if self.index is None or mtime is None:
+            return None
+        row = self.index.get(path, mtime, self._filter_key)
+        if row is None or now >= row[7]:
+            return None
+        return row
+
+    def _survivors(self, path, failed, retry_after, now):
+        """Relista lo que quedó tras los borrados: (DirStats, subdirectorios, retry_after, mtime).
+
+        Devuelve None si el directorio cambió mientras se listaba. Un archivo
+        elegible que no falló apareció después del primer listado: la fila
+        queda vencida para que la próxima limpieza lo vea.
+        """
+        file_filter = self.file_filter
+        age_limit = file_filter.older_than_hours * 3600 if file_filter and file_filter.older_than_hours is not None else None
+        mtime = _dir_mtime(path)
+        if mtime is None:
+            return None
+        stats = DirStats()
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    stats.add(entry.name, st.st_size, st.st_mtime)
+                    if file_filter and not file_filter.accepts(entry.name, entry.path,
+                                                               st.st_size, st.st_mtime, now):
+                        if age_limit is not None and now - st.st_mtime < age_limit:
+                            retry_after = min(retry_after, st.st_mtime + age_limit)
+                    elif entry.path not in failed:
+                        retry_after = 0.0
+        except OSError:
+            return None
+        if _dir_mtime(path) != mtime:
+            return None
+        return stats, subdirs, retry_after, mtime
+
+    def _finish_dir(self, path, root, state, now):
+        """Post-orden: espera los borrados del directorio, lo elimina o lo indexa"""
+        futures, listed, retry_after = state
+        failed = set(self._collect(futures, root))
+
+        if path != root or self.remove_roots:
+            try:
+                os.rmdir(path)
+                self.deleted_dirs += 1
+                if self.index is not None:
+                    self.index.remove(path)
+                return
+            except OSError:
+                pass  # No vacío: quedan archivos omitidos
+
+        if self.index is not None and listed:
+            relisted = self._survivors(path, failed, retry_after, now)
+            if relisted is None:
+                self.index.remove(path)
+                return
+            stats, subdirs, retry_after, mtime = relisted
+            self.index.put(path, mtime, stats, subdirs, retry_after, self._filter_key)
+
+    def _clean_root(self, pool, root):
+        # Recorrido en post-orden con pila explícita (sin límite de recursión)
+        stack = [(root, False)]
+        pending = {}
+        file_filter = self.file_filter
+        use_index = self.index is not None
+        age_limit = file_filter.older_than_hours * 3600 if file_filter and file_filter.older_than_hours is not None else None
+
+        while stack:
+            path, visited = stack.pop()
+            now = time.time()
+
+            if visited:
+                self._finish_dir(path, root, pending.pop(path), now)
+                continue
+
+            stack.append((path, True))
+
+            mtime = _dir_mtime(path) if use_index else None
+            row = self._can_skip(path, mtime, now)
+            if row is not None:
+                # Sin cambios: sólo se revisan sus subdirectorios
+                self.unchanged_dirs += 1
+                for name in DirectoryIndex.subdirs(row):
+                    child = os.path.join(path, name)
+                    if not (file_filter and file_filter.is_excluded(name, child)):
+                        stack.append((child, False))
+                pending[path] = ([], False, None)
+                continue
+
+            futures = []
+            batch = []
+            listed = use_index
+            retry_after = now + DirectoryIndex.MAX_AGE_HOURS * 3600
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            if not (file_filter and file_filter.is_excluded(entry.name, entry.path)):
+                                stack.append((entry.path, False))
+                            continue
+
+                        # En Windows scandir ya trae el stat: el tamaño no cuesta una llamada extra
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if file_filter and not file_filter.accepts(entry.name, entry.path,
+                                                                   st.st_size, st.st_mtime, now):
+                            # Un archivo aún joven pasará a ser elegible más adelante
+                            if use_index and age_limit is not None and now - st.st_mtime < age_limit:
+                                retry_after = min(retry_after, st.st_mtime + age_limit)
+                            continue
+
+                        batch.append((entry.path, st.st_size))
+                        if len(batch) >= self.BATCH_SIZE:
+                            futures.append(pool.submit(self._delete_batch, batch))
+                            batch = []
+            except OSError as e:
+                if path == root and self.logger_func:
+                    self.logger_func(f"[WARN] Error al acceder al directorio {path}: {str(e)}")
+                listed = False  # No se pudo listar: no indexar
+            if batch:
+                futures.append(pool.submit(self._delete_batch, batch))
+            pending[path] = (futures, listed, retry_after)
+
+    def clean(self, roots):
+        """Limpia el contenido de cada raíz y devuelve el resumen"""
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for root in roots:
+                self._clean_root(pool, root)
+        self._report_progress(force=True)
+
+        if self.index is not None:
+            self.index.commit(roots)
+
+        return {
+            "deleted_files": self.deleted_files,
+            "deleted_dirs": self.deleted_dirs,
+            "deleted_bytes": self.deleted_bytes,
+            "skipped": self.skipped,
+            "errors": self.errors.summary(),
+            "unchanged_dirs": self.unchanged_dirs,
+            "elapsed_s": round(time.perf_counter() - start, 3)
+        }
@@ -0,0 +1,248 @@
+import os
+import json
+import stat
+import time
+import queue
+import heapq
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Junctions y enlaces simbólicos de Windows: no se siguen (evita ciclos y
+# contar dos veces el mismo contenido)
+REPARSE_POINT = getattr(stat, "FILE_ATTRIBUTE_REPARSE_POINT", 0x400)
+
+
+class DiskUsageAnalyzer:
+    """Analizador de uso de disco con un pool de hilos sobre os.scandir.
+
+    Cada tarea del pool lista un único directorio y devuelve el total de sus
+    archivos y sus subdirectorios; los resultados llegan por una cola y el
+    hilo principal encola los hijos a medida que llegan, así el pool nunca
+    se queda sin trabajo. Al terminar se suman los totales de abajo hacia
+    arriba para armar el árbol.
+    Mientras recorre, informa resultados parciales (totales por carpeta de
+    primer nivel) cada PROGRESS_INTERVAL segundos. El árbol podado se
+    guarda en CACHE_DIR para reabrirlo sin volver a recorrer el volumen;
+    las carpetas más pesadas se calculan antes de podar, sobre todos los
+    directorios, y se guardan junto al árbol.
+    """
+
+    CACHE_DIR = "data/disk_usage"
+    PROGRESS_INTERVAL = 2.0
+    # Directorios más chicos que esto se agrupan en "(otros)" en la caché
+    CACHE_MIN_BYTES = 32 * 1024**2
+    TOP_N = 20
+    # Carpetas pesadas que se guardan con el resultado (tope de --top)
+    HOTSPOT_LIMIT = 200
+
+    def __init__(self, max_workers=None, progress_callback=None):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.progress_callback = progress_callback
+        self.errors = 0
+
+    @staticmethod
+    def default_root():
+        """Unidad del sistema (C:\\ en Windows, / en el resto)"""
+        if os.name == "nt":
+            return os.environ.get("SystemDrive", "C:") + os.sep
+        return os.sep
+
+    @staticmethod
+    def _scan_dir(path):
+        """Lista un directorio: (bytes de sus archivos, cantidad, subdirectorios, error)"""
+        size = 0
+        files = 0
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if getattr(st, "st_file_attributes", 0) & REPARSE_POINT or stat.S_ISLNK(st.st_mode):
+                        continue
+                    if stat.S_ISDIR(st.st_mode):
+                        subdirs.append(entry.path)
+                    else:
+                        size += st.st_size
+                        files += 1
+        except OSError:
+            return 0, 0, [], True
+        return size, files, subdirs, False
+
+    @staticmethod
+    def _top_level(root, path):
+        relative = os.path.relpath(path, root)
+        if relative in (".", ""):
+            return root
+        return os.path.join(root, relative.split(os.sep, 1)[0])
+
+    def _report_progress(self, root, dirs, total, partial):
+        if not self.progress_callback:
+            return
+        top = heapq.nlargest(5, partial.items(), key=lambda item: item[1])
+        self.progress_callback({
+            "root": root,
+            "scanned_dirs": dirs,
+            "bytes": total,
+            "top": [{"path": path, "bytes": size} for path, size in top if path != root]
+        })
+
+    def scan(self, root):
+        """Recorre 'root' y devuelve el árbol con totales por directorio"""
+        start = time.perf_counter()
+        root = os.path.abspath(root)
+        nodes = {}
+        children = {}
+        partial = {}
+        total = 0
+        self.errors = 0
+        last_progress = start
+
+        results = queue.Queue()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            def submit(path):
+                future = pool.submit(self._scan_dir, path)
+                future.add_done_callback(lambda f: results.put((path, f)))
+
+            submit(root)
+            pending = 1
+            while pending:
+                path, future = results.get()
+                pending -= 1
+                size, files, subdirs, failed = future.result()
+                self.errors += failed
+                nodes[path] = (size, files)
+                children[path] = subdirs
+                total += size
+                top = self._top_level(root, path)
+                partial[top] = partial.get(top, 0) + size
+                for subdir in subdirs:
+                    submit(subdir)
+                pending += len(subdirs)
+
+                now = time.perf_counter()
+                if now - last_progress >= self.PROGRESS_INTERVAL:
+                    self._report_progress(root, len(nodes), total, partial)
+                    last_progress = now
+
+        # Totales acumulados en post-orden (pila explícita, sin recursión)
+        totals = {}
+        stack = [(root, False)]
+        while stack:
+            path, visited = stack.pop()
+            if not visited:
+                stack.append((path, True))
+                stack.extend((child, False) for child in children.get(path, ()) if child in nodes)
+                continue
+            size, files = nodes[path]
+            dirs = 0
+            for child in children.get(path, ()):
+                if child in totals:
+                    child_size, child_files, child_dirs = totals[child]
+                    size += child_size
+                    files += child_files
+                    dirs += child_dirs + 1
+            totals[path] = (size, files, dirs)
+
+        return {
+            "root": root,
+            "timestamp": time.time(),
+            "elapsed_s": round(time.perf_counter() - start, 3),
+            "scanned_dirs": len(nodes),
+            "errors": self.errors,
+            "hotspots": self._hotspots(root, children, totals, self.HOTSPOT_LIMIT),
+            "tree": self._build_tree(root, children, totals)
+        }
+
+    @staticmethod
+    def _hotspots(root, children, totals, limit):
+        """Directorios más pesados sin repetir la cadena de ancestros.
+
+        Un directorio cuyo hijo mayor concentra el 90% de su tamaño no se
+        lista: el espacio está en el hijo, que sí aparece.
+        """
+        candidates = []
+        for path, (size, files, _) in totals.items():
+            if path == root or not size:
+                continue
+            largest = max((totals[child][0] for child in children.get(path, ()) if child in totals), default=0)
+            if largest < size * 0.9:
+                candidates.append((size, files, path))
+        return [{"path": path, "bytes": size, "files": files}
+                for size, files, path in heapq.nlargest(limit, candidates)]
+
+    def _build_tree(self, root, children, totals):
+        """Árbol anidado podado: los directorios chicos se agrupan en '(otros)'"""
+        def make(path):
+            size, files, dirs = totals[path]
+            return {"path": path, "bytes": size, "files": files, "dirs": dirs, "children": []}
+
+        tree = make(root)
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            other_bytes = 0
+            other_count = 0
+            for child in children.get(node["path"], ()):
+                if child not in totals:
+                    continue
+                if totals[child][0] >= self.CACHE_MIN_BYTES:
+                    child_node = make(child)
+                    node["children"].append(child_node)
+                    stack.append(child_node)
+                else:
+                    other_bytes += totals[child][0]
+                    other_count += 1
+            node["children"].sort(key=lambda n: n["bytes"], reverse=True)
+            if other_count:
+                node["other"] = {"bytes": other_bytes, "dirs": other_count}
+        return tree
+
+    @staticmethod
+    def hotspots(result, limit=None):
+        """Las 'limit' carpetas más pesadas de un resultado de scan/analyze"""
+        return result["hotspots"][:limit or DiskUsageAnalyzer.TOP_N]
+
+    @staticmethod
+    def _cache_path(root):
+        key = hashlib.sha256(os.path.normcase(os.path.abspath(root)).encode()).hexdigest()[:16]
+        return os.path.join(DiskUsageAnalyzer.CACHE_DIR, f"{key}.json")
+
+    @staticmethod
+    def save_cache(result):
+        os.makedirs(DiskUsageAnalyzer.CACHE_DIR, exist_ok=True)
+        path = DiskUsageAnalyzer._cache_path(result["root"])
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load_cache(root, max_age_hours=None):
+        """Último árbol guardado para 'root' (None si no hay o es más viejo que max_age_hours)"""
+        try:
+            with open(DiskUsageAnalyzer._cache_path(root), "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if max_age_hours is not None and time.time() - result["timestamp"] > max_age_hours * 3600:
+            return None
+        return result
+
+    def analyze(self, root=None, use_cache=False, max_age_hours=None):
+        """Devuelve el árbol de la caché si se pide y existe; si no, recorre y guarda"""
+        root = root or self.default_root()
+        if use_cache:
+            cached = self.load_cache(root, max_age_hours)
+            if cached is not None:
+                cached["cached"] = True
+                return cached
+        result = self.scan(root)
+        try:
+            self.save_cache(result)
+        except OSError:
+            pass
+        result["cached"] = False
+        return result
@@ -0,0 +1,153 @@
+import os
+import sys
+import json
+import hashlib
+import platform
+import psutil
+
+from config.settings import load_config
+
+
+class EnvironmentCapture:
+    """Captura el entorno (hardware, SO y ajustes aplicados) de cada benchmark"""
+
+    ENVIRONMENTS_FILE = "data/benchmark_environments.json"
+
+    # Claves de configuración que no son ajustes del sistema
+    NON_TWEAK_KEYS = {'last_optimization', 'benchmark_reuse_minutes'}
+
+    _record = None
+    _environment_id = None
+    _stored = False
+
+    @staticmethod
+    def _cpu_model():
+        """Obtiene el nombre comercial del procesador"""
+        if sys.platform == "win32":
+            try:
+                from utils.registry import get_registry_value
+                name = get_registry_value(
+                    r"HKEY_LOCAL_MACHINE\HARDWARE\DESCRIPTION\System\CentralProcessor\0",
+                    "ProcessorNameString"
+                )
+                if name:
+                    return name.strip()
+            except Exception:
+                pass
+        elif os.path.exists("/proc/cpuinfo"):
+            try:
+                with open("/proc/cpuinfo", 'r') as f:
+                    for line in f:
+                        if line.startswith("model name"):
+                            return line.split(":", 1)[1].strip()
+            except Exception:
+                pass
+        return platform.processor() or platform.machine()
+
+    @staticmethod
+    def _power_source():
+        """Devuelve 'ac', 'battery' o 'desktop' (sin batería)"""
+        try:
+            battery = psutil.sensors_battery()
+        except Exception:
+            battery = None
+        if battery is None:
+            return "desktop"
+        return "ac" if battery.power_plugged else "battery"
+
+    @staticmethod
+    def _applied_tweaks():
+        """Ajustes activos según load_config()"""
+        config = load_config()
+        return sorted(
+            key for key, value in config.items()
+            if key not in EnvironmentCapture.NON_TWEAK_KEYS and value is True
+        )
+
+    @staticmethod
+    def current_frequency():
+        """Frecuencia actual de la CPU en MHz (varía entre ejecuciones)"""
+        try:
+            freq = psutil.cpu_freq()
+            return round(freq.current, 1) if freq else None
+        except Exception:
+            return None
+
+    @staticmethod
+    def capture():
+        """Devuelve el registro de entorno (se calcula una vez por sesión)"""
+        if EnvironmentCapture._record is None:
+            record = {
+                "cpu_model": EnvironmentCapture._cpu_model(),
+                "physical_cores": psutil.cpu_count(logical=False),
+                "logical_cores": psutil.cpu_count(logical=True),
+                "ram_total_mb": psutil.virtual_memory().total // (1024**2),
+                "machine": platform.machine(),
+                "node": platform.node(),
+                "os": platform.system(),
+                "os_release": platform.release(),
+                "os_version": platform.version(),
+                "python_version": platform.python_version(),
+                "power_source": EnvironmentCapture._power_source(),
+                "applied_tweaks": EnvironmentCapture._applied_tweaks()
+            }
+            serialized = json.dumps(record, sort_keys=True)
+            EnvironmentCapture._record = record
+            EnvironmentCapture._environment_id = hashlib.sha256(serialized.encode()).hexdigest()[:16].upper()
+            EnvironmentCapture._stored = False
+        return EnvironmentCapture._record
+
+    @staticmethod
+    def environment_id():
+        """ID deduplicado del registro de entorno actual"""
+        EnvironmentCapture.capture()
+        return EnvironmentCapture._environment_id
+
+    @staticmethod
+    def machine_fingerprint():
+        """Huella del hardware (no cambia con los ajustes ni con la energía)"""
+        record = EnvironmentCapture.capture()
+        parts = [
+            record["node"],
+            record["machine"],
+            record["cpu_model"],
+            str(record["physical_cores"]),
+            str(record["logical_cores"]),
+            str(record["ram_total_mb"])
+        ]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16].upper()
+
+    @staticmethod
+    def invalidate():
+        """Fuerza recalcular el entorno (p. ej. tras aplicar una optimización)"""
+        EnvironmentCapture._record = None
+        EnvironmentCapture._environment_id = None
+        EnvironmentCapture._stored = False
+
+    @staticmethod
+    def load_environments():
+        """Carga los registros de entorno guardados"""
+        if os.path.exists(EnvironmentCapture.ENVIRONMENTS_FILE):
+            try:
+                with open(EnvironmentCapture.ENVIRONMENTS_FILE, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                return {}
+        return {}
+
+    @staticmethod
+    def store():
+        """Guarda el registro actual (una sola vez por ID) y devuelve su ID"""
+        environment_id = EnvironmentCapture.environment_id()
+        if EnvironmentCapture._stored:
+            return environment_id
+
+        environments = EnvironmentCapture.load_environments()
+        if environment_id not in environments:
+            environments[environment_id] = EnvironmentCapture._record
+            os.makedirs(os.path.dirname(EnvironmentCapture.ENVIRONMENTS_FILE), exist_ok=True)
+            with open(EnvironmentCapture.ENVIRONMENTS_FILE, 'w') as f:
+                json.dump(environments, f, indent=2)
+
+        EnvironmentCapture._stored = True
+        return environment_id
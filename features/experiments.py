@@ -0,0 +1,199 @@
+import time
+
+from features.verification import ImpactVerifier, compare_samples
+
+
+class TweakExperiment:
+    """Mide el efecto de cada tweak del catálogo por separado.
+
+    Cada paso aplica un grupo de tweaks con el TweakEngine (y su diario),
+    mide, y deshace la sesión antes del paso siguiente, así el sistema
+    termina como estaba. Modos:
+
+    - "individual": un paso por tweak.
+    - "bisect": prueba por grupos; un grupo sin efecto significativo
+      descarta a todos sus tweaks de una vez y uno con efecto se parte en
+      mitades hasta aislar los responsables. Con pocos tweaks relevantes
+      cuesta O(k log n) mediciones en lugar de n. Efectos opuestos dentro
+      de un mismo grupo pueden anularse: para descartarlo, usar "individual".
+
+    measure(logger_func, fase) debe devolver {"measurements", "higher_is_better",
+    "unit"} o None si la medición no fue limpia. Con un motor sobre
+    MemoryRegistryBackend y una medición simulada la orquestación se prueba
+    fuera de Windows.
+    """
+
+    RESULT_NAME = "tweak_experiment"
+    MODES = ("individual", "bisect")
+
+    def __init__(self, measure, engine=None, metric=""):
+        if engine is None:
+            from features.optimization import SystemOptimizer
+            engine = SystemOptimizer.engine()
+        if engine.journal is None:
+            raise ValueError("El experimento necesita un motor con diario para deshacer cada paso")
+        self.measure = measure
+        self.engine = engine
+        self.metric = metric
+        self.steps = 0
+
+    @staticmethod
+    def for_probe(metric, engine=None):
+        """Experimento que mide con una de las sondas de ImpactVerifier"""
+        for name, label, probe in ImpactVerifier.PROBES:
+            if name == metric:
+                return TweakExperiment(
+                    lambda logger_func, phase: ImpactVerifier.measure_probe(probe, label, logger_func, phase),
+                    engine, metric)
+        raise ValueError(f"Métrica desconocida: {metric} "
+                         f"(disponibles: {', '.join(name for name, _, _ in ImpactVerifier.PROBES)})")
+
+    def _rollback(self, session_id, logger_func):
+        if session_id is None:
+            return
+        summary = self.engine.journal.rollback_session(session_id, self.engine.backend,
+                                                       self.engine.command_runner, lambda message: None)
+        if summary["failed"]:
+            # Seguir midiendo sobre un estado desconocido invalidaría todo lo demás
+            raise RuntimeError(f"No se pudo deshacer la sesión {session_id}: "
+                               f"usar 'rollback --session {session_id}'")
+        # Un paso ya deshecho no aporta nada al diario y no debe desplazar
+        # sesiones reales del historial
+        self.engine.journal.discard_session(session_id)
+
+    def _measure_with(self, tweaks, logger_func):
+        """Aplica el grupo, mide y deshace. Devuelve (medición, nombres que fallaron)"""
+        self.steps += 1
+        label = f"experimento {self.steps}"
+        logger_func(f"[EXP] Paso {self.steps}: {len(tweaks)} ajuste(s) - "
+                    + ", ".join(tweak.value_name for tweak in tweaks[:3]) + ("..." if len(tweaks) > 3 else ""))
+        summary = self.engine.apply(tweaks, lambda message: None, label=label)
+        failed = {entry["name"] for entry in summary["diff"] if entry["action"] == "failed"}
+        try:
+            result = None if failed else self.measure(logger_func, label)
+        finally:
+            self._rollback(summary["session_id"], logger_func)
+        return result, failed
+
+    def _compare(self, baseline, result):
+        return compare_samples(baseline["measurements"], result["measurements"],
+                               baseline.get("higher_is_better", True))
+
+    def _test_group(self, group, baseline, logger_func, skipped):
+        """Mide el grupo quitando los que no se pudieron aplicar. Devuelve la comparación o None"""
+        while group:
+            result, failed = self._measure_with(group, logger_func)
+            if not failed:
+                break
+            for tweak in group:
+                if tweak.name in failed:
+                    skipped.append({"name": tweak.name, "reason": "apply_failed"})
+                    logger_func(f"[WARN] {tweak.value_name} no se pudo aplicar, se excluye")
+            group[:] = [tweak for tweak in group if tweak.name not in failed]
+        if not group:
+            return None
+        if result is None:
+            for tweak in group:
+                skipped.append({"name": tweak.name, "reason": "noisy"})
+            logger_func("[WARN] Medición con ruido: el grupo queda sin resultado")
+            return None
+        return self._compare(baseline, result)
+
+    def _individual(self, tweaks, baseline, logger_func, effects, skipped):
+        for tweak in tweaks:
+            comparison = self._test_group([tweak], baseline, logger_func, skipped)
+            if comparison:
+                effects[tweak.name] = dict(comparison, tested_in=1)
+
+    def _bisect(self, group, baseline, logger_func, effects, skipped):
+        group = list(group)
+        comparison = self._test_group(group, baseline, logger_func, skipped)
+        if comparison is None:
+            return
+        if comparison["verdict"] == "inconclusive" or len(group) == 1:
+            for tweak in group:
+                # Un grupo sin efecto descarta a todos sus miembros sin medirlos por separado
+                effects[tweak.name] = dict(comparison, tested_in=len(group))
+            return
+        middle = len(group) // 2
+        self._bisect(group[:middle], baseline, logger_func, effects, skipped)
+        self._bisect(group[middle:], baseline, logger_func, effects, skipped)
+
+    @staticmethod
+    def rank(tweaks, effects):
+        """Tweaks medidos, primero los de efecto significativo, por |tamaño del efecto|"""
+        ranking = []
+        for tweak in tweaks:
+            effect = effects.get(tweak.name)
+            if effect is None:
+                continue
+            ranking.append({
+                "name": tweak.name,
+                "description": tweak.description,
+                "verdict": effect["verdict"] if effect["tested_in"] == 1 else "no_effect",
+                "effect_size": effect["effect_size"],
+                "improvement_pct": effect["improvement_pct"],
+                "improvement_ci95_pct": effect["improvement_ci95_pct"],
+                "tested_in": effect["tested_in"]
+            })
+        ranking.sort(key=lambda entry: (entry["verdict"] in ("inconclusive", "no_effect"),
+                                        -abs(entry["effect_size"])))
+        return ranking
+
+    def run(self, tweaks, logger_func, mode="bisect"):
+        """Ejecuta el experimento y devuelve el ranking por tamaño del efecto"""
+        if mode not in self.MODES:
+            raise ValueError(f"Modo desconocido: {mode}")
+        start = time.perf_counter()
+        self.steps = 0
+        skipped = []
+        candidates = []
+        for tweak, entry in zip(tweaks, self.engine.diff(tweaks)):
+            if tweak.kind == "bcd":
+                # Los cambios de arranque no tienen efecto hasta reiniciar
+                skipped.append({"name": tweak.name, "reason": "requires_reboot"})
+            elif not entry["pending"]:
+                skipped.append({"name": tweak.name, "reason": "already_applied"})
+            else:
+                candidates.append(tweak)
+
+        logger_func(f"[>>] Experimento {mode} sobre {len(candidates)} ajustes "
+                    f"({len(skipped)} omitidos) - métrica {self.metric or 'personalizada'}")
+        record = {"metric": self.metric, "mode": mode, "candidates": len(candidates),
+                  "skipped": skipped, "ranking": []}
+        if not candidates:
+            logger_func("[INFO] No hay ajustes pendientes que medir")
+            record.update(steps=0, elapsed_s=round(time.perf_counter() - start, 3))
+            return record
+
+        baseline = self.measure(logger_func, "base")
+        if baseline is None:
+            raise RuntimeError("No se obtuvo una medición base limpia")
+
+        effects = {}
+        if mode == "individual":
+            self._individual(candidates, baseline, logger_func, effects, skipped)
+        else:
+            self._bisect(candidates, baseline, logger_func, effects, skipped)
+
+        # Una segunda base detecta deriva del sistema durante el experimento
+        final = self.measure(logger_func, "base final")
+        drift = self._compare(baseline, final) if final else None
+        if drift and drift["verdict"] != "inconclusive":
+            logger_func(f"[WARN] La base cambió durante el experimento ({drift['improvement_pct']:+.1f}%): "
+                        "los efectos pequeños no son fiables")
+
+        record["ranking"] = self.rank(candidates, effects)
+        record.update(
+            baseline=round(sum(baseline["measurements"]) / len(baseline["measurements"]), 2),
+            unit=baseline.get("unit", ""),
+            drift=drift,
+            steps=self.steps,
+            elapsed_s=round(time.perf_counter() - start, 3)
+        )
+        for entry in record["ranking"]:
+            low, high = entry["improvement_ci95_pct"]
+            logger_func(f"[INFO] {entry['name']}: {entry['improvement_pct']:+.1f}% "
+                        f"(IC95 {low:+.1f}% a {high:+.1f}%, d={entry['effect_size']:+.2f}) {entry['verdict']}")
+        logger_func(f"[OK] Experimento completado en {self.steps} pasos ({record['elapsed_s']:.1f}s)")
+        return record
@@ -0,0 +1,190 @@
+import os
+import json
+import uuid
+from datetime import datetime
+
+from utils.system import CommandExecutor, run_commands
+
+
+def _encode(value):
+    """Valores de registro a JSON (REG_BINARY como hex)"""
+    if isinstance(value, (bytes, bytearray)):
+        return {"hex": bytes(value).hex()}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict) and "hex" in value:
+        return bytes.fromhex(value["hex"])
+    return value
+
+
+class TweakJournal:
+    """Diario de valores previos para deshacer tweaks sin punto de restauración.
+
+    Antes de empezar a escribir se agregan entradas "pending" con el valor
+    anterior (o su ausencia) de todos los cambios previstos y el diario se
+    reescribe de forma atómica (archivo temporal + fsync + os.replace). Si
+    el proceso se corta a mitad de la sesión, las entradas pendientes
+    alcanzan para volver al estado previo: restaurar un valor que no llegó
+    a cambiar no tiene efecto. Así cada sesión cuesta dos escrituras del
+    diario y no dos por cambio.
+
+    Al recortar el historial a MAX_SESSIONS sólo se descartan sesiones ya
+    deshechas o fallidas: una sesión con cambios vigentes nunca se pierde.
+    """
+
+    JOURNAL_FILE = "data/tweak_journal.json"
+    MAX_SESSIONS = 50
+
+    def __init__(self, path=None):
+        self.path = path or self.JOURNAL_FILE
+        self.sessions = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("sessions", [])
+        except (OSError, ValueError):
+            return []
+
+    @staticmethod
+    def _live(session):
+        return any(entry["status"] in ("pending", "applied") for entry in session["entries"])
+
+    def _trim(self):
+        """Descarta las sesiones cerradas más viejas que excedan MAX_SESSIONS"""
+        excess = len(self.sessions) - self.MAX_SESSIONS
+        if excess <= 0:
+            return
+        kept = []
+        for session in self.sessions:
+            if excess > 0 and not self._live(session):
+                excess -= 1
+                continue
+            kept.append(session)
+        self.sessions = kept
+
+    def _write(self):
+        self._trim()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"sessions": self.sessions}, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _session(self, session_id):
+        for session in self.sessions:
+            if session["id"] == session_id:
+                return session
+        raise KeyError(f"Sesión desconocida: {session_id}")
+
+    def begin_session(self, label):
+        session = {"id": uuid.uuid4().hex[:12], "label": label,
+                   "started": datetime.now().isoformat(timespec="seconds"), "entries": []}
+        self.sessions.append(session)
+        self._write()
+        return session["id"]
+
+    def record(self, session_id, changes):
+        """Registra los valores previos de [(tweak, actual)] ANTES de escribir.
+
+        Devuelve el índice de cada entrada en la sesión.
+        """
+        entries = self._session(session_id)["entries"]
+        indices = []
+        for tweak, current in changes:
+            entry = {"name": tweak.name, "kind": tweak.kind, "config_key": tweak.config_key, "status": "pending"}
+            if tweak.kind == "registry":
+                entry.update(key_path=tweak.key_path, value_name=tweak.value_name,
+                             previous=None if current is None else [_encode(current[0]), current[1]])
+            else:
+                entry.update(element=tweak.element, known=current is not None,
+                             previous=None if current is None else current[0])
+            entries.append(entry)
+            indices.append(len(entries) - 1)
+        self._write()
+        return indices
+
+    def mark(self, session_id, statuses):
+        """Actualiza el estado de varias entradas ({índice: estado}) en una escritura"""
+        entries = self._session(session_id)["entries"]
+        for index, status in statuses.items():
+            entries[index]["status"] = status
+        self._write()
+
+    @staticmethod
+    def restore_entry(entry, backend, command_runner=None, logger_func=None):
+        """Vuelve el valor de una entrada a su estado previo"""
+        if entry["kind"] == "registry":
+            if entry["previous"] is None:
+                backend.delete_value(entry["key_path"], entry["value_name"])
+            else:
+                value, value_type = entry["previous"]
+                backend.set_value(entry["key_path"], entry["value_name"], _decode(value), value_type)
+            return
+
+        if not entry.get("known"):
+            raise OSError(f"Valor previo desconocido para {entry['element']} (bcdedit no se pudo leer)")
+        if entry["previous"] is None:
+            args = ["bcdedit", "/deletevalue", entry["element"]]
+        else:
+            args = ["bcdedit", "/set", entry["element"], entry["previous"]]
+        result = (command_runner or run_commands)([args], logger_func=logger_func)[0]
+        error = CommandExecutor.describe_error(result)
+        if error is not None:
+            raise OSError(" ".join(args) + ": " + error)
+
+    def _rollback_entries(self, targets, backend, command_runner, logger_func):
+        """Restaura las entradas en orden inverso. Devuelve el resumen"""
+        restored = 0
+        failed = 0
+        config_keys = []
+        with backend.session() as session:
+            for entry in reversed(targets):
+                try:
+                    self.restore_entry(entry, session, command_runner)
+                    entry["status"] = "rolled_back"
+                    restored += 1
+                    if entry.get("config_key"):
+                        config_keys.append(entry["config_key"])
+                    logger_func(f"[OK] Restaurado {entry['name']}")
+                except Exception as e:
+                    failed += 1
+                    logger_func(f"[ERR] No se pudo restaurar {entry['name']}: {e}")
+        # Si se corta antes de esta escritura, las entradas siguen vigentes y
+        # repetir el rollback vuelve a restaurar los mismos valores
+        self._write()
+        return {"restored": restored, "failed": failed, "config_keys": config_keys}
+
+    def rollback_session(self, session_id, backend, command_runner=None, logger_func=print):
+        session = self._session(session_id)
+        targets = [entry for entry in session["entries"] if entry["status"] in ("pending", "applied")]
+        return self._rollback_entries(targets, backend, command_runner, logger_func)
+
+    def rollback_tweak(self, name, backend, command_runner=None, logger_func=print):
+        """Deshace el último cambio vigente de un tweak, en la sesión más reciente que lo tocó"""
+        for session in reversed(self.sessions):
+            for entry in reversed(session["entries"]):
+                if entry["name"].lower() == name.lower() and entry["status"] in ("pending", "applied"):
+                    return self._rollback_entries([entry], backend, command_runner, logger_func)
+        raise KeyError(f"No hay cambios vigentes para {name}")
+
+    def discard_session(self, session_id):
+        """Quita del diario una sesión sin cambios vigentes (p. ej. un paso de experimento ya deshecho)"""
+        session = self._session(session_id)
+        if self._live(session):
+            raise ValueError(f"La sesión {session_id} tiene cambios sin deshacer")
+        self.sessions.remove(session)
+        self._write()
+
+    def last_session_id(self):
+        """Sesión más reciente con cambios sin deshacer"""
+        for session in reversed(self.sessions):
+            if self._live(session):
+                return session["id"]
+        return None
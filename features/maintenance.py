@@ -1,107 +1,273 @@
+import io
 import os
-import shutil
 import time
 import datetime
 import psutil
-import stat
+import uuid
 import statistics
 import winreg
 from datetime import datetime as dt
 
+from features.benchmarks import BenchmarkIsolation
+from features.cleanup import TempCleaner, TempScanner, DirectoryIndex
+from features.diskusage import DiskUsageAnalyzer
+from features.pipeline import PipelineStep, StepScheduler
+from features.processes import ProcessAudit
+from features.monitor import SystemMonitor
+from features.reports import MaintenanceReportStore
+from features.environment import EnvironmentCapture
+
 class SystemMaintenance:
     """Módulo de mantenimiento del sistema"""
     
+    # Antigüedad aceptada del análisis de espacio guardado (mantenimiento de la interfaz)
+    DISK_USAGE_MAX_AGE_HOURS = 24
+    # Orden de las secciones en el informe
+    REPORT_ORDER = ["temp_cleanup", "system_info", "disk_usage", "disk_benchmark", "latency_test", "processes", "startup"]
+
+    @staticmethod
+    def build_steps(cleanup_filter=None, disk_usage_root=None, disk_usage_max_age=None):
+        """Pasos del mantenimiento con sus dependencias y conflictos.
+
+        La información del sistema se toma antes de la limpieza y del
+        benchmark de disco para no medir la carga del propio mantenimiento;
+        el benchmark de disco espera a la limpieza. El test de latencia
+        corre solo: fija todo el proceso al core 0, sube la prioridad y
+        apaga el GC, así que cualquier paso concurrente se apretaría en ese
+        core y su contención por el GIL caería dentro de las muestras.
+        El análisis de espacio (opcional) mide después de la limpieza y no
+        se cruza con el benchmark de disco ni con el test de latencia; con
+        disk_usage_max_age (horas) reutiliza el último árbol guardado si es
+        reciente en lugar de recorrer todo el volumen.
+        """
+        steps = [
+            PipelineStep("system_info", "Recolectando información del sistema",
+                         SystemMaintenance._collect_system_info,
+                         conflicts=["temp_cleanup", "disk_benchmark"]),
+            PipelineStep("processes", "Obteniendo procesos más pesados",
+                         SystemMaintenance._get_heavy_processes),
+            PipelineStep("startup", "Listando programas en Startup",
+                         SystemMaintenance._list_startup_programs),
+            PipelineStep("temp_cleanup", "Limpiando archivos temporales",
+                         lambda logger_func, log: SystemMaintenance._clean_temp_files(
+                             logger_func, log, file_filter=cleanup_filter)),
+            PipelineStep("disk_benchmark", "Ejecutando benchmark de disco",
+                         SystemMaintenance._run_disk_benchmark,
+                         depends_on=["temp_cleanup"]),
+            PipelineStep("latency_test", "Ejecutando test de latencia en core 0 (10 pruebas)",
+                         SystemMaintenance._run_latency_test,
+                         exclusive=True),
+        ]
+        if disk_usage_root:
+            steps.append(PipelineStep("disk_usage", "Analizando uso de disco",
+                                      lambda logger_func, log: SystemMaintenance._analyze_disk_usage(
+                                          logger_func, log, disk_usage_root, disk_usage_max_age),
+                                      depends_on=["temp_cleanup"],
+                                      conflicts=["disk_benchmark", "latency_test", "system_info"]))
+        return steps
+
     @staticmethod
-    def run_maintenance(logger_func):
-        """Ejecuta el mantenimiento completo"""
+    def run_maintenance(logger_func, cleanup_filter=None, disk_usage_root=None, disk_usage_max_age=None):
+        """Ejecuta el mantenimiento completo (pasos independientes en paralelo)"""
         logger_func("[>>] INICIANDO MANTENIMIENTO COMPLETO DEL SISTEMA")
 
         log_filename = f"mantenimiento_{dt.now().strftime('%Y-%m-%d_%H-%M-%S')}.txt"
         logfile = os.path.join(os.getcwd(), log_filename)
-        
-        with open(logfile, "w", encoding="utf-8") as log:
-            log.write("===== INFORME DE MANTENIMIENTO =====\\n")
-            log.write(f"Fecha: {dt.now()}\\n\\n")
 
-            logger_func("[>>] Limpiando archivos temporales...")
-            SystemMaintenance._clean_temp_files(logger_func, log)
+        # Si la interfaz no tiene el monitor corriendo (CLI), se arranca sólo
+        # durante el mantenimiento para registrar la carga que genera
+        owned_monitor = SystemMonitor.current() is None
+        monitor = SystemMonitor.shared()
 
-            logger_func("[>>] Recolectando información del sistema...")
-            SystemMaintenance._collect_system_info(logger_func, log)
+        start = time.perf_counter()
+        started_at = time.time()
+        outcomes = StepScheduler(SystemMaintenance.build_steps(cleanup_filter, disk_usage_root,
+                                                                 disk_usage_max_age),
+                                 logger_func).run()
+        wall_time = time.perf_counter() - start
+        load = {"during": monitor.summary(start=started_at, end=time.time())}
+        optimization_end = monitor.last_mark("optimization_end")
+        optimization_start = monitor.last_mark("optimization_start")
+        if optimization_start and optimization_end:
+            load["before_optimization"] = monitor.summary(start=optimization_start - 300, end=optimization_start)
+            load["after_optimization"] = monitor.summary(start=optimization_end, end=started_at)
+        if owned_monitor:
+            monitor.stop()
 
-            logger_func("[>>] Ejecutando benchmark de disco...")
-            SystemMaintenance._run_disk_benchmark(logger_func, log)
+        with open(logfile, "w", encoding="utf-8") as log:
+            log.write("===== INFORME DE MANTENIMIENTO =====\n")
+            log.write(f"Fecha: {dt.now()}\n\n")
 
-            logger_func("[>>] Ejecutando test de latencia en core 0 (10 pruebas)...")
-            SystemMaintenance._run_latency_test(logger_func, log)
+            sections = [name for name in SystemMaintenance.REPORT_ORDER if name in outcomes]
+            for name in sections:
+                log.write(outcomes[name]["output"])
 
-            logger_func("[>>] Obteniendo procesos más pesados...")
-            SystemMaintenance._get_heavy_processes(logger_func, log)
+            log.write("\n--- Duración de pasos ---\n")
+            for name in sections:
+                outcome = outcomes[name]
+                log.write(f"{name}: {outcome['duration_s']:.2f}s ({outcome['status']})\n")
+            log.write(f"Tiempo total: {wall_time:.2f}s\n")
 
-            logger_func("[>>] Listando programas en Startup...")
-            SystemMaintenance._list_startup_programs(logger_func, log)
+            SystemMaintenance._write_load_summary(log, "Carga durante el mantenimiento", load["during"])
+            if "before_optimization" in load:
+                SystemMaintenance._write_load_summary(log, "Antes de la última optimización (5 min)",
+                                                      load["before_optimization"])
+                SystemMaintenance._write_load_summary(log, "Después de la última optimización",
+                                                      load["after_optimization"])
+
+        sequential = sum(outcome["duration_s"] for outcome in outcomes.values())
+        logger_func(f"[INFO] Tiempo total: {wall_time:.1f}s (secuencial: {sequential:.1f}s)")
+
+        record = SystemMaintenance.build_record(outcomes, wall_time, sequential, load, log_filename)
+        try:
+            MaintenanceReportStore().append(record)
+        except Exception as e:
+            logger_func(f"[WARN] No se pudo guardar el informe estructurado: {e}")
 
         logger_func("[OK] MANTENIMIENTO COMPLETADO EXITOSAMENTE")
         logger_func(f"[INFO] Log guardado en {log_filename}")
         
-        return log_filename
+        return record
+
+    @staticmethod
+    def build_record(outcomes, wall_time, sequential, load, log_filename):
+        """Registro estructurado de la ejecución (un paso fallido queda en null)"""
+        result = lambda name: outcomes[name]["result"] if outcomes.get(name, {}).get("status") == "ok" else None
+        return {
+            "id": uuid.uuid4().hex,
+            "timestamp": dt.now().isoformat(timespec="seconds"),
+            "fingerprint": EnvironmentCapture.machine_fingerprint(),
+            "environment_id": EnvironmentCapture.environment_id(),
+            "environment": EnvironmentCapture.capture(),
+            "duration_s": round(wall_time, 3),
+            "sequential_s": round(sequential, 3),
+            "steps": {name: {"status": outcome["status"], "duration_s": outcome["duration_s"]}
+                      for name, outcome in outcomes.items()},
+            "cleanup": result("temp_cleanup"),
+            "system": result("system_info"),
+            "disk": result("disk_benchmark"),
+            "latency": result("latency_test"),
+            "processes": result("processes"),
+            "startup": result("startup"),
+            "disk_usage": result("disk_usage"),
+            "load": load,
+            "text_report": log_filename
+        }
+
+    @staticmethod
+    def _write_load_summary(log_file, title, summary):
+        log_file.write(f"\n--- {title} ---\n")
+        if not summary["samples"]:
+            log_file.write("Sin muestras del monitor\n")
+            return
+        log_file.write(f"Muestras: {summary['samples']} ({summary['duration_s']:.0f}s)\n")
+        log_file.write(f"CPU: prom. {summary['cpu']['avg']:.1f}% / máx. {summary['cpu']['max']:.1f}% "
+                       f"(core máx. {summary['cpu_max_core']:.0f}%)\n")
+        log_file.write(f"RAM: prom. {summary['memory']['avg']:.1f}% / máx. {summary['memory']['max']:.1f}%\n")
+        log_file.write(f"Disco: lectura {summary['disk_read_mbs']['avg']:.2f} MB/s, "
+                       f"escritura {summary['disk_write_mbs']['avg']:.2f} MB/s\n")
+        log_file.write(f"Red: enviado {summary['net_sent_mbs']['avg']:.2f} MB/s, "
+                       f"recibido {summary['net_recv_mbs']['avg']:.2f} MB/s\n")
+        if summary["top_processes"]:
+            names = ", ".join(f"{name} ({cpu:.0f}%)" for name, cpu in summary["top_processes"].items())
+            log_file.write(f"Procesos con más CPU: {names}\n")
+        log_file.write(f"Coste del monitor: {summary['monitor_cost_ms']['avg']:.2f} ms/muestra "
+                       f"(máx. {summary['monitor_cost_ms']['max']:.2f} ms)\n")
+
+    @staticmethod
+    def run_temp_cleanup(logger_func, dry_run=False, file_filter=None, log_file=None, use_index=True):
+        """Limpia (o sólo analiza) los temporales sin el resto del mantenimiento"""
+        log_file = log_file or io.StringIO()
+        action = "Analizando" if dry_run else "Limpiando"
+        logger_func(f"[>>] {action} archivos temporales...")
+        return SystemMaintenance._clean_temp_files(logger_func, log_file, dry_run, file_filter, use_index)
 
     @staticmethod
-    def _clean_temp_files(logger_func, log_file):
-        total_deleted = 0
-        total_skipped = 0
-        skipped_files = []
-        temp_paths = [
-            os.expandvars(r"%TEMP%"),
-            os.expandvars(r"%WINDIR%\\Temp"),
-            os.expandvars(r"%LOCALAPPDATA%\\Temp")
+    def _temp_paths():
+        """Directorios temporales a limpiar (sin duplicados)"""
+        candidates = [
+            os.path.expandvars(r"%TEMP%"),
+            os.path.expandvars(r"%WINDIR%\Temp"),
+            os.path.expandvars(r"%LOCALAPPDATA%\Temp")
         ]
+        paths = []
+        seen = set()
+        for path in candidates:
+            key = os.path.normcase(os.path.realpath(path))
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+        return paths
 
-        for path in temp_paths:
+    @staticmethod
+    def _clean_temp_files(logger_func, log_file, dry_run=False, file_filter=None, use_index=True):
+        existing_paths = []
+        for path in SystemMaintenance._temp_paths():
             if not os.path.exists(path):
                 logger_func(f"[WARN] Directorio no encontrado: {path}")
-                log_file.write(f"Directorio no encontrado: {path}\\n")
+                log_file.write(f"Directorio no encontrado: {path}\n")
                 continue
+            existing_paths.append(path)
 
-            try:
-                for root, dirs, files in os.walk(path, topdown=True):
-                    # Intentar eliminar directorios vacíos
-                    for dir_name in dirs:
-                        dir_path = os.path.join(root, dir_name)
-                        try:
-                            shutil.rmtree(dir_path, ignore_errors=True)
-                            total_deleted += 1
-                        except Exception:
-                            pass
+        index = DirectoryIndex() if use_index else None
 
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            try:
-                                os.chmod(file_path, stat.S_IWRITE | stat.S_IREAD)
-                            except Exception:
-                                pass
-
-                            os.remove(file_path)
-                            total_deleted += 1
-                            if total_deleted % 500 == 0:
-                                logger_func(f"[INFO] Eliminados {total_deleted} archivos...")
-                        except PermissionError as e:
-                            skipped_files.append((file_path, f"Permiso denegado: {str(e)}"))
-                            total_skipped += 1
-                        except OSError as e:
-                            skipped_files.append((file_path, f"Error del sistema: {str(e)}"))
-                            total_skipped += 1
-                        except Exception as e:
-                            skipped_files.append((file_path, f"Error: {str(e)}"))
-                            total_skipped += 1
-            except Exception as e:
-                logger_func(f"[WARN] Error al acceder al directorio {root}: {str(e)}")
-                log_file.write(f"Error al acceder al directorio {root}: {str(e)}\\n")
-
-        logger_func(f"[INFO] RESUMEN: {total_deleted} archivos/directorios eliminados, {total_skipped} omitidos")
-        log_file.write(f"Archivos y directorios eliminados: {total_deleted}\\n")
-        log_file.write(f"Archivos omitidos: {total_skipped}\\n")
+        if dry_run:
+            return SystemMaintenance._scan_temp_files(logger_func, log_file, existing_paths, file_filter, index)
+
+        if file_filter:
+            logger_func(f"[INFO] Filtro de limpieza: {file_filter.describe()}")
+        cleaner = TempCleaner(logger_func, file_filter=file_filter, index=index)
+        summary = cleaner.clean(existing_paths)
+        total_deleted = summary["deleted_files"] + summary["deleted_dirs"]
+        total_skipped = summary["skipped"]
+
+        logger_func(f"[INFO] RESUMEN: {total_deleted} archivos/directorios eliminados, {total_skipped} omitidos "
+                    f"({summary['elapsed_s']:.1f}s)")
+        if summary["unchanged_dirs"]:
+            logger_func(f"[INFO] {summary['unchanged_dirs']} directorios sin cambios desde la última limpieza")
+        log_file.write(f"Archivos y directorios eliminados: {total_deleted}\n")
+        log_file.write(f"Archivos omitidos: {total_skipped}\n")
+        log_file.write(f"Espacio liberado: {summary['deleted_bytes'] / (1024**2):.1f} MB\n")
+        if cleaner.errors.total:
+            top_types = ", ".join(f"{name} ({count})" for name, count in cleaner.errors.by_type.most_common(3))
+            logger_func(f"[WARN] Errores de borrado por tipo: {top_types}")
+        cleaner.errors.write_report(log_file)
+        return summary
+
+    @staticmethod
+    def _scan_temp_files(logger_func, log_file, paths, file_filter=None, index=None):
+        """Modo análisis: informa lo recuperable sin borrar nada"""
+        report = TempScanner(file_filter, index).scan(paths)
+        mb = report["bytes"] / (1024**2)
+
+        logger_func(f"[INFO] ANÁLISIS ({report['filter']}): {report['files']} archivos, "
+                    f"{mb:.1f} MB recuperables ({report['elapsed_s']:.1f}s)")
+        log_file.write(f"Análisis de temporales ({report['filter']})\n")
+        log_file.write(f"Archivos recuperables: {report['files']} ({mb:.1f} MB)\n")
+        if report["reused_dirs"]:
+            # El índice se valida con el mtime de cada carpeta: un archivo
+            # reescrito en su lugar no lo cambia, así que ese tamaño es estimado
+            reused = (f"{report['reused_dirs']} directorios sin cambios (índice, "
+                      f"{report['reused_bytes'] / (1024**2):.1f} MB estimados), "
+                      f"{report['scanned_dirs']} re-escaneados")
+            logger_func(f"[INFO] {reused}")
+            log_file.write(f"{reused}; el tamaño de archivos reescritos sin cambiar la carpeta "
+                           "puede estar desactualizado\n")
+
+        for root, totals in report["per_root"].items():
+            line = f"{root}: {totals['files']} archivos, {totals['bytes'] / (1024**2):.1f} MB"
+            logger_func(f"[INFO] {line}")
+            log_file.write(line + "\n")
+
+        for ext, totals in report["per_extension"].items():
+            log_file.write(f"  {ext}: {totals['files']} archivos, {totals['bytes'] / (1024**2):.1f} MB\n")
+
+        for label, totals in report["age_histogram"].items():
+            line = f"Antigüedad {label}: {totals['files']} archivos, {totals['bytes'] / (1024**2):.1f} MB"
+            logger_func(f"[INFO] {line}")
+            log_file.write(line + "\n")
+
+        return report
 
     @staticmethod
     def _collect_system_info(logger_func, log_file):
@@ -109,10 +275,64 @@ class SystemMaintenance:
         ram = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
 
-        log_file.write("\\n--- Estado del sistema ---\\n")
-        log_file.write(f"CPU en uso: {cpu_percent}%\\n")
-        log_file.write(f"RAM en uso: {ram.percent}% ({ram.used // (1024**2)}MB / {ram.total // (1024**2)}MB)\\n")
-        log_file.write(f"Disco libre: {disk.free // (1024**3)}GB de {disk.total // (1024**3)}GB\\n")
+        log_file.write("\n--- Estado del sistema ---\n")
+        log_file.write(f"CPU en uso: {cpu_percent}%\n")
+        log_file.write(f"RAM en uso: {ram.percent}% ({ram.used // (1024**2)}MB / {ram.total // (1024**2)}MB)\n")
+        log_file.write(f"Disco libre: {disk.free // (1024**3)}GB de {disk.total // (1024**3)}GB\n")
+
+        # Con el monitor corriendo, el último minuto dice más que un instante
+        monitor = SystemMonitor.current()
+        history = monitor.summary(seconds=60) if monitor else {"samples": 0}
+        if history["samples"] >= 10:
+            log_file.write(f"CPU último minuto: prom. {history['cpu']['avg']:.1f}% / "
+                           f"máx. {history['cpu']['max']:.1f}%\n")
+            log_file.write(f"RAM último minuto: prom. {history['memory']['avg']:.1f}%\n")
+        return {
+            "cpu_percent": cpu_percent,
+            "ram_percent": ram.percent,
+            "ram_used_mb": ram.used // (1024**2),
+            "ram_total_mb": ram.total // (1024**2),
+            "disk_free_gb": disk.free // (1024**3),
+            "disk_total_gb": disk.total // (1024**3),
+            "history": history
+        }
+
+    @staticmethod
+    def _analyze_disk_usage(logger_func, log_file, root, max_age_hours=None):
+        def progress(partial):
+            top = ", ".join(f"{os.path.basename(p['path']) or p['path']} {p['bytes'] / (1024**3):.1f} GB"
+                            for p in partial["top"][:3])
+            logger_func(f"[...] Uso de disco: {partial['scanned_dirs']} carpetas, "
+                        f"{partial['bytes'] / (1024**3):.1f} GB ({top})")
+
+        result = DiskUsageAnalyzer(progress_callback=progress).analyze(
+            root, use_cache=max_age_hours is not None, max_age_hours=max_age_hours)
+        tree = result["tree"]
+        hotspots = DiskUsageAnalyzer.hotspots(result)
+        if result["cached"]:
+            logger_func(f"[INFO] Uso de disco del análisis guardado "
+                        f"({dt.fromtimestamp(result['timestamp']):%Y-%m-%d %H:%M})")
+
+        log_file.write(f"\n--- Uso de disco ({result['root']}) ---\n")
+        log_file.write(f"Total: {tree['bytes'] / (1024**3):.2f} GB en {tree['files']} archivos, "
+                       f"{result['scanned_dirs']} carpetas ({result['elapsed_s']:.1f}s)\n")
+        if result["errors"]:
+            log_file.write(f"Carpetas sin acceso: {result['errors']}\n")
+        for spot in hotspots:
+            log_file.write(f"{spot['path']}: {spot['bytes'] / (1024**3):.2f} GB ({spot['files']} archivos)\n")
+        if hotspots:
+            logger_func(f"[INFO] Mayor carpeta: {hotspots[0]['path']} ({hotspots[0]['bytes'] / (1024**3):.1f} GB)")
+
+        return {
+            "root": result["root"],
+            "bytes": tree["bytes"],
+            "files": tree["files"],
+            "scanned_dirs": result["scanned_dirs"],
+            "errors": result["errors"],
+            "elapsed_s": result["elapsed_s"],
+            "cached": result["cached"],
+            "hotspots": hotspots
+        }
 
     @staticmethod
     def _run_disk_benchmark(logger_func, log_file):
@@ -121,98 +341,117 @@ class SystemMaintenance:
         data = os.urandom(1024 * 1024)
 
         try:
-            start_time = time.time()
-            with open(testfile, "wb") as f:
-                for _ in range(size_mb):
-                    f.write(data)
-            write_time = time.time() - start_time
-
-            start_time = time.time()
-            with open(testfile, "rb") as f:
-                while f.read(1024 * 1024):
-                    pass
-            read_time = time.time() - start_time
+            # Sin muestreo del monitor dentro de las secciones medidas
+            with SystemMonitor.paused():
+                start_time = time.time()
+                with open(testfile, "wb") as f:
+                    for _ in range(size_mb):
+                        f.write(data)
+                write_time = time.time() - start_time
+
+                start_time = time.time()
+                with open(testfile, "rb") as f:
+                    while f.read(1024 * 1024):
+                        pass
+                read_time = time.time() - start_time
 
             os.remove(testfile)
 
-            log_file.write("\\n--- Benchmark Disco ---\\n")
-            log_file.write(f"Vel. escritura: {size_mb / write_time:.2f} MB/s\\n")
-            log_file.write(f"Vel. lectura: {size_mb / read_time:.2f} MB/s\\n")
+            log_file.write("\n--- Benchmark Disco ---\n")
+            log_file.write(f"Vel. escritura: {size_mb / write_time:.2f} MB/s\n")
+            log_file.write(f"Vel. lectura: {size_mb / read_time:.2f} MB/s\n")
+            return {
+                "size_mb": size_mb,
+                "write_mbs": round(size_mb / write_time, 2),
+                "read_mbs": round(size_mb / read_time, 2)
+            }
         except Exception as e:
             logger_func(f"[ERR] Error en benchmark: {e}")
+            return {"error": str(e)}
 
     @staticmethod
     def _run_latency_test(logger_func, log_file):
-        log_file.write("\\n--- Latencia Core 0 (10 Pruebas) ---\\n")
+        log_file.write("\n--- Latencia Core 0 (10 Pruebas) ---\n")
         
-        p = psutil.Process()
-        original_affinity = p.cpu_affinity()
-        p.cpu_affinity([0])
         deltas = []
 
         try:
-            for i in range(10):
-                start = time.perf_counter_ns()
-                _ = sum(range(500))
-                end = time.perf_counter_ns()
-                latency = end - start
-                deltas.append(latency)
-                logger_func(f"[TEST] Chequeo {i+1}: {latency} ns")
-                log_file.write(f"Chequeo {i+1}: {latency} ns\\n")
-                log_file.flush()
-                time.sleep(0.5)
+            with BenchmarkIsolation(cores=[0]) as isolation:
+                for i in range(10):
+                    with isolation.timed():
+                        start = time.perf_counter_ns()
+                        _ = sum(range(500))
+                        end = time.perf_counter_ns()
+                    latency = end - start
+                    deltas.append(latency)
+                    logger_func(f"[TEST] Chequeo {i+1}: {latency} ns")
+                    log_file.write(f"Chequeo {i+1}: {latency} ns\n")
+                    log_file.flush()
+                    time.sleep(0.5)
         except Exception as e:
             logger_func(f"[ERR] Error en latencia: {e}")
-        finally:
-            p.cpu_affinity(original_affinity)
 
         if deltas:
             avg_lat = statistics.mean(deltas)
             std_lat = statistics.stdev(deltas) if len(deltas) > 1 else 0
             
-            logger_func("\\n[INFO] Análisis de Latencia:")
+            logger_func("[INFO] Análisis de Latencia:")
             logger_func(f"Min: {min(deltas)} ns")
             logger_func(f"Max: {max(deltas)} ns")
             logger_func(f"Promedio: {avg_lat:.2f} ns")
             
-            log_file.write("\\nAnálisis de Latencia:\\n")
-            log_file.write(f"Min: {min(deltas)} ns\\n")
-            log_file.write(f"Max: {max(deltas)} ns\\n")
-            log_file.write(f"Promedio: {avg_lat:.2f} ns\\n")
-            log_file.write(f"Desviación Estándar: {std_lat:.2f} ns\\n")
+            log_file.write("\nAnálisis de Latencia:\n")
+            log_file.write(f"Min: {min(deltas)} ns\n")
+            log_file.write(f"Max: {max(deltas)} ns\n")
+            log_file.write(f"Promedio: {avg_lat:.2f} ns\n")
+            log_file.write(f"Desviación Estándar: {std_lat:.2f} ns\n")
+            return {
+                "samples_ns": deltas,
+                "min_ns": min(deltas),
+                "max_ns": max(deltas),
+                "avg_ns": round(avg_lat, 2),
+                "stdev_ns": round(std_lat, 2)
+            }
+        return {"samples_ns": []}
 
     @staticmethod
     def _get_heavy_processes(logger_func, log_file):
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'memory_info', 'cpu_percent']):
-            try:
-                processes.append(proc.info)
-            except Exception:
-                continue
-        top_procs = sorted(processes, key=lambda p: p['memory_info'].rss if p['memory_info'] else 0, reverse=True)[:5]
+        audit = ProcessAudit.audit(interval=1.0)
+
+        log_file.write("\n--- Procesos principales ---\n")
+        log_file.write(f"({audit['process_count']} procesos, muestreo de {audit['interval_s']:.1f}s)\n")
+        for p in audit["top"]["rss"]:
+            log_file.write(f"{p['name']} (PID {p['pid']}) - CPU {p['cpu_percent']}% - RAM {p['rss_mb']:.2f} MB\n")
 
-        log_file.write("\\n--- Procesos principales ---\\n")
-        for p in top_procs:
-            mem = p['memory_info'].rss / (1024**2) if p['memory_info'] else 0
-            log_file.write(f"{p['name']} (PID {p['pid']}) - CPU {p['cpu_percent']}% - RAM {mem:.2f} MB\\n")
+        titles = {"cpu": "Mayor uso de CPU", "io": "Mayor E/S de disco", "handles": "Más handles"}
+        for key, title in titles.items():
+            log_file.write(f"\n{title}:\n")
+            for p in audit["top"][key]:
+                log_file.write(f"{p['name']} (PID {p['pid']}) - CPU {p['cpu_percent']}% - "
+                               f"E/S {p['io_mbs']:.2f} MB/s - Handles {p['handles']}\n")
+        return audit
 
     @staticmethod
     def _list_startup_programs(logger_func, log_file):
-        log_file.write("\\n--- Programas en Startup ---\\n")
+        log_file.write("\n--- Programas en Startup ---\n")
         startup_keys = [
-            (winreg.HKEY_CURRENT_USER, r"Software\\Microsoft\\Windows\\CurrentVersion\\Run"),
-            (winreg.HKEY_LOCAL_MACHINE, r"Software\\Microsoft\\Windows\\CurrentVersion\\Run")
+            (winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Run"),
+            (winreg.HKEY_LOCAL_MACHINE, r"Software\Microsoft\Windows\CurrentVersion\Run")
         ]
+        entries = []
         for root, path in startup_keys:
+            hive = "HKCU" if root == winreg.HKEY_CURRENT_USER else "HKLM"
             try:
                 with winreg.OpenKey(root, path) as key:
                     i = 0
                     while True:
                         try:
                             name, value, _ = winreg.EnumValue(key, i)
-                            log_file.write(f"{name}: {value}\\n")
+                            log_file.write(f"{name}: {value}\n")
+                            entries.append({"hive": hive, "name": name, "command": str(value)})
                             i += 1
                         except OSError:
                             break
             except FileNotFoundError:
                 continue
+        return {"count": len(entries), "entries": entries}
@@ -0,0 +1,297 @@
+import time
+import array
+import bisect
+import psutil
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from features.processes import ProcessAudit
+
+# NumPy se importa con el primer RingBuffer (importarlo cuesta decenas de ms)
+np = None
+_numpy_checked = False
+
+
+def _numpy():
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+        _numpy_checked = True
+    return np
+
+
+class RingBuffer:
+    """Serie de tamaño fijo: al llenarse sobrescribe la muestra más antigua.
+
+    Usa un array de NumPy si está instalado y si no array.array('d'); en
+    ambos casos la memoria se reserva una sola vez.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        if _numpy() is not None:
+            self._data = np.zeros(capacity, dtype=np.float64)
+        else:
+            self._data = array.array("d", bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def values(self, start=0, stop=None):
+        """Valores en orden cronológico (índices relativos a la muestra más antigua)"""
+        stop = self._count if stop is None else min(stop, self._count)
+        oldest = (self._next - self._count) % self.capacity
+        return [float(self._data[(oldest + i) % self.capacity]) for i in range(start, stop)]
+
+
+class SystemMonitor:
+    """Monitor en segundo plano: CPU por core, memoria, disco, red y procesos.
+
+    Cada muestra se guarda en buffers circulares de CAPACITY posiciones (una
+    hora a 1 muestra/s). Leer contadores del sistema cuesta microsegundos;
+    el recorrido de procesos es lo caro, así que se hace cada
+    'process_every' muestras y ese intervalo se duplica si el coste medio
+    supera MAX_OVERHEAD del intervalo de muestreo.
+
+    Durante un benchmark el muestreo se pausa (SystemMonitor.paused()) para
+    no sumar contención de CPU ni del GIL a las secciones medidas.
+    """
+
+    CAPACITY = 3600
+    PROCESS_HISTORY = 120
+    MAX_OVERHEAD = 0.02
+    SERIES = ("cpu", "memory", "disk_read_mbs", "disk_write_mbs", "net_sent_mbs", "net_recv_mbs")
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, interval=1.0, capacity=None, process_every=10):
+        self.interval = interval
+        self.capacity = capacity or SystemMonitor.CAPACITY
+        self.process_every = process_every
+        self.cores = psutil.cpu_count(logical=True) or 1
+
+        self.times = RingBuffer(self.capacity)
+        self.series = {name: RingBuffer(self.capacity) for name in SystemMonitor.SERIES}
+        self.per_core = [RingBuffer(self.capacity) for _ in range(self.cores)]
+        self.cost_ms = RingBuffer(self.capacity)
+        self.processes = deque(maxlen=SystemMonitor.PROCESS_HISTORY)
+        self.marks = deque(maxlen=SystemMonitor.PROCESS_HISTORY)
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_counters = None
+        self._last_snapshot = None
+        self._samples_taken = 0
+        # Pausas anidadas; _sample_lock se toma durante cada muestra
+        self._pause_count = 0
+        self._pause_lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._rebaseline = False
+
+    @staticmethod
+    def shared(interval=1.0):
+        """Instancia única de la aplicación (la crea y arranca la primera vez)"""
+        with SystemMonitor._shared_lock:
+            if SystemMonitor._shared is None:
+                SystemMonitor._shared = SystemMonitor(interval)
+            if not SystemMonitor._shared.running:
+                SystemMonitor._shared.start()
+            return SystemMonitor._shared
+
+    @staticmethod
+    def current():
+        """Instancia compartida si está corriendo, si no None"""
+        monitor = SystemMonitor._shared
+        return monitor if monitor is not None and monitor.running else None
+
+    @staticmethod
+    @contextmanager
+    def paused():
+        """Pausa el monitor compartido (si corre) durante el bloque"""
+        monitor = SystemMonitor.current()
+        if monitor is None:
+            yield
+            return
+        monitor.pause()
+        try:
+            yield
+        finally:
+            monitor.resume()
+
+    def pause(self):
+        """Detiene el muestreo; espera a que termine la muestra en curso"""
+        with self._pause_lock:
+            self._pause_count += 1
+        with self._sample_lock:
+            pass
+
+    def resume(self):
+        with self._pause_lock:
+            self._pause_count = max(0, self._pause_count - 1)
+            if self._pause_count == 0:
+                # La primera vuelta sólo toma referencias nuevas: los deltas no
+                # deben incluir la carga del propio benchmark
+                self._rebaseline = True
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        psutil.cpu_percent(interval=None, percpu=True)
+        self._last_counters = self._read_counters()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    @staticmethod
+    def _read_counters():
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        return {
+            "time": time.perf_counter(),
+            "disk_read": disk.read_bytes if disk else 0,
+            "disk_write": disk.write_bytes if disk else 0,
+            "net_sent": net.bytes_sent if net else 0,
+            "net_recv": net.bytes_recv if net else 0
+        }
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self._sample_lock:
+                if self._pause_count:
+                    continue
+                try:
+                    if self._rebaseline:
+                        self._rebaseline = False
+                        psutil.cpu_percent(interval=None, percpu=True)
+                        self._last_counters = self._read_counters()
+                        self._last_snapshot = None
+                        continue
+                    self._sample()
+                except Exception:
+                    continue
+
+    def _sample(self):
+        started = time.perf_counter()
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
+        memory = psutil.virtual_memory().percent
+        counters = self._read_counters()
+
+        previous = self._last_counters
+        elapsed = max(counters["time"] - previous["time"], 1e-6)
+        rate = lambda key: max(0, counters[key] - previous[key]) / (1024**2) / elapsed
+        self._last_counters = counters
+
+        top = None
+        if self._samples_taken % self.process_every == 0:
+            snapshot = ProcessAudit.snapshot()
+            if self._last_snapshot is not None:
+                top = ProcessAudit.compare(self._last_snapshot, snapshot, top_n=3, keys=("cpu", "rss"))["top"]
+            self._last_snapshot = snapshot
+        self._samples_taken += 1
+
+        cost = (time.perf_counter() - started) * 1000
+        now = time.time()
+        with self._lock:
+            self.times.append(now)
+            self.series["cpu"].append(sum(per_core) / len(per_core) if per_core else 0.0)
+            self.series["memory"].append(memory)
+            self.series["disk_read_mbs"].append(rate("disk_read"))
+            self.series["disk_write_mbs"].append(rate("disk_write"))
+            self.series["net_sent_mbs"].append(rate("net_sent"))
+            self.series["net_recv_mbs"].append(rate("net_recv"))
+            for ring, value in zip(self.per_core, per_core):
+                ring.append(value)
+            self.cost_ms.append(cost)
+            if top is not None:
+                self.processes.append((now, top))
+
+        # Cota de coste: si el monitor se come más de MAX_OVERHEAD del
+        # intervalo, se espacia el recorrido de procesos
+        if len(self.cost_ms) >= 10 and self._samples_taken % 10 == 0:
+            recent = self.cost_ms.values(len(self.cost_ms) - 10)
+            if sum(recent) / len(recent) > SystemMonitor.MAX_OVERHEAD * self.interval * 1000:
+                self.process_every = min(self.process_every * 2, 600)
+
+    def mark(self, label):
+        """Marca un evento (p. ej. una optimización) en la línea de tiempo"""
+        with self._lock:
+            self.marks.append((time.time(), label))
+
+    def last_mark(self, label):
+        with self._lock:
+            for timestamp, name in reversed(self.marks):
+                if name == label:
+                    return timestamp
+        return None
+
+    def window(self, seconds=None, start=None, end=None):
+        """Muestras entre 'start' y 'end' (epoch) o de los últimos 'seconds'"""
+        with self._lock:
+            times = self.times.values()
+            if seconds is not None:
+                start = (times[-1] if times else time.time()) - seconds
+            lo = bisect.bisect_left(times, start) if start is not None else 0
+            hi = bisect.bisect_right(times, end) if end is not None else len(times)
+
+            data = {"time": times[lo:hi], "cost_ms": self.cost_ms.values(lo, hi)}
+            for name, ring in self.series.items():
+                data[name] = ring.values(lo, hi)
+            data["per_core"] = [ring.values(lo, hi) for ring in self.per_core]
+
+            first = data["time"][0] if data["time"] else None
+            last = data["time"][-1] if data["time"] else None
+            data["processes"] = [(t, top) for t, top in self.processes
+                                 if first is not None and first <= t <= last]
+        return data
+
+    @staticmethod
+    def summarize(data):
+        """Promedio y máximo por serie, núcleo más cargado y procesos frecuentes"""
+        if not data["time"]:
+            return {"samples": 0}
+
+        summary = {
+            "samples": len(data["time"]),
+            "duration_s": round(data["time"][-1] - data["time"][0], 1)
+        }
+        for name in SystemMonitor.SERIES:
+            values = data[name]
+            summary[name] = {"avg": round(sum(values) / len(values), 2), "max": round(max(values), 2)}
+        summary["cpu_max_core"] = round(max((max(core) for core in data["per_core"] if core), default=0.0), 1)
+
+        seen = {}
+        for _, top in data["processes"]:
+            for record in top.get("cpu", []):
+                seen[record["name"]] = max(seen.get(record["name"], 0.0), record["cpu_percent"])
+        summary["top_processes"] = dict(sorted(seen.items(), key=lambda item: item[1], reverse=True)[:5])
+
+        costs = data["cost_ms"]
+        summary["monitor_cost_ms"] = {"avg": round(sum(costs) / len(costs), 2), "max": round(max(costs), 2)}
+        return summary
+
+    def summary(self, seconds=None, start=None, end=None):
+        return SystemMonitor.summarize(self.window(seconds, start, end))
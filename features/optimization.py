@@ -1,58 +1,104 @@
-import time
-from utils.system import run_command_in_shell
+from datetime import datetime
+from config.settings import config_manager
+from features.environment import EnvironmentCapture
+from features.tweaks import TweakEngine, PROFILE_GENERAL, PROFILE_GAMER
+from features.tweak_catalog import tweaks_for
+from features.journal import TweakJournal
 
 class SystemOptimizer:
     """Módulo de lógica de optimización del sistema"""
     
+    # Backend de registro (None = winreg). Las pruebas usan MemoryRegistryBackend
+    backend = None
+    # Diario de valores previos (None = TweakJournal.JOURNAL_FILE)
+    journal_file = None
+
+    @staticmethod
+    def engine():
+        return TweakEngine(SystemOptimizer.backend, journal=TweakJournal(SystemOptimizer.journal_file))
+
+    @staticmethod
+    def preview(profile=PROFILE_GENERAL):
+        """Diff del perfil contra el registro actual, sin escribir nada"""
+        return SystemOptimizer.engine().diff(tweaks_for(profile))
+
     @staticmethod
-    def run_optimization(logger_func):
-        """Ejecuta el proceso de optimización completo"""
+    def apply_gamer_tweaks(logger_func, session_id=None):
+        """Activa NoLazyMode y Win32PrioritySeparation (perfil GAMER)"""
+        tweaks = tweaks_for(PROFILE_GAMER, include_general=False)
+        summary = SystemOptimizer.engine().apply(tweaks, logger_func, session_id, label=PROFILE_GAMER)
+
+        enabled = {}
+        for tweak, entry in zip(tweaks, summary["diff"]):
+            if entry["action"] == "failed":
+                logger_func(f"[ERR] Error al activar {tweak.value_name}")
+            elif tweak.config_key:
+                logger_func(f"[OK] {tweak.value_name} ACTIVADO")
+                enabled[tweak.config_key] = True
+        config_manager.update(enabled)
+        return summary
+    
+    @staticmethod
+    def run_optimization(logger_func, session_id=None):
+        """Ejecuta el proceso de optimización completo.
+
+        session_id agrupa estos cambios con los del perfil GAMER en el
+        diario, para deshacerlos juntos.
+        """
         logger_func("[>>] INICIANDO PROCESO DE OPTIMIZACIÓN COMPLETO")
-        logger_func("[>>] Preparando módulos de optimización del sistema...")
         
-        for i in range(3):
-            logger_func(f"[...] Cargando módulos de optimización [{'■' * (i+1)}{'□' * (2-i)}]")
-            time.sleep(0.3)
+        summary = SystemOptimizer.engine().apply(tweaks_for(PROFILE_GENERAL), logger_func, session_id,
+                                                 label=PROFILE_GENERAL)
         
-        reg_commands = [
-            ('reg add "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Power\\PowerThrottling" /v "PowerThrottlingOff" /t REG_DWORD /d 1 /f', "[>>] Desactivando Power Throttling"),
-            ('reg add "HKLM\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\Multimedia\\SystemProfile" /v "SystemResponsiveness" /t REG_DWORD /d 10 /f', "[>>] Ajustando SystemResponsiveness"),
-            ('reg add "HKLM\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\Multimedia\\SystemProfile" /v "NetworkThrottlingIndex" /t REG_DWORD /d 4294967295 /f', "[>>] Optimizando NetworkThrottlingIndex"),
-            ('reg add "HKCU\\System\\GameConfigStore" /v "GameDVR_Enabled" /t REG_DWORD /d 0 /f', "[>>] Desactivando GameDVR"),
-            ('reg add "HKCU\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\GameDVR" /v "AppCaptureEnabled" /t REG_DWORD /d 0 /f', "[>>] Desactivando AppCapture"),
-            ('reg add "HKCU\\Control Panel\\Desktop" /v "AutoEndTasks" /t REG_SZ /d "1" /f', "[>>] Configurando AutoEndTasks"),
-            ('reg add "HKCU\Control Panel\\Desktop" /v "HungAppTimeout" /t REG_SZ /d "1000" /f', "[>>] Ajustando HungAppTimeout"),
-            ('reg add "HKCU\\Control Panel\\Desktop" /v "WaitToKillAppTimeout" /t REG_SZ /d "3000" /f', "[>>] Configurando WaitToKillAppTimeout"),
-            ('reg add "HKCU\\Control Panel\\Desktop" /v "LowLevelHooksTimeout" /t REG_SZ /d "1000" /f', "[>>] Ajustando LowLevelHooksTimeout"),
-            ('reg add "HKCU\\Control Panel\\Desktop" /v "MenuShowDelay" /t REG_SZ /d "0" /f', "[>>] Eliminando delay en menús"),
-            ('reg add "HKLM\\SYSTEM\\CurrentControlSet\\Control" /v "WaitToKillServiceTimeout" /t REG_SZ /d "2000" /f', "[>>] Configurando WaitToKillServiceTimeout"),
-            ('reg add "HKLM\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\Schedule\\Maintenance" /v "MaintenanceDisabled" /t REG_DWORD /d 1 /f', "[>>] Desactivando mantenimiento automático"),
-            ('reg add "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Power" /v "HibernateEnabled" /t REG_DWORD /d 0 /f', "[>>] Desactivando hibernación"),
-            ('bcdedit /set disabledynamictick yes', "[>>] Configurando disabledynamictick"),
-            ('bcdedit /deletevalue useplatformclock', "[>>] Eliminando useplatformclock"),
-            ('bcdedit /set useplatformtick yes', "[>>] Configurando useplatformtick")
-        ]
-        
-        total_commands = len(reg_commands)
-        executed_commands = 0
-        
-        for i, (cmd, desc) in enumerate(reg_commands, 1):
-            logger_func(f"[RUN] Ejecutando: {desc}")
-            
-            progress = int(i/total_commands * 100)
-            progress_bar = f"[{'█' * int(progress/5)}{'░' * (20 - int(progress/5))}]"
-            logger_func(f"[PROG] {progress_bar} {progress}%")
-            
-            success = run_command_in_shell(cmd)
-            if success:
-                logger_func(f"[OK] Comando completado exitosamente")
-                executed_commands += 1
-            else:
-                logger_func(f"[WARN] Advertencia en comando")
-            time.sleep(0.2)
+        # Los benchmarks anteriores a este punto ya no son reutilizables
+        config_manager.update(last_optimization=datetime.now().isoformat())
+        EnvironmentCapture.invalidate()
         
         logger_func("[OK] OPTIMIZACIÓN COMPLETADA EXITOSAMENTE")
-        logger_func(f"[INFO] Comandos ejecutados: {executed_commands}/{total_commands}")
+        logger_func(f"[INFO] Ajustes aplicados: {summary['applied']}, ya estaban: {summary['unchanged']}, "
+                    f"con error: {summary['failed']} ({summary['elapsed_s']:.2f}s)")
         logger_func("[INFO] Sistema optimizado para máximo rendimiento")
         
-        return True
+        return summary
+
+    @staticmethod
+    def apply_profile(profile, logger_func):
+        """Aplica un perfil completo (GAMER = sus tweaks + GENERAL) en una sola sesión del diario"""
+        gamer = None
+        if profile.upper() == PROFILE_GAMER:
+            gamer = SystemOptimizer.apply_gamer_tweaks(logger_func)
+        summary = SystemOptimizer.run_optimization(logger_func, session_id=gamer["session_id"] if gamer else None)
+        diff = summary["diff"] + (gamer["diff"] if gamer else [])
+        return {
+            "profile": profile.lower(),
+            "success": not any(entry["action"] == "failed" for entry in diff),
+            "applied": sum(1 for entry in diff if entry["action"] == "changed"),
+            "unchanged": sum(1 for entry in diff if entry["action"] == "unchanged"),
+            "session_id": summary["session_id"] or (gamer["session_id"] if gamer else None),
+            "diff": diff
+        }
+
+    @staticmethod
+    def rollback(logger_func, session_id=None, tweak_name=None):
+        """Deshace una sesión (por defecto la última) o un único tweak con el diario"""
+        engine = SystemOptimizer.engine()
+        journal = engine.journal
+
+        if tweak_name:
+            logger_func(f"[>>] Deshaciendo {tweak_name}...")
+            summary = journal.rollback_tweak(tweak_name, engine.backend, engine.command_runner, logger_func)
+        else:
+            session_id = session_id or journal.last_session_id()
+            if session_id is None:
+                logger_func("[INFO] No hay cambios para deshacer")
+                return {"restored": 0, "failed": 0, "config_keys": []}
+            logger_func(f"[>>] Deshaciendo la sesión {session_id}...")
+            summary = journal.rollback_session(session_id, engine.backend, engine.command_runner, logger_func)
+
+        # Volver atrás también invalida los benchmarks previos
+        config_manager.update({key: False for key in summary["config_keys"]},
+                              last_optimization=datetime.now().isoformat())
+        EnvironmentCapture.invalidate()
+
+        logger_func(f"[OK] Valores restaurados: {summary['restored']}, con error: {summary['failed']}")
+        return summary
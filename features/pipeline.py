@@ -0,0 +1,113 @@
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class PipelineStep:
+    """Paso de un pipeline con dependencias y conflictos declarados"""
+
+    def __init__(self, name, title, func, depends_on=(), conflicts=(), exclusive=False):
+        self.name = name
+        self.title = title
+        self.func = func
+        self.depends_on = set(depends_on)
+        self.conflicts = set(conflicts)
+        self.exclusive = exclusive
+
+
+class StepScheduler:
+    """Ejecuta pasos en paralelo respetando dependencias y conflictos.
+
+    - depends_on: el paso no empieza hasta que terminen esos pasos (si alguno
+      falla, el paso se omite).
+    - conflicts: el paso nunca corre a la vez que esos pasos (la relación es
+      simétrica).
+    - exclusive: el paso corre solo, sin ningún otro paso en paralelo.
+
+    Los pasos se arrancan en el orden en que se declararon. Un paso listo
+    pero bloqueado por un conflicto "reserva" su turno: no se arranca ningún
+    paso posterior que también choque con él, para que no se le adelante.
+    Cada paso escribe en su propio buffer; el informe se arma al final en
+    el orden pedido, sin mezclar líneas de pasos concurrentes.
+    """
+
+    def __init__(self, steps, logger_func, max_workers=None):
+        self.steps = list(steps)
+        self.logger_func = logger_func
+        self.max_workers = max_workers or len(self.steps) or 1
+        self._by_name = {step.name: step for step in self.steps}
+        for step in self.steps:
+            unknown = (step.depends_on | step.conflicts) - set(self._by_name)
+            if unknown:
+                raise ValueError(f"Paso {step.name}: referencias desconocidas {sorted(unknown)}")
+
+    def _conflict(self, a, b):
+        step_a, step_b = self._by_name[a], self._by_name[b]
+        return step_a.exclusive or step_b.exclusive or b in step_a.conflicts or a in step_b.conflicts
+
+    def run(self):
+        """Devuelve {nombre: {"status", "duration_s", "result", "output"}}"""
+        outcomes = {}
+        pending = [step.name for step in self.steps]
+        running = {}
+        buffers = {}
+        started = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                reserved = set()
+                for name in list(pending):
+                    step = self._by_name[name]
+
+                    failed_deps = [d for d in step.depends_on
+                                   if d in outcomes and outcomes[d]["status"] != "ok"]
+                    if failed_deps:
+                        pending.remove(name)
+                        outcomes[name] = {"status": "skipped", "duration_s": 0.0, "result": None, "output": ""}
+                        self.logger_func(f"[WARN] {step.title}: omitido (falló {', '.join(failed_deps)})")
+                        continue
+
+                    if not step.depends_on.issubset(outcomes):
+                        continue
+                    if len(running) >= self.max_workers:
+                        break
+
+                    blockers = [other for other in list(running) + list(reserved) if self._conflict(name, other)]
+                    if blockers:
+                        reserved.add(name)
+                        continue
+
+                    pending.remove(name)
+                    buffers[name] = io.StringIO()
+                    started[name] = time.perf_counter()
+                    self.logger_func(f"[>>] {step.title}...")
+                    running[name] = pool.submit(step.func, self.logger_func, buffers[name])
+
+                if not running:
+                    if pending:
+                        # Sólo quedan pasos con dependencias imposibles de satisfacer
+                        raise RuntimeError(f"Pasos bloqueados: {pending}")
+                    break
+
+                done, _ = wait(list(running.values()), return_when=FIRST_COMPLETED)
+                for name, future in list(running.items()):
+                    if future not in done:
+                        continue
+                    del running[name]
+                    duration = time.perf_counter() - started[name]
+                    try:
+                        result = future.result()
+                        status = "ok"
+                    except Exception as e:
+                        result = None
+                        status = "error"
+                        self.logger_func(f"[ERR] {self._by_name[name].title}: {e}")
+                    outcomes[name] = {
+                        "status": status,
+                        "duration_s": round(duration, 3),
+                        "result": result,
+                        "output": buffers[name].getvalue()
+                    }
+                    self.logger_func(f"[INFO] {self._by_name[name].title}: {duration:.2f}s")
+
+        return outcomes
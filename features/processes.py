@@ -0,0 +1,105 @@
+import os
+import time
+import heapq
+import psutil
+
+
+class ProcessAudit:
+    """Auditoría de procesos con dos muestras separadas por un intervalo.
+
+    El cpu_percent de la primera llamada a process_iter siempre es 0.0; aquí
+    la CPU (y la E/S) se calculan como diferencia de tiempos entre dos
+    instantáneas. Cada proceso se lee dentro de Process.oneshot() y los
+    primeros N por cada criterio se eligen con heapq.nlargest, sin ordenar
+    la lista completa.
+    """
+
+    KEYS = ("rss", "cpu", "io", "handles")
+    TOP_N = 5
+
+    @staticmethod
+    def _read(proc):
+        with proc.oneshot():
+            cpu = proc.cpu_times()
+            info = {
+                "pid": proc.pid,
+                "name": proc.name(),
+                "create_time": proc.create_time(),
+                "rss": proc.memory_info().rss,
+                "cpu_time": cpu.user + cpu.system,
+                "io_bytes": 0,
+                "handles": 0
+            }
+            try:
+                io = proc.io_counters()
+                info["io_bytes"] = io.read_bytes + io.write_bytes
+            except (psutil.AccessDenied, AttributeError, NotImplementedError):
+                pass
+            try:
+                info["handles"] = proc.num_handles() if hasattr(proc, "num_handles") else proc.num_fds()
+            except (psutil.AccessDenied, AttributeError, NotImplementedError):
+                pass
+        return info
+
+    @staticmethod
+    def snapshot():
+        """Instantánea {pid: datos} de todos los procesos accesibles"""
+        processes = {}
+        for proc in psutil.process_iter():
+            try:
+                processes[proc.pid] = ProcessAudit._read(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            except Exception:
+                continue
+        return {"time": time.perf_counter(), "processes": processes}
+
+    @staticmethod
+    def compare(first, second, top_n=None, keys=None, exclude_pid=None):
+        """Calcula CPU% y E/S entre dos instantáneas y devuelve los N primeros por criterio"""
+        top_n = top_n or ProcessAudit.TOP_N
+        keys = keys or ProcessAudit.KEYS
+        elapsed = max(second["time"] - first["time"], 1e-6)
+        previous = first["processes"]
+
+        records = []
+        for pid, info in second["processes"].items():
+            if pid == exclude_pid or not pid:
+                continue
+            before = previous.get(pid)
+            # Mismo PID pero otro proceso (PID reutilizado): sin referencia previa
+            if before is None or before["create_time"] != info["create_time"]:
+                cpu_percent = 0.0
+                io_rate = 0.0
+            else:
+                cpu_percent = max(0.0, info["cpu_time"] - before["cpu_time"]) / elapsed * 100
+                io_rate = max(0, info["io_bytes"] - before["io_bytes"]) / elapsed
+            records.append({
+                "pid": pid,
+                "name": info["name"],
+                "rss_mb": round(info["rss"] / (1024**2), 2),
+                "cpu_percent": round(cpu_percent, 1),
+                "io_mbs": round(io_rate / (1024**2), 2),
+                "handles": info["handles"]
+            })
+
+        sort_keys = {
+            "rss": lambda r: r["rss_mb"],
+            "cpu": lambda r: r["cpu_percent"],
+            "io": lambda r: r["io_mbs"],
+            "handles": lambda r: r["handles"]
+        }
+        return {
+            "interval_s": round(elapsed, 3),
+            "process_count": len(records),
+            "top": {key: heapq.nlargest(top_n, records, key=sort_keys[key]) for key in keys}
+        }
+
+    @staticmethod
+    def audit(interval=1.0, top_n=None, keys=None, exclude_own=False):
+        """Toma dos instantáneas separadas por 'interval' segundos y las compara"""
+        first = ProcessAudit.snapshot()
+        time.sleep(interval)
+        second = ProcessAudit.snapshot()
+        exclude_pid = os.getpid() if exclude_own else None
+        return ProcessAudit.compare(first, second, top_n, keys, exclude_pid)
@@ -0,0 +1,160 @@
+import os
+import time
+import psutil
+import threading
+
+from features.processes import ProcessAudit
+
+
+class SystemQuiescence:
+    """Chequeo previo: espera a que el sistema esté en reposo antes de medir"""
+
+    CPU_AVG_THRESHOLD = 15.0      # % de CPU total
+    CPU_CORE_THRESHOLD = 60.0     # % de cualquier core individual
+    DISK_THRESHOLD_MBS = 5.0      # MB/s de lectura + escritura
+    SAMPLE_INTERVAL = 0.5
+    QUIET_SAMPLES = 2
+    TIMEOUT = 30.0
+
+    @staticmethod
+    def _disk_bytes():
+        try:
+            io = psutil.disk_io_counters()
+            return io.read_bytes + io.write_bytes if io else 0
+        except Exception:
+            return 0
+
+    @staticmethod
+    def sample(interval=None):
+        """Toma una muestra de carga del sistema durante 'interval' segundos"""
+        interval = interval or SystemQuiescence.SAMPLE_INTERVAL
+        disk_before = SystemQuiescence._disk_bytes()
+        per_cpu = psutil.cpu_percent(interval=interval, percpu=True)
+        disk_after = SystemQuiescence._disk_bytes()
+
+        return {
+            "cpu_avg": round(sum(per_cpu) / len(per_cpu), 1) if per_cpu else 0.0,
+            "cpu_max_core": max(per_cpu) if per_cpu else 0.0,
+            "disk_mbs": round(max(0, disk_after - disk_before) / (1024**2) / interval, 2)
+        }
+
+    @staticmethod
+    def is_quiet(sample):
+        return (sample["cpu_avg"] <= SystemQuiescence.CPU_AVG_THRESHOLD
+                and sample["cpu_max_core"] <= SystemQuiescence.CPU_CORE_THRESHOLD
+                and sample["disk_mbs"] <= SystemQuiescence.DISK_THRESHOLD_MBS)
+
+    @staticmethod
+    def wait_until_quiet(progress_callback=None, timeout=None):
+        """Espera hasta QUIET_SAMPLES muestras seguidas en reposo o hasta el timeout"""
+        timeout = SystemQuiescence.TIMEOUT if timeout is None else timeout
+        start = time.perf_counter()
+        quiet_streak = 0
+        sample = None
+        own_pid = os.getpid()
+
+        # Instantánea inicial: la CPU de cada proceso se mide sobre toda la espera
+        first_snapshot = ProcessAudit.snapshot()
+
+        while True:
+            sample = SystemQuiescence.sample()
+            quiet_streak = quiet_streak + 1 if SystemQuiescence.is_quiet(sample) else 0
+            waited = time.perf_counter() - start
+
+            if quiet_streak >= SystemQuiescence.QUIET_SAMPLES:
+                if progress_callback:
+                    progress_callback(f"[INFO] Sistema en reposo (CPU {sample['cpu_avg']}%, disco {sample['disk_mbs']} MB/s)")
+                return {"quiet": True, "waited_s": round(waited, 2), "sample": sample}
+
+            if waited >= timeout:
+                audit = ProcessAudit.compare(first_snapshot, ProcessAudit.snapshot(),
+                                             top_n=5, keys=("cpu",), exclude_pid=own_pid)
+                top = audit["top"]["cpu"]
+                if progress_callback:
+                    names = ", ".join(f"{p['name']} ({p['cpu_percent']:.0f}%)" for p in top[:3])
+                    progress_callback(f"[WARN] El sistema sigue ocupado tras {timeout:.0f}s "
+                                      f"(CPU {sample['cpu_avg']}%): {names}")
+                return {"quiet": False, "waited_s": round(waited, 2), "sample": sample, "top_processes": top}
+
+            if quiet_streak == 0 and progress_callback:
+                progress_callback(f"[...] Esperando reposo del sistema (CPU {sample['cpu_avg']}%, "
+                                  f"core máx {sample['cpu_max_core']}%, disco {sample['disk_mbs']} MB/s)")
+
+
+class LoadMonitor:
+    """Registra la carga ajena al benchmark mientras se ejecuta"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.samples = []
+        self.top_seen = {}
+        self._first_snapshot = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._process = psutil.Process()
+        self._cpu_count = psutil.cpu_count(logical=True) or 1
+
+    def _own_io_bytes(self):
+        try:
+            io = self._process.io_counters()
+            return io.read_bytes + io.write_bytes
+        except Exception:
+            return 0
+
+    def _run(self):
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+        disk_before = SystemQuiescence._disk_bytes()
+        own_io_before = self._own_io_bytes()
+
+        while not self._stop.wait(self.interval):
+            system_cpu = psutil.cpu_percent(interval=None)
+            own_cpu = self._process.cpu_percent(interval=None) / self._cpu_count
+            disk_after = SystemQuiescence._disk_bytes()
+            own_io_after = self._own_io_bytes()
+
+            foreign_disk = (disk_after - disk_before) - (own_io_after - own_io_before)
+            self.samples.append({
+                "background_cpu": max(0.0, system_cpu - own_cpu),
+                "background_disk_mbs": max(0.0, foreign_disk / (1024**2) / self.interval)
+            })
+            disk_before, own_io_before = disk_after, own_io_after
+
+    def start(self):
+        # Los procesos ajenos se comparan entre el inicio y el final de la
+        # ejecución: dos recorridos en total, no uno por muestra
+        self._first_snapshot = ProcessAudit.snapshot()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Detiene el monitor y devuelve el resumen de carga de fondo"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+        if self._first_snapshot is not None:
+            audit = ProcessAudit.compare(self._first_snapshot, ProcessAudit.snapshot(),
+                                         top_n=3, keys=("cpu",), exclude_pid=self._process.pid)
+            for p in audit["top"]["cpu"]:
+                if p["cpu_percent"] >= SystemQuiescence.CPU_CORE_THRESHOLD / 4:
+                    self.top_seen[p["name"]] = p["cpu_percent"]
+
+        if not self.samples:
+            return {"samples": 0, "background_cpu_avg": 0.0, "background_cpu_max": 0.0,
+                    "background_disk_mbs_avg": 0.0, "processes": {}}
+
+        cpu_values = [s["background_cpu"] for s in self.samples]
+        disk_values = [s["background_disk_mbs"] for s in self.samples]
+        return {
+            "samples": len(self.samples),
+            "background_cpu_avg": round(sum(cpu_values) / len(cpu_values), 1),
+            "background_cpu_max": round(max(cpu_values), 1),
+            "background_disk_mbs_avg": round(sum(disk_values) / len(disk_values), 2),
+            "processes": self.top_seen
+        }
+
+    @staticmethod
+    def is_contaminated(summary):
+        return (summary["background_cpu_avg"] > SystemQuiescence.CPU_AVG_THRESHOLD
+                or summary["background_disk_mbs_avg"] > SystemQuiescence.DISK_THRESHOLD_MBS)
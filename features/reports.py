@@ -0,0 +1,174 @@
+import os
+import json
+import sqlite3
+
+
+class MaintenanceReportStore:
+    """Historial estructurado de mantenimientos.
+
+    Cada ejecución se agrega como una línea JSON a REPORTS_FILE (sólo se
+    escribe al final, nunca se reescribe) y una fila a INDEX_FILE con las
+    métricas principales, la posición de la línea en el archivo, la huella
+    del equipo y el entorno (que además cambia con los ajustes aplicados y
+    la fuente de energía). Las tendencias se consultan en el índice sin
+    leer ni parsear los informes completos; si el índice se pierde se
+    reconstruye desde el NDJSON.
+    """
+
+    REPORTS_FILE = "data/maintenance_reports.ndjson"
+    INDEX_FILE = "data/maintenance_reports.sqlite"
+    SCHEMA_VERSION = 1
+
+    # Métricas indexadas: columna -> ruta dentro del registro
+    METRICS = {
+        "freed_bytes": ("cleanup", "deleted_bytes"),
+        "deleted_files": ("cleanup", "deleted_files"),
+        "cleanup_errors": ("cleanup", "errors", "total"),
+        "cpu_percent": ("system", "cpu_percent"),
+        "ram_percent": ("system", "ram_percent"),
+        "disk_free_gb": ("system", "disk_free_gb"),
+        "disk_write_mbs": ("disk", "write_mbs"),
+        "disk_read_mbs": ("disk", "read_mbs"),
+        "latency_avg_ns": ("latency", "avg_ns"),
+        "latency_stdev_ns": ("latency", "stdev_ns"),
+        "startup_entries": ("startup", "count"),
+        "disk_used_bytes": ("disk_usage", "bytes"),
+        "duration_s": ("duration_s",)
+    }
+
+    def __init__(self, reports_file=None, index_file=None):
+        self.reports_file = reports_file or self.REPORTS_FILE
+        self.index_file = index_file or self.INDEX_FILE
+
+    def _connect(self):
+        directory = os.path.dirname(self.index_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.index_file)
+        columns = ", ".join(f"{name} REAL" for name in self.METRICS)
+        conn.execute(f"""CREATE TABLE IF NOT EXISTS reports (
+            id TEXT PRIMARY KEY, timestamp TEXT, fingerprint TEXT, environment_id TEXT, node TEXT,
+            byte_offset INTEGER, byte_length INTEGER, {columns})""")
+        # Métricas agregadas en versiones posteriores: columnas nuevas (NULL en
+        # los informes viejos hasta un reindex)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(reports)")}
+        for name in self.METRICS:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE reports ADD COLUMN {name} REAL")
+        conn.execute("CREATE INDEX IF NOT EXISTS reports_fp_time ON reports (fingerprint, timestamp)")
+        conn.execute("CREATE INDEX IF NOT EXISTS reports_env_time ON reports (environment_id, timestamp)")
+        conn.execute("CREATE INDEX IF NOT EXISTS reports_time ON reports (timestamp)")
+        return conn
+
+    @staticmethod
+    def _metric(record, path):
+        value = record
+        for key in path:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value if isinstance(value, (int, float)) else None
+
+    def _index_row(self, record, offset, length):
+        environment = record.get("environment") or {}
+        return ((record["id"], record["timestamp"], record.get("fingerprint"), record.get("environment_id"),
+                 environment.get("node"), offset, length)
+                + tuple(self._metric(record, path) for path in self.METRICS.values()))
+
+    def _insert(self, conn, rows):
+        columns = ["id", "timestamp", "fingerprint", "environment_id", "node", "byte_offset", "byte_length"] + list(self.METRICS)
+        placeholders = ", ".join("?" for _ in columns)
+        conn.executemany(f"INSERT OR REPLACE INTO reports ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+    def append(self, record):
+        """Agrega el registro al NDJSON y al índice"""
+        record = dict(record, schema=self.SCHEMA_VERSION)
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+        directory = os.path.dirname(self.reports_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.reports_file, "ab") as f:
+            offset = f.tell()
+            f.write(line)
+
+        conn = self._connect()
+        try:
+            with conn:
+                self._insert(conn, [self._index_row(record, offset, len(line))])
+        finally:
+            conn.close()
+        return record
+
+    def reindex(self):
+        """Reconstruye el índice leyendo el NDJSON completo"""
+        rows = []
+        if os.path.exists(self.reports_file):
+            with open(self.reports_file, "rb") as f:
+                offset = 0
+                for line in f:
+                    try:
+                        rows.append(self._index_row(json.loads(line), offset, len(line)))
+                    except (ValueError, KeyError):
+                        pass  # Línea truncada (corte de luz a mitad de escritura)
+                    offset += len(line)
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM reports")
+                self._insert(conn, rows)
+        finally:
+            conn.close()
+        return len(rows)
+
+    def query(self, fingerprint=None, since=None, until=None, limit=None, environment_id=None):
+        """Filas del índice (más recientes primero) como diccionarios.
+
+        'fingerprint' filtra por equipo; 'environment_id' además por entorno
+        exacto (mismos ajustes y fuente de energía).
+        """
+        if not os.path.exists(self.index_file) and os.path.exists(self.reports_file):
+            self.reindex()
+
+        clauses = []
+        params = []
+        if fingerprint:
+            clauses.append("fingerprint = ?")
+            params.append(fingerprint)
+        if environment_id:
+            clauses.append("environment_id = ?")
+            params.append(environment_id)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        sql = "SELECT * FROM reports"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(sql, params)
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor]
+        finally:
+            conn.close()
+
+    def load(self, row):
+        """Registro completo de una fila del índice (lee sólo su línea)"""
+        with open(self.reports_file, "rb") as f:
+            f.seek(row["byte_offset"])
+            return json.loads(f.read(row["byte_length"]))
+
+    def trend(self, metric, fingerprint=None, since=None, environment_id=None):
+        """Serie [(timestamp, valor)] en orden cronológico"""
+        if metric not in self.METRICS:
+            raise ValueError(f"Métrica desconocida: {metric}")
+        rows = self.query(fingerprint, since, environment_id=environment_id)
+        return [(row["timestamp"], row[metric]) for row in reversed(rows) if row[metric] is not None]
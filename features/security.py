@@ -1,43 +1,182 @@
-import wmi
 import hashlib
 import uuid
 import hmac
 import json
 import os
 import sys
+import threading
 from datetime import datetime
 from config.settings import SECRET, PASSWORD_HASH
 
-class HardwareIDGenerator:
-    """Generador de ID único basado en hardware"""
-    @staticmethod
-    def get_hardware_id():
-        """Obtiene un ID único basado en componentes del hardware"""
+class WmiHardwareInfo:
+    """Proveedor de datos de hardware con WMI (placa, CPU, disco y BIOS).
+
+    wmi se importa recién aquí: la consulta tarda segundos y sólo se
+    necesita cuando no hay un ID en caché.
+    """
+    def components(self):
+        """Cadenas que identifican el equipo, en el orden en que se combinan"""
+        import wmi
+        try:
+            # Fuera del hilo principal COM tiene que inicializarse en cada hilo
+            import pythoncom
+            pythoncom.CoInitialize()
+        except ImportError:
+            pythoncom = None
         try:
             c = wmi.WMI()
-            system_info = ""
+            parts = []
             
             for board in c.Win32_BaseBoard():
-                system_info += board.Manufacturer + board.Product + board.SerialNumber
+                parts.append(board.Manufacturer + board.Product + board.SerialNumber)
             
             for cpu in c.Win32_Processor():
-                system_info += cpu.ProcessorId
+                parts.append(cpu.ProcessorId)
             
             for disk in c.Win32_DiskDrive():
                 if disk.SerialNumber:
-                    system_info += disk.SerialNumber
+                    parts.append(disk.SerialNumber)
                     break
             
             for bios in c.Win32_BIOS():
-                system_info += bios.SerialNumber
+                parts.append(bios.SerialNumber)
             
-            if not system_info:
-                system_info = str(uuid.getnode())
-            
-            hardware_hash = hashlib.sha256(system_info.encode()).hexdigest()
-            return hardware_hash[:16].upper()
+            return parts
+        finally:
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+class HardwareIDGenerator:
+    """Generador de ID único basado en hardware.
+
+    El ID se calcula una sola vez y se guarda en CACHE_FILE junto con una
+    clave barata de invalidación (arranque del sistema + MAC de
+    uuid.getnode()): un cambio de hardware requiere reiniciar, así que
+    mientras la clave coincida no se vuelve a consultar WMI. La entrada va
+    firmada para que no se pueda copiar un ID ajeno en el archivo.
+    warm_up() lo calcula en segundo plano al abrir la ventana. El proveedor
+    es reemplazable (cualquier objeto con components()) para probar la
+    caché sin WMI.
+    """
+    
+    CACHE_FILE = "data/hardware_id.json"
+    
+    # Proveedor de datos de hardware (None = WmiHardwareInfo)
+    provider = None
+    
+    _lock = threading.Lock()
+    _cached = None
+    _thread = None
+    _callbacks = []
+    _warm_lock = threading.Lock()
+    
+    @staticmethod
+    def _fallback_id():
+        return hashlib.sha256(str(uuid.getnode()).encode()).hexdigest()[:16].upper()
+    
+    @staticmethod
+    def _hash_components(provider=None):
+        system_info = "".join((provider or HardwareIDGenerator.provider or WmiHardwareInfo()).components())
+        
+        if not system_info:
+            system_info = str(uuid.getnode())
+        
+        hardware_hash = hashlib.sha256(system_info.encode()).hexdigest()
+        return hardware_hash[:16].upper()
+    
+    @staticmethod
+    def compute_hardware_id(provider=None):
+        """Consulta el hardware (lento) y devuelve el ID, sin caché"""
+        try:
+            return HardwareIDGenerator._hash_components(provider)
         except Exception:
-            return hashlib.sha256(str(uuid.getnode()).encode()).hexdigest()[:16].upper()
+            return HardwareIDGenerator._fallback_id()
+    
+    @staticmethod
+    def invalidation_key():
+        """Arranque actual + MAC: cambia tras reiniciar o al cambiar de placa de red"""
+        try:
+            import psutil
+            boot = str(int(round(psutil.boot_time())))
+        except Exception:
+            boot = ""
+        return f"{boot}|{uuid.getnode():012x}"
+    
+    @staticmethod
+    def _signature(key, hardware_id):
+        return hmac.new(SECRET, f"{key}|{hardware_id}".encode(), hashlib.sha256).hexdigest()
+    
+    @staticmethod
+    def _load_cache(key):
+        try:
+            with open(HardwareIDGenerator.CACHE_FILE, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        hardware_id = data.get("hardware_id")
+        if not hardware_id or data.get("key") != key:
+            return None
+        if not hmac.compare_digest(str(data.get("sig", "")), HardwareIDGenerator._signature(key, hardware_id)):
+            return None
+        return hardware_id
+    
+    @staticmethod
+    def _save_cache(key, hardware_id):
+        try:
+            directory = os.path.dirname(HardwareIDGenerator.CACHE_FILE)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = HardwareIDGenerator.CACHE_FILE + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"key": key, "hardware_id": hardware_id,
+                           "sig": HardwareIDGenerator._signature(key, hardware_id)}, f)
+            os.replace(tmp_path, HardwareIDGenerator.CACHE_FILE)
+        except OSError:
+            pass
+    
+    @staticmethod
+    def get_hardware_id(use_cache=True):
+        """Obtiene un ID único basado en componentes del hardware (de la caché si es válida)"""
+        with HardwareIDGenerator._lock:
+            if use_cache and HardwareIDGenerator._cached:
+                return HardwareIDGenerator._cached
+            key = HardwareIDGenerator.invalidation_key()
+            hardware_id = HardwareIDGenerator._load_cache(key) if use_cache else None
+            if hardware_id is None:
+                try:
+                    hardware_id = HardwareIDGenerator._hash_components()
+                except Exception:
+                    # Un fallo de WMI no se guarda: el próximo pedido vuelve a intentarlo
+                    return HardwareIDGenerator._fallback_id()
+                HardwareIDGenerator._save_cache(key, hardware_id)
+            HardwareIDGenerator._cached = hardware_id
+            return hardware_id
+    
+    @staticmethod
+    def warm_up(callback=None):
+        """Calcula el ID en un hilo aparte; callback(hardware_id) al terminar.
+
+        Si ya hay un cálculo en curso el callback se suma a ese hilo en vez
+        de perderse. El callback corre en el hilo de trabajo.
+        """
+        def worker():
+            hardware_id = HardwareIDGenerator.get_hardware_id()
+            with HardwareIDGenerator._warm_lock:
+                callbacks = HardwareIDGenerator._callbacks[:]
+                HardwareIDGenerator._callbacks.clear()
+                HardwareIDGenerator._thread = None
+            for pending in callbacks:
+                pending(hardware_id)
+
+        with HardwareIDGenerator._warm_lock:
+            if callback:
+                HardwareIDGenerator._callbacks.append(callback)
+            thread = HardwareIDGenerator._thread
+            if thread is None:
+                thread = threading.Thread(target=worker, daemon=True)
+                HardwareIDGenerator._thread = thread
+                thread.start()
+        return thread
 
 class LicenseValidator:
     """Validador de licencias para el programa principal"""
@@ -0,0 +1,57 @@
+from utils.registry import REG_SZ, REG_DWORD
+from features.tweaks import RegistryTweak, BcdTweak, PROFILE_GENERAL, PROFILE_GAMER
+
+HKLM_SYSTEM_PROFILE = r"HKEY_LOCAL_MACHINE\SOFTWARE\Microsoft\Windows NT\CurrentVersion\Multimedia\SystemProfile"
+HKCU_DESKTOP = r"HKEY_CURRENT_USER\Control Panel\Desktop"
+
+# Catálogo declarativo: clave, valor, tipo, dato deseado y perfil.
+# GENERAL se aplica en toda optimización; GAMER se suma en el perfil gamer.
+TWEAK_CATALOG = [
+    RegistryTweak(r"HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Control\Power\PowerThrottling",
+                  "PowerThrottlingOff", 1, REG_DWORD, "[>>] Desactivando Power Throttling"),
+    RegistryTweak(HKLM_SYSTEM_PROFILE, "SystemResponsiveness", 10, REG_DWORD,
+                  "[>>] Ajustando SystemResponsiveness"),
+    RegistryTweak(HKLM_SYSTEM_PROFILE, "NetworkThrottlingIndex", 0xFFFFFFFF, REG_DWORD,
+                  "[>>] Optimizando NetworkThrottlingIndex"),
+    RegistryTweak(r"HKEY_CURRENT_USER\System\GameConfigStore", "GameDVR_Enabled", 0, REG_DWORD,
+                  "[>>] Desactivando GameDVR"),
+    RegistryTweak(r"HKEY_CURRENT_USER\SOFTWARE\Microsoft\Windows\CurrentVersion\GameDVR",
+                  "AppCaptureEnabled", 0, REG_DWORD, "[>>] Desactivando AppCapture"),
+    RegistryTweak(HKCU_DESKTOP, "AutoEndTasks", "1", REG_SZ, "[>>] Configurando AutoEndTasks"),
+    RegistryTweak(HKCU_DESKTOP, "HungAppTimeout", "1000", REG_SZ, "[>>] Ajustando HungAppTimeout"),
+    RegistryTweak(HKCU_DESKTOP, "WaitToKillAppTimeout", "3000", REG_SZ, "[>>] Configurando WaitToKillAppTimeout"),
+    RegistryTweak(HKCU_DESKTOP, "LowLevelHooksTimeout", "1000", REG_SZ, "[>>] Ajustando LowLevelHooksTimeout"),
+    RegistryTweak(HKCU_DESKTOP, "MenuShowDelay", "0", REG_SZ, "[>>] Eliminando delay en menús"),
+    RegistryTweak(r"HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Control", "WaitToKillServiceTimeout",
+                  "2000", REG_SZ, "[>>] Configurando WaitToKillServiceTimeout"),
+    RegistryTweak(r"HKEY_LOCAL_MACHINE\SOFTWARE\Microsoft\Windows NT\CurrentVersion\Schedule\Maintenance",
+                  "MaintenanceDisabled", 1, REG_DWORD, "[>>] Desactivando mantenimiento automático"),
+    RegistryTweak(r"HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Control\Power", "HibernateEnabled", 0,
+                  REG_DWORD, "[>>] Desactivando hibernación"),
+    BcdTweak(["/set", "disabledynamictick", "yes"], "[>>] Configurando disabledynamictick"),
+    BcdTweak(["/deletevalue", "useplatformclock"], "[>>] Eliminando useplatformclock"),
+    BcdTweak(["/set", "useplatformtick", "yes"], "[>>] Configurando useplatformtick"),
+
+    RegistryTweak(HKLM_SYSTEM_PROFILE, "NoLazyMode", 1, REG_DWORD, "[>>] Activando NoLazyMode",
+                  profile=PROFILE_GAMER, config_key="no_lazy_mode"),
+    RegistryTweak(r"HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Control\PriorityControl",
+                  "Win32PrioritySeparation", 0x2A, REG_DWORD, "[>>] Activando WinPriority (0x2A)",
+                  profile=PROFILE_GAMER, config_key="win_priority_control"),
+]
+
+
+def tweaks_for(profile, include_general=True):
+    """Tweaks de un perfil; GAMER incluye los de GENERAL salvo que se pida lo contrario"""
+    profile = profile.upper()
+    profiles = {profile}
+    if profile == PROFILE_GAMER and include_general:
+        profiles.add(PROFILE_GENERAL)
+    return [tweak for tweak in TWEAK_CATALOG if tweak.profile in profiles]
+
+
+def find_tweak(name):
+    """Tweak del catálogo por nombre (ruta\\valor o 'bcdedit ...')"""
+    for tweak in TWEAK_CATALOG:
+        if tweak.name.lower() == name.lower():
+            return tweak
+    return None
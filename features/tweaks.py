@@ -0,0 +1,258 @@
+import time
+
+from utils.system import CommandExecutor, run_commands, run_command_output
+from utils.registry import REG_SZ, REG_EXPAND_SZ, REG_DWORD, REG_QWORD, WinRegBackend
+
+PROFILE_GENERAL = "GENERAL"
+PROFILE_GAMER = "GAMER"
+
+
+class RegistryTweak:
+    """Valor de registro que se escribe dentro del proceso a través del backend"""
+
+    kind = "registry"
+
+    def __init__(self, key_path, value_name, value, value_type=REG_DWORD, description="",
+                 profile=PROFILE_GENERAL, config_key=None):
+        self.key_path = key_path
+        self.value_name = value_name
+        self.value = value
+        self.value_type = value_type
+        self.description = description or f"{value_name} = {value}"
+        self.profile = profile
+        # Clave de configuración que registra que el tweak está activo (opcional)
+        self.config_key = config_key
+
+    @property
+    def name(self):
+        return f"{self.key_path}\\{self.value_name}"
+
+    @property
+    def desired(self):
+        return self.value
+
+    def read(self, backend, bcd_state):
+        """Valor actual (None si no existe)"""
+        return backend.get_value(self.key_path, self.value_name)
+
+    def matches(self, current):
+        """El valor actual ya es el deseado (mismo tipo y mismo dato)"""
+        if current is None:
+            return False
+        value, value_type = current
+        if self.value_type in (REG_DWORD, REG_QWORD):
+            if value_type != self.value_type:
+                return False
+            try:
+                return int(value) == int(self.value)
+            except (TypeError, ValueError):
+                return False
+        if self.value_type in (REG_SZ, REG_EXPAND_SZ):
+            return value_type in (REG_SZ, REG_EXPAND_SZ) and str(value) == str(self.value)
+        return value_type == self.value_type and value == self.value
+
+    @staticmethod
+    def describe_value(current):
+        return None if current is None else current[0]
+
+    def apply(self, backend, command_runner):
+        backend.set_value(self.key_path, self.value_name, self.value, self.value_type)
+
+
+class BcdTweak:
+    """Cambio de la configuración de arranque: el único que necesita bcdedit"""
+
+    kind = "bcd"
+
+    def __init__(self, args, description="", profile=PROFILE_GENERAL, config_key=None):
+        self.args = list(args)
+        self.description = description or "bcdedit " + " ".join(self.args)
+        self.profile = profile
+        self.config_key = config_key
+
+    @property
+    def name(self):
+        return "bcdedit " + " ".join(self.args)
+
+    @property
+    def desired(self):
+        # /deletevalue: el elemento no debe existir
+        return self.args[2] if len(self.args) > 2 else None
+
+    @property
+    def element(self):
+        return self.args[1].lower()
+
+    @property
+    def command(self):
+        return ["bcdedit"] + self.args
+
+    def read(self, backend, bcd_state):
+        """Valor actual del elemento en la entrada {current}; None si no se pudo leer bcdedit"""
+        if bcd_state is None:
+            return None
+        return (bcd_state.get(self.element),)
+
+    def matches(self, current):
+        if current is None:
+            return False
+        value = current[0]
+        if self.args[0].lower() == "/deletevalue":
+            return value is None
+        return value is not None and value.lower() == self.args[2].lower()
+
+    @staticmethod
+    def describe_value(current):
+        return None if current is None else current[0]
+
+    def apply(self, backend, command_runner, logger_func=None):
+        self.check(command_runner([self.command], logger_func=logger_func)[0])
+
+    def check(self, result):
+        """Lanza OSError con el motivo (stderr, timeout...) si bcdedit falló"""
+        error = CommandExecutor.describe_error(result)
+        if error is not None:
+            raise OSError(f"{self.name}: {error}")
+
+
+def read_bcd_state():
+    """Elementos de la entrada de arranque actual ({nombre: valor}) con un solo bcdedit"""
+    output = run_command_output(["bcdedit", "/enum", "{current}"])
+    if output is None:
+        return None
+    state = {}
+    for line in output.splitlines():
+        parts = line.split(None, 1)
+        if len(parts) == 2 and not line.startswith("-"):
+            state[parts[0].lower()] = parts[1].strip()
+    return state
+
+
+class TweakEngine:
+    """Aplica tweaks con lectura previa: sólo escribe lo que difiere.
+
+    Los valores de registro se leen y escriben con una sesión del backend
+    (winreg en Windows, MemoryRegistryBackend en pruebas) sin lanzar
+    procesos y con un solo handle por clave. La
+    configuración de arranque se lee con un único 'bcdedit /enum' y sólo
+    los cambios de BCD pendientes ejecutan bcdedit, sin shell. En una
+    máquina ya optimizada no se escribe nada.
+
+    command_runner(comandos, logger_func=...) ejecuta un lote de comandos y
+    devuelve un resultado de CommandExecutor por comando (run_commands por
+    defecto).
+    """
+
+    def __init__(self, backend=None, command_runner=None, bcd_reader=None, journal=None):
+        self.backend = backend or WinRegBackend()
+        self.command_runner = command_runner or run_commands
+        self.bcd_reader = bcd_reader or read_bcd_state
+        # TweakJournal opcional: guarda el valor previo antes de cada escritura
+        self.journal = journal
+
+    def _read_state(self, tweaks, session):
+        """[(tweak, entrada del diff)] con el valor actual de cada tweak"""
+        bcd_state = self.bcd_reader() if any(t.kind == "bcd" for t in tweaks) else None
+        entries = []
+        for tweak in tweaks:
+            try:
+                current = tweak.read(session, bcd_state)
+                error = None
+            except Exception as e:
+                current, error = None, str(e)
+            entry = {
+                "_current": current,
+                "name": tweak.name,
+                "kind": tweak.kind,
+                "profile": tweak.profile,
+                "description": tweak.description,
+                "current": tweak.describe_value(current),
+                "desired": tweak.desired,
+                "pending": not tweak.matches(current)
+            }
+            if error:
+                entry["read_error"] = error
+            entries.append((tweak, entry))
+        return entries
+
+    def diff(self, tweaks):
+        """Estado de cada tweak sin modificar nada: [{name, current, desired, pending, ...}]"""
+        with self.backend.session() as session:
+            return [self._public(entry) for _, entry in self._read_state(tweaks, session)]
+
+    @staticmethod
+    def _public(entry):
+        return {key: value for key, value in entry.items() if not key.startswith("_")}
+
+    def apply(self, tweaks, logger_func, session_id=None, label="optimización"):
+        """Devuelve {"applied", "unchanged", "failed", "diff", "session_id", "elapsed_s"}
+
+        Lectura y escritura comparten una RegistrySession: cada clave se abre
+        una vez y los valores de registro se escriben agrupados por clave al
+        final. Los cambios de BCD son elementos independientes y se lanzan
+        juntos en un solo lote de CommandExecutor.
+        """
+        start = time.perf_counter()
+        with self.backend.session() as session:
+            entries = self._read_state(tweaks, session)
+            pending = [(tweak, entry) for tweak, entry in entries if entry["pending"]]
+            if self.journal is not None and pending and session_id is None:
+                session_id = self.journal.begin_session(label)
+            unchanged = len(entries) - len(pending)
+            if unchanged:
+                logger_func(f"[INFO] {unchanged} de {len(entries)} ajustes ya estaban aplicados")
+
+            journal_indices = [None] * len(pending)
+            if self.journal is not None and pending:
+                journal_indices = self.journal.record(session_id, [(tweak, entry["_current"]) for tweak, entry in pending])
+
+            queued = []
+            commands = []
+            for i, (tweak, entry) in enumerate(pending, 1):
+                logger_func(f"[RUN] Ejecutando: {tweak.description}")
+                progress = int(i / len(pending) * 100)
+                logger_func(f"[PROG] [{'█' * (progress // 5)}{'░' * (20 - progress // 5)}] {progress}%")
+                if tweak.kind == "registry":
+                    session.queue_value(tweak.key_path, tweak.value_name, tweak.value, tweak.value_type)
+                    queued.append((tweak, entry))
+                else:
+                    commands.append((tweak, entry))
+
+            results = self.command_runner([tweak.command for tweak, _ in commands],
+                                          logger_func=logger_func) if commands else []
+            for (tweak, entry), result in zip(commands, results):
+                try:
+                    tweak.check(result)
+                    entry["action"] = "changed"
+                    logger_func(f"[OK] {tweak.element}: {entry['current']} -> {entry['desired']}")
+                except OSError as e:
+                    entry["action"] = "failed"
+                    entry["error"] = str(e)
+                    logger_func(f"[WARN] Advertencia en comando: {e}")
+
+            errors = session.flush()
+            for tweak, entry in queued:
+                error = errors.get((tweak.key_path, tweak.value_name))
+                if error is None:
+                    entry["action"] = "changed"
+                    logger_func(f"[OK] {tweak.value_name}: {entry['current']} -> {entry['desired']}")
+                else:
+                    entry["action"] = "failed"
+                    entry["error"] = str(error)
+                    logger_func(f"[WARN] Advertencia en {tweak.value_name}: {error}")
+
+        if self.journal is not None and pending:
+            self.journal.mark(session_id, {index: "applied" if entry["action"] == "changed" else "failed"
+                                           for index, (_, entry) in zip(journal_indices, pending)})
+
+        applied = sum(1 for _, entry in pending if entry["action"] == "changed")
+        for _, entry in entries:
+            entry.setdefault("action", "unchanged")
+        return {
+            "applied": applied,
+            "unchanged": unchanged,
+            "failed": len(pending) - applied,
+            "diff": [self._public(entry) for _, entry in entries],
+            "session_id": session_id,
+            "elapsed_s": round(time.perf_counter() - start, 3)
+        }
@@ -0,0 +1,191 @@
+import math
+
+from features.benchmarks import BenchmarkManager, QuickBenchmark
+from features.optimization import SystemOptimizer
+
+# Valores críticos de t de Student, dos colas, 95% (grados de libertad -> t).
+# Para df intermedios se usa el df tabulado inmediatamente menor (más conservador).
+T_TABLE_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+    9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
+    16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086, 21: 2.080, 22: 2.074,
+    23: 2.069, 24: 2.064, 25: 2.060, 26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045,
+    30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980
+}
+
+
+def t_critical(df):
+    """t crítico al 95% para df grados de libertad (1.96 a partir de 120)"""
+    if df < 1:
+        return T_TABLE_95[1]
+    if df > 120:
+        return 1.960
+    return T_TABLE_95[max(k for k in T_TABLE_95 if k <= df)]
+
+
+def compare_samples(before, after, higher_is_better=True):
+    """Diferencia de medias (Welch) con IC del 95%, también en % sobre el valor previo.
+
+    "improvement_pct" es positivo cuando el cambio es una mejora, sea cual
+    sea el sentido de la métrica. El veredicto sólo es "improved" o
+    "regressed" si el intervalo completo queda de un lado del cero.
+    """
+    n1, n2 = len(before), len(after)
+    if n1 < 2 or n2 < 2:
+        return None
+    mean1 = sum(before) / n1
+    mean2 = sum(after) / n2
+    var1 = sum((x - mean1) ** 2 for x in before) / (n1 - 1)
+    var2 = sum((x - mean2) ** 2 for x in after) / (n2 - 1)
+    se2 = var1 / n1 + var2 / n2
+    if se2 > 0:
+        df = se2 ** 2 / ((var1 / n1) ** 2 / (n1 - 1) + (var2 / n2) ** 2 / (n2 - 1))
+    else:
+        df = n1 + n2 - 2
+    margin = t_critical(int(df)) * math.sqrt(se2)
+
+    diff = mean2 - mean1
+    sign = 1 if higher_is_better else -1
+    low, high = sorted((sign * (diff - margin), sign * (diff + margin)))
+    scale = 100 / abs(mean1) if mean1 else 0
+
+    # d de Cohen con la desviación combinada, en el sentido de la mejora
+    pooled = math.sqrt(((n1 - 1) * var1 + (n2 - 1) * var2) / (n1 + n2 - 2))
+    effect_size = sign * diff / pooled if pooled else 0.0
+
+    if low > 0:
+        verdict = "improved"
+    elif high < 0:
+        verdict = "regressed"
+    else:
+        verdict = "inconclusive"
+
+    return {
+        "before": round(mean1, 2),
+        "after": round(mean2, 2),
+        "difference": round(diff, 2),
+        "ci95": [round(diff - margin, 2), round(diff + margin, 2)],
+        "improvement_pct": round(sign * diff * scale, 2),
+        "improvement_ci95_pct": [round(low * scale, 2), round(high * scale, 2)],
+        "effect_size": round(effect_size, 3),
+        "df": round(df, 1),
+        "samples": [n1, n2],
+        "verdict": verdict
+    }
+
+
+class ImpactVerifier:
+    """Optimización con verificación: mide antes y después de aplicar un perfil.
+
+    Usa las sondas cortas de QuickBenchmark (jitter del planificador,
+    single-core corto, I/O aleatorio) a través de BenchmarkManager, así cada
+    ejecución pasa por el chequeo de reposo y queda marcada si hubo carga de
+    fondo. Una sonda ruidosa se repite; si sigue ruidosa se excluye de la
+    comparación en lugar de contaminarla. El resultado se guarda por equipo
+    como "optimization_impact" en el historial de benchmarks.
+    """
+
+    RESULT_NAME = "optimization_impact"
+    MAX_ATTEMPTS = 3
+
+    PROBES = [
+        ("scheduler_jitter", "Jitter del planificador", QuickBenchmark.run_scheduler_jitter),
+        ("cpu_single_short", "CPU Single-Core (corto)", QuickBenchmark.run_single_core_short),
+        ("disk_random_io", "Disco I/O aleatorio", QuickBenchmark.run_disk_random_io)
+    ]
+
+    @staticmethod
+    def measure_probe(probe, name, logger_func, phase):
+        """Resultado limpio de una sonda (hasta MAX_ATTEMPTS intentos) o None"""
+        for attempt in range(1, ImpactVerifier.MAX_ATTEMPTS + 1):
+            try:
+                result = BenchmarkManager.run_benchmark(probe, logger_func)
+            except Exception as e:
+                logger_func(f"[ERR] Error en {name} ({phase}): {e}")
+                return None
+            if result and not result.get("noisy"):
+                return result
+            logger_func(f"[WARN] {name} ({phase}) con ruido, intento {attempt}/{ImpactVerifier.MAX_ATTEMPTS}")
+        return None
+
+    @staticmethod
+    def measure(logger_func, phase):
+        """{sonda: resultado limpio o None si todas las ejecuciones fueron ruidosas}"""
+        return {metric: ImpactVerifier.measure_probe(probe, name, logger_func, phase)
+                for metric, name, probe in ImpactVerifier.PROBES}
+
+    @staticmethod
+    def compare(before, after):
+        """Comparación por sonda; las que no tienen medición limpia en ambas fases quedan excluidas"""
+        comparison = {}
+        excluded = []
+        for metric, _, _ in ImpactVerifier.PROBES:
+            first, second = before.get(metric), after.get(metric)
+            if not first or not second:
+                excluded.append(metric)
+                continue
+            comparison[metric] = compare_samples(first["measurements"], second["measurements"],
+                                                 first.get("higher_is_better", True))
+            comparison[metric]["unit"] = first.get("unit", "")
+        return comparison, excluded
+
+    @staticmethod
+    def optimize_with_verification(profile, logger_func):
+        """Mide, aplica el perfil, vuelve a medir y guarda la comparación.
+
+        Devuelve el resumen de SystemOptimizer.apply_profile con la clave
+        "verification" agregada.
+        """
+        logger_func("[>>] Midiendo rendimiento ANTES de optimizar...")
+        before = ImpactVerifier.measure(logger_func, "antes")
+
+        result = SystemOptimizer.apply_profile(profile, logger_func)
+        if result["applied"] == 0:
+            logger_func("[INFO] No se modificó ningún valor: no hay impacto que medir")
+            result["verification"] = {"verdict": "no_changes", "comparison": {}, "excluded": []}
+            return result
+
+        logger_func("[>>] Midiendo rendimiento DESPUÉS de optimizar...")
+        after = ImpactVerifier.measure(logger_func, "después")
+        comparison, excluded = ImpactVerifier.compare(before, after)
+
+        for metric, _, _ in ImpactVerifier.PROBES:
+            if metric in excluded:
+                logger_func(f"[WARN] {metric}: sin mediciones limpias antes y después, se excluye")
+                continue
+            c = comparison[metric]
+            low, high = c["improvement_ci95_pct"]
+            logger_func(f"[INFO] {metric}: {c['before']:,.2f} -> {c['after']:,.2f} {c['unit']} "
+                        f"({c['improvement_pct']:+.1f}%, IC95 {low:+.1f}% a {high:+.1f}%) {c['verdict']}")
+
+        verdicts = [c["verdict"] for c in comparison.values()]
+        if "regressed" in verdicts:
+            verdict = "regressed"
+        elif "improved" in verdicts:
+            verdict = "improved"
+        else:
+            verdict = "inconclusive"
+
+        verification = {
+            "profile": result["profile"],
+            "session_id": result["session_id"],
+            "applied": result["applied"],
+            "verdict": verdict,
+            "comparison": comparison,
+            "excluded": excluded,
+            "before": before,
+            "after": after
+        }
+        try:
+            BenchmarkManager.save_result(ImpactVerifier.RESULT_NAME, verification)
+        except Exception as e:
+            logger_func(f"[WARN] No se pudo guardar la comparación: {e}")
+
+        if verdict == "regressed":
+            logger_func("[WARN] Alguna métrica empeoró de forma significativa: "
+                        "se puede deshacer con la sesión " + str(result["session_id"]))
+        else:
+            logger_func(f"[OK] Verificación completada: {verdict}")
+
+        result["verification"] = {key: verification[key] for key in ("verdict", "comparison", "excluded")}
+        return result
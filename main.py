@@ -3,26 +3,27 @@ import os
 import base64
 import time
 import threading
-from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QTextEdit, QGraphicsBlurEffect, QMessageBox,
-    QInputDialog, QFrame, QDialog, QLineEdit
-)
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject
-from PyQt6.QtGui import QPixmap, QPalette, QBrush, QFont, QColor
+from utils.startup import StartupProfiler
 
-# Imports de nuestros módulos
-from config.settings import (
-    COLOR_BG, COLOR_ACCENT, COLOR_TEXT, COLOR_WARNING, COLOR_HOVER,
-    MODERN_FONT, LOGO_FILE, RESOURCES_FOLDER, PASSWORD_HASH,
-    load_config, save_config
-)
-from utils.system import is_admin, run_command_in_shell
-from utils.files import extract_7z_resources, run_anydesk
-from utils.registry import set_registry_value
-from features.security import HardwareIDGenerator, LicenseValidator
-from features.optimization import SystemOptimizer
-from features.maintenance import SystemMaintenance
+with StartupProfiler.phase("import PyQt6"):
+    from PyQt6.QtWidgets import (
+        QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+        QPushButton, QLabel, QTextEdit, QGraphicsBlurEffect, QMessageBox,
+        QInputDialog, QFrame, QDialog, QLineEdit
+    )
+    from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject
+    from PyQt6.QtGui import QPixmap, QPalette, QBrush, QFont, QColor
+
+# Imports de nuestros módulos. Los pesados (wmi en security, winreg y el
+# mantenimiento, la optimización, matplotlib en el diálogo de benchmarks)
+# se importan en el primer uso para no demorar la apertura de la ventana.
+with StartupProfiler.phase("import módulos propios"):
+    from config.settings import (
+        COLOR_BG, COLOR_ACCENT, COLOR_TEXT, COLOR_WARNING, COLOR_HOVER,
+        MODERN_FONT, LOGO_FILE, RESOURCES_FOLDER, PASSWORD_HASH
+    )
+    from utils.system import is_admin
+    from utils.files import extract_7z_resources, run_anydesk
 
 class ModernPasswordDialog(QDialog):
     def __init__(self, password_hash):
@@ -54,8 +55,9 @@ class ModernPasswordDialog(QDialog):
         self.accept()
 
 class LogSignals(QObject):
-    """Señales para actualizar logs desde threads"""
+    """Señales para actualizar la UI desde threads"""
     log_signal = pyqtSignal(str)
+    hardware_id_signal = pyqtSignal(str)
 
 
 class WindowsOptimizerApp(QMainWindow):
@@ -63,23 +65,40 @@ class WindowsOptimizerApp(QMainWindow):
         super().__init__()
         
         # Verificar permisos de administrador
-        if not is_admin():
+        with StartupProfiler.phase("verificación de administrador"):
+            admin = is_admin()
+        if not admin:
             QMessageBox.critical(None, "Error", "ERROR: Se necesitan permisos de administrador.")
             sys.exit(1)
         
         # Ejecutar AnyDesk
-        run_anydesk()
+        with StartupProfiler.phase("AnyDesk"):
+            run_anydesk()
         
-        # Verificar contraseña
-        if not self.check_password():
+        # Verificar contraseña (incluye el tiempo que el usuario tarda en responder)
+        with StartupProfiler.phase("diálogo de contraseña"):
+            password_ok = self.check_password()
+        if not password_ok:
             sys.exit(1)
         
         # Señales para logs
         self.log_signals = LogSignals()
         self.log_signals.log_signal.connect(self.add_log_safe)
+        self.log_signals.hardware_id_signal.connect(self.show_request_code)
+        self.pending_request_user = None
+        
+        # Monitor de carga en segundo plano: arranca con la ventana ya visible
+        # (ver start_monitor), fuera del camino crítico del arranque
+        self.monitor = None
+        
+        with StartupProfiler.phase("construcción de la UI"):
+            self.init_ui()
+        with StartupProfiler.phase("extracción de recursos"):
+            extract_7z_resources()
         
-        self.init_ui()
-        extract_7z_resources()
+        # El ID de hardware (consultas WMI lentas) se calcula fuera del hilo de la UI
+        from features.security import HardwareIDGenerator
+        HardwareIDGenerator.warm_up()
     
     def check_password(self):
         """Verifica la contraseña de acceso"""
@@ -142,6 +161,11 @@ class WindowsOptimizerApp(QMainWindow):
         # Animación de entrada
         self.setWindowOpacity(0)
         self.fade_in_animation()
+        
+        # Estado de carga, leído del historial del monitor
+        self.monitor_timer = QTimer()
+        self.monitor_timer.timeout.connect(self.update_monitor_label)
+        self.monitor_timer.start(2000)
     
     def set_background_image(self, widget):
         """Establece la imagen de fondo"""
@@ -238,6 +262,7 @@ class WindowsOptimizerApp(QMainWindow):
         license_btn.setObjectName("cornerButton")
         license_btn.clicked.connect(self.generate_request_code)
         license_btn.setParent(self.glass_frame)
+        self.license_btn = license_btn
         # Posicionar en la esquina inferior derecha
         license_btn.setGeometry(1050, 615, 120, 30)
         license_btn.show()
@@ -256,6 +281,11 @@ class WindowsOptimizerApp(QMainWindow):
         footer_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         footer_layout.setSpacing(2)
         
+        self.monitor_label = QLabel("Recolectando datos del sistema...")
+        self.monitor_label.setObjectName("monitor")
+        self.monitor_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        footer_layout.addWidget(self.monitor_label)
+        
         copyright = QLabel("© 2025 Windows-Optimizer-V1 - Todos los derechos reservados")
         copyright.setObjectName("copyright")
         copyright.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -342,6 +372,12 @@ class WindowsOptimizerApp(QMainWindow):
                 font-size: 11px;
             }}
             
+            #monitor {{
+                color: {COLOR_TEXT};
+                font-size: 10px;
+                font-family: Consolas, monospace;
+            }}
+            
             #copyright {{
                 color: #9900CC;
                 font-size: 10px;
@@ -387,6 +423,28 @@ class WindowsOptimizerApp(QMainWindow):
         else:
             self.setWindowOpacity(self.opacity)
     
+    def start_monitor(self):
+        """Arranca el monitor de carga (psutil y NumPy se importan recién aquí)"""
+        if self.monitor is None:
+            with StartupProfiler.phase("monitor de carga"):
+                from features.monitor import SystemMonitor
+                self.monitor = SystemMonitor.shared()
+        return self.monitor
+    
+    def update_monitor_label(self):
+        """Muestra la carga promedio de los últimos 10 segundos"""
+        if self.monitor is None:
+            return
+        summary = self.monitor.summary(seconds=10)
+        if not summary["samples"]:
+            return
+        disk = summary["disk_read_mbs"]["avg"] + summary["disk_write_mbs"]["avg"]
+        net = summary["net_sent_mbs"]["avg"] + summary["net_recv_mbs"]["avg"]
+        self.monitor_label.setText(
+            f"CPU {summary['cpu']['avg']:.0f}% (core máx {summary['cpu_max_core']:.0f}%) | "
+            f"RAM {summary['memory']['avg']:.0f}% | Disco {disk:.1f} MB/s | Red {net:.2f} MB/s"
+        )
+    
     def add_log(self, message):
         """Añade un mensaje al log desde thread principal"""
         self.log_signals.log_signal.emit(message)
@@ -409,6 +467,7 @@ class WindowsOptimizerApp(QMainWindow):
         
         gamer_btn = msg_box.addButton("Optimización GAMER", QMessageBox.ButtonRole.AcceptRole)
         general_btn = msg_box.addButton("Optimización GENERAL", QMessageBox.ButtonRole.AcceptRole)
+        rollback_btn = msg_box.addButton("Deshacer última", QMessageBox.ButtonRole.ActionRole)
         cancel_btn = msg_box.addButton("Cancelar", QMessageBox.ButtonRole.RejectRole)
         
         msg_box.exec()
@@ -418,41 +477,34 @@ class WindowsOptimizerApp(QMainWindow):
             threading.Thread(target=self._run_optimization_thread, args=(True,), daemon=True).start()
         elif clicked == general_btn:
             threading.Thread(target=self._run_optimization_thread, args=(False,), daemon=True).start()
+        elif clicked == rollback_btn:
+            threading.Thread(target=self._run_rollback_thread, daemon=True).start()
+    
+    def _run_rollback_thread(self):
+        """Thread que deshace la última optimización con el diario de cambios"""
+        from features.optimization import SystemOptimizer
+        self.optimize_btn.setEnabled(False)
+        SystemOptimizer.rollback(self.add_log)
+        self.start_monitor().mark("optimization_end")
+        self.optimize_btn.setEnabled(True)
     
     def _run_optimization_thread(self, gamer_mode=False):
         """Thread de optimización"""
+        from features.optimization import SystemOptimizer
         self.optimize_btn.setEnabled(False)
+        monitor = self.start_monitor()
+        before = monitor.summary(seconds=300)
+        monitor.mark("optimization_start")
         
+        session_id = None
         if gamer_mode:
             self.add_log("[GAMER] Iniciando OPTIMIZACIÓN GAMER...")
-            self.add_log("[>>] Activando NoLazyMode...")
-            
-            # Activar NoLazyMode
-            cmd = 'reg add "HKLM\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\Multimedia\\SystemProfile" /v "NoLazyMode" /t REG_DWORD /d "1" /f'
-            if run_command_in_shell(cmd):
-                self.add_log("[OK] NoLazyMode ACTIVADO")
-                config = load_config()
-                config['no_lazy_mode'] = True
-                save_config(config)
-            else:
-                self.add_log("[ERR] Error al activar NoLazyMode")
-            
-            self.add_log("[>>] Activando WinPriority...")
-            # Activar WinPriority
-            if set_registry_value(
-                r"HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Control\PriorityControl",
-                "Win32PrioritySeparation", 0x2A
-            ):
-                self.add_log("[OK] Win32PrioritySeparation ACTIVADO (0x2A)")
-                config = load_config()
-                config['win_priority_control'] = True
-                save_config(config)
-            else:
-                self.add_log("[ERR] Error al activar Win32PrioritySeparation")
+            session_id = SystemOptimizer.apply_gamer_tweaks(self.add_log)["session_id"]
         else:
             self.add_log("[GENERAL] Iniciando OPTIMIZACIÓN GENERAL...")
         
-        SystemOptimizer.run_optimization(self.add_log)
+        SystemOptimizer.run_optimization(self.add_log, session_id=session_id)
+        monitor.mark("optimization_end")
         self.add_log("[...] Limpiando logs en 3 segundos...")
         time.sleep(3)
         self.console.clear()
@@ -462,6 +514,10 @@ class WindowsOptimizerApp(QMainWindow):
         else:
             self.add_log("[OK] Optimización GENERAL completada - Sistema listo")
         
+        if before["samples"]:
+            self.add_log(f"[INFO] Carga previa ({before['duration_s']:.0f}s): CPU prom. {before['cpu']['avg']:.1f}%, "
+                         f"RAM prom. {before['memory']['avg']:.1f}% - el informe de mantenimiento compara antes/después")
+        
         self.optimize_btn.setEnabled(True)
     
     def run_benchmark(self):
@@ -483,8 +539,13 @@ class WindowsOptimizerApp(QMainWindow):
     
     def _run_maintenance_thread(self):
         """Thread de mantenimiento"""
+        from features.maintenance import SystemMaintenance
+        from features.diskusage import DiskUsageAnalyzer
         self.maintenance_btn.setEnabled(False)
-        SystemMaintenance.run_maintenance(self.add_log)
+        # El análisis de espacio recorre todo el volumen: se reutiliza el del
+        # último día y sólo se vuelve a recorrer si es más viejo
+        SystemMaintenance.run_maintenance(self.add_log, disk_usage_root=DiskUsageAnalyzer.default_root(),
+                                          disk_usage_max_age=SystemMaintenance.DISK_USAGE_MAX_AGE_HOURS)
         self.maintenance_btn.setEnabled(True)
     
     def generate_request_code(self):
@@ -492,13 +553,26 @@ class WindowsOptimizerApp(QMainWindow):
         username, ok = QInputDialog.getText(self, 'Nombre de Usuario', 
                                            'Ingrese el nombre de usuario:')
         if ok and username:
-            hardware_id = HardwareIDGenerator.get_hardware_id()
-            data = username + "|" + hardware_id
-            request_code = base64.b64encode(data.encode()).decode()
-            
-            QMessageBox.information(self, 'Código de Solicitud',
-                                   f'Código generado:\n\n{request_code}\n\n'
-                                   'Copia este código para solicitar tu licencia.')
+            # El ID llega por señal: el hilo de la UI nunca espera a WMI
+            self.pending_request_user = username
+            self.license_btn.setEnabled(False)
+            self.license_btn.setText("Calculando…")
+            from features.security import HardwareIDGenerator
+            HardwareIDGenerator.warm_up(self.log_signals.hardware_id_signal.emit)
+    
+    def show_request_code(self, hardware_id):
+        """Muestra el código de solicitud cuando el ID de hardware está listo"""
+        self.license_btn.setEnabled(True)
+        self.license_btn.setText("Ver Licencia")
+        username, self.pending_request_user = self.pending_request_user, None
+        if not username:
+            return
+        data = username + "|" + hardware_id
+        request_code = base64.b64encode(data.encode()).decode()
+        
+        QMessageBox.information(self, 'Código de Solicitud',
+                               f'Código generado:\n\n{request_code}\n\n'
+                               'Copia este código para solicitar tu licencia.')
     
     def closeEvent(self, event):
         """Maneja el evento de cierre"""
@@ -507,6 +581,9 @@ class WindowsOptimizerApp(QMainWindow):
                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
+            self.monitor_timer.stop()
+            if self.monitor is not None:
+                self.monitor.stop()
             event.accept()
         else:
             event.ignore()
@@ -520,9 +597,16 @@ def main():
         except Exception:
             pass
     
-    app = QApplication(sys.argv)
-    window = WindowsOptimizerApp()
-    window.show()
+    with StartupProfiler.phase("QApplication"):
+        app = QApplication(sys.argv)
+    with StartupProfiler.phase("ventana principal"):
+        window = WindowsOptimizerApp()
+    with StartupProfiler.phase("show"):
+        window.show()
+    # En la primera vuelta del bucle de eventos, con la ventana ya pintada:
+    # arranca el monitor y después se vuelca el perfil
+    QTimer.singleShot(0, window.start_monitor)
+    QTimer.singleShot(0, StartupProfiler.dump)
     sys.exit(app.exec())
 
 
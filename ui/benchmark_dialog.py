@@ -10,21 +10,25 @@ from matplotlib.figure import Figure
 import threading
 
 from features.benchmarks import (CPUBenchmark, RAMBenchmark, DiskBenchmark, 
-                                 NetworkBenchmark, BenchmarkManager)
+                                 NetworkBenchmark, GeneralBenchmark, BenchmarkManager)
 
 class BenchmarkThread(QThread):
     """Thread para ejecutar benchmarks sin bloquear UI"""
     log_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(str, dict)  # benchmark_name, result
     
-    def __init__(self, benchmark_func, benchmark_name):
+    def __init__(self, benchmark_func, benchmark_name, preflight=True):
         super().__init__()
         self.benchmark_func = benchmark_func
         self.benchmark_name = benchmark_name
+        self.preflight = preflight
     
     def run(self):
         try:
-            result = self.benchmark_func(self.log_callback)
+            if self.preflight:
+                result = BenchmarkManager.run_benchmark(self.benchmark_func, self.log_callback)
+            else:
+                result = self.benchmark_func(self.log_callback)
             self.finished_signal.emit(self.benchmark_name, result)
         except Exception as e:
             self.log_signal.emit(f"[ERR] Error en benchmark: {str(e)}")
@@ -359,7 +363,9 @@ class BenchmarkDialog(QDialog):
         self.run_all_btn.setEnabled(False)
         
         # Crear y ejecutar thread
-        self.current_thread = BenchmarkThread(benchmark_func, benchmark_name)
+        # El benchmark general hace su propio chequeo de reposo por componente
+        self.current_thread = BenchmarkThread(benchmark_func, benchmark_name,
+                                              preflight=benchmark_name != "general")
         self.current_thread.log_signal.connect(self.add_log)
         self.current_thread.finished_signal.connect(self.on_benchmark_finished)
         self.current_thread.start()
@@ -367,7 +373,7 @@ class BenchmarkDialog(QDialog):
     def get_benchmark_function(self, index):
         """Obtiene la función de benchmark según el índice"""
         functions = [
-            self.run_general_benchmark,  # Benchmark general
+            GeneralBenchmark.run,  # Benchmark general
             CPUBenchmark.run_single_core,
             CPUBenchmark.run_multi_core,
             RAMBenchmark.run_write_test,
@@ -378,60 +384,6 @@ class BenchmarkDialog(QDialog):
         ]
         return functions[index] if index < len(functions) else None
     
-    def run_general_benchmark(self, progress_callback=None):
-        """Ejecuta todos los benchmarks y calcula un promedio general"""
-        if progress_callback:
-            progress_callback("[>>] Ejecutando suite completa de benchmarks...")
-        
-        all_scores = []
-        
-        # Ejecutar cada benchmark
-        benchmarks = [
-            ("CPU Single-Core", CPUBenchmark.run_single_core),
-            ("CPU Multi-Core", CPUBenchmark.run_multi_core),
-            ("RAM Write", RAMBenchmark.run_write_test),
-            ("RAM Read", RAMBenchmark.run_read_test),
-            ("Disk Write", DiskBenchmark.run_sequential_write),
-            ("Disk Read", DiskBenchmark.run_sequential_read)
-        ]
-        
-        for name, bench_func in benchmarks:
-            try:
-                if progress_callback:
-                    progress_callback(f"[...] Ejecutando {name}...")
-                result = bench_func(progress_callback)
-                
-                # Normalizar scores (CPU y RAM/Disk tienen diferentes escalas)
-                if "score" in result:
-                    # CPU benchmark - operaciones por segundo
-                    normalized_score = result["score"] / 100  # Normalizar a escala 0-100
-                elif "speed" in result:
-                    # RAM/Disk - MB/s
-                    normalized_score = result["speed"] / 10  # Normalizar a escala similar
-                else:
-                    normalized_score = 50  # Default
-                
-                all_scores.append(normalized_score)
-                
-                if progress_callback:
-                    progress_callback(f"[OK] {name} completado")
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"[ERR] Error en {name}: {str(e)}")
-        
-        # Calcular promedio
-        if all_scores:
-            average_score = sum(all_scores) / len(all_scores)
-            if progress_callback:
-                progress_callback(f"[OK] Score General: {average_score:.1f}/100")
-            
-            return {
-                "score": average_score,
-                "detail": f"Promedio de {len(all_scores)} benchmarks"
-            }
-        
-        return {"score": 0, "detail": "No se pudo calcular"}
-    
     def on_benchmark_finished(self, benchmark_name, result):
         """Callback cuando termina un benchmark"""
         # Guardar resultado
@@ -496,7 +448,7 @@ class BenchmarkDialog(QDialog):
         # Determinar qué valor graficar según el benchmark
         if benchmark_name == "general":
             values = [r["result"]["score"] for r in results]
-            ylabel = "Score General (0-100)"
+            ylabel = "Score General (referencia = 100)"
             title = "Benchmark General - Rendimiento Global"
         elif benchmark_name in ["cpu_single", "cpu_multi"]:
             values = [r["result"]["score"] for r in results]
@@ -575,18 +527,37 @@ class BenchmarkDialog(QDialog):
         self.ax.tick_params(colors=(1,1,1,0.4), length=0)
         self.ax.set_facecolor('none')
         
+        # Las ejecuciones con carga de fondo no cuentan para promedio ni comparaciones
+        noisy = [bool(r["result"].get("noisy")) for r in results]
+        clean_values = [v for v, n in zip(values, noisy) if not n]
+        
         # Añadir línea promedio
-        if len(values) > 1:
-            avg_value = sum(values) / len(values)
+        if len(clean_values) > 1:
+            avg_value = sum(clean_values) / len(clean_values)
             self.ax.axhline(y=avg_value, color='#a78bfa', linestyle='--', alpha=0.6, linewidth=1, label=f'Promedio: {avg_value:.1f}')
             self.ax.legend(loc='upper left', facecolor='#0d0e1f', edgecolor='none', labelcolor='#a78bfa', fontsize=9)
         
+        # Marcar cambios de entorno (hardware, SO o ajustes distintos)
+        for i in range(1, len(results)):
+            prev_env = results[i-1].get("environment")
+            curr_env = results[i].get("environment")
+            if prev_env and curr_env and prev_env != curr_env:
+                self.ax.axvline(x=i - 0.5, color='#facc15', linestyle=':', alpha=0.5, linewidth=1)
+                self.ax.annotate("Entorno distinto", xy=(i - 0.5, 1), xycoords=('data', 'axes fraction'),
+                                 xytext=(3, -12), textcoords="offset points", color='#facc15', fontsize=8)
+
         # Añadir indicadores de mejora (+/-%) en cada punto flotante
-        for i in range(1, len(values)):
-            prev_value = values[i-1]
+        prev_value = None
+        for i in range(len(values)):
             curr_value = values[i]
             
-            if prev_value > 0:
+            if noisy[i]:
+                self.ax.plot(i, curr_value, 'x', color='#9ca3af', markersize=10, markeredgewidth=2)
+                self.ax.annotate("ruido", xy=(i, curr_value), xytext=(0, 12), textcoords="offset points",
+                                 ha='center', color='#9ca3af', fontsize=8)
+                continue
+            
+            if prev_value is not None and prev_value > 0:
                 if benchmark_name == "network_latency":
                     percent_change = ((prev_value - curr_value) / prev_value) * 100
                 else:
@@ -607,7 +578,9 @@ class BenchmarkDialog(QDialog):
                 self.ax.annotate(f"{symbol}{percent_change:.1f}%", xy=(i, curr_value), xytext=(0, y_offset),
                                  textcoords="offset points", ha='center', va='bottom' if percent_change > 0 else 'top',
                                  color=color, fontsize=9, fontweight='bold', bbox=bbox)
-        
+
+            prev_value = curr_value
+
         # Prepara objetos animados vacíos
         self.animation_line, = self.ax.plot([], [], '-', color='#bf00ff', linewidth=4)
         self.animation_points, = self.ax.plot([], [], 'o', color='#e9d5ff', markerfacecolor='#1a1b4b', markeredgewidth=2, markersize=8)
@@ -1,6 +1,5 @@
 import os
 import sys
-import py7zr
 import shutil
 import subprocess
 from config.settings import RESOURCES_7Z, RESOURCES_FOLDER, ANYDESK_EXE
@@ -20,6 +19,8 @@ def extract_7z_resources():
                 target_folder = os.path.join(os.getcwd(), RESOURCES_FOLDER)
                 if os.path.exists(target_folder):
                     return True
+                # py7zr sólo hace falta la primera vez, cuando no hay carpeta extraída
+                import py7zr
                 with py7zr.SevenZipFile(path, mode='r') as z:
                     z.extractall(target_folder)
                 return True
@@ -1,34 +1,291 @@
-import winreg
+try:
+    import winreg
+except ImportError:
+    # Fuera de Windows: sólo queda disponible MemoryRegistryBackend
+    winreg = None
+
+# Tipos de valor (mismos números que winreg, para poder usarlos sin Windows)
+REG_SZ = getattr(winreg, "REG_SZ", 1)
+REG_EXPAND_SZ = getattr(winreg, "REG_EXPAND_SZ", 2)
+REG_BINARY = getattr(winreg, "REG_BINARY", 3)
+REG_DWORD = getattr(winreg, "REG_DWORD", 4)
+REG_MULTI_SZ = getattr(winreg, "REG_MULTI_SZ", 7)
+REG_QWORD = getattr(winreg, "REG_QWORD", 11)
+
+# Nombre o abreviatura de la raíz -> nombre canónico
+HIVE_NAMES = {
+    "HKEY_LOCAL_MACHINE": "HKEY_LOCAL_MACHINE",
+    "HKLM": "HKEY_LOCAL_MACHINE",
+    "HKEY_CURRENT_USER": "HKEY_CURRENT_USER",
+    "HKCU": "HKEY_CURRENT_USER"
+}
+
+
+def split_key_path(key_path):
+    """'HKLM\\SOFTWARE\\...' -> ('HKEY_LOCAL_MACHINE', 'SOFTWARE\\...')"""
+    hive, _, sub_key = key_path.partition("\\")
+    canonical = HIVE_NAMES.get(hive.upper())
+    if canonical is None:
+        raise ValueError(f"Raíz de registro no soportada: {hive}")
+    return canonical, sub_key.strip("\\")
+
+
+class WinRegKeyApi:
+    """Operaciones de bajo nivel sobre claves con winreg"""
+
+    def __init__(self):
+        if winreg is None:
+            raise OSError("winreg no está disponible en esta plataforma")
+
+    def open(self, hive, sub_key, create=False, write=False):
+        access = winreg.KEY_READ | (winreg.KEY_SET_VALUE if write else 0)
+        if create:
+            return winreg.CreateKeyEx(getattr(winreg, hive), sub_key, 0, access)
+        return winreg.OpenKey(getattr(winreg, hive), sub_key, 0, access)
+
+    def query(self, handle, value_name):
+        try:
+            return winreg.QueryValueEx(handle, value_name)
+        except FileNotFoundError:
+            return None
+
+    def set(self, handle, value_name, value, value_type):
+        winreg.SetValueEx(handle, value_name, 0, value_type, value)
+
+    def delete(self, handle, value_name):
+        try:
+            winreg.DeleteValue(handle, value_name)
+        except FileNotFoundError:
+            pass
+
+    def close(self, handle):
+        handle.Close()
+
+
+class MemoryKeyApi:
+    """Las mismas operaciones sobre el diccionario de MemoryRegistryBackend"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def open(self, hive, sub_key, create=False, write=False):
+        key = (hive, sub_key.lower())
+        if key not in self.backend.keys:
+            if not create:
+                raise FileNotFoundError(f"{hive}\\{sub_key}")
+            self.backend.keys[key] = {}
+        self.backend.opens += 1
+        return key
+
+    def query(self, handle, value_name):
+        entry = self.backend.keys[handle].get(value_name.lower())
+        return (entry[1], entry[2]) if entry else None
+
+    def set(self, handle, value_name, value, value_type):
+        if value_type == REG_DWORD and not 0 <= int(value) <= 0xFFFFFFFF:
+            raise OSError(f"Valor fuera de rango para REG_DWORD: {value}")
+        self.backend.keys[handle][value_name.lower()] = (value_name, value, value_type)
+        self.backend.writes.append((handle, value_name, value, value_type))
+
+    def delete(self, handle, value_name):
+        self.backend.keys[handle].pop(value_name.lower(), None)
+
+    def close(self, handle):
+        self.backend.closes += 1
+
+
+class RegistrySession:
+    """Sesión de acceso al registro con handles reutilizados.
+
+    Cada ruta se interpreta una sola vez y cada clave se abre una sola vez
+    (con permiso de escritura si hace falta) y queda en caché hasta close().
+    Las escrituras encoladas con queue_value se aplican agrupadas por clave
+    en flush(). Se usa como context manager: al salir se vacía la cola y se
+    cierran todos los handles, también si hubo una excepción.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, key_api):
+        self.key_api = key_api
+        self._paths = {}
+        self._handles = {}
+        self._queue = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self.close()
+        return False
+
+    def _parse(self, key_path):
+        parsed = self._paths.get(key_path)
+        if parsed is None:
+            hive, sub_key = split_key_path(key_path)
+            parsed = self._paths[key_path] = (hive, sub_key, (hive, sub_key.lower()))
+        return parsed
+
+    def _handle(self, key_path, write=False):
+        """Handle en caché de la clave; None si no existe y no se pide escritura"""
+        hive, sub_key, cache_key = self._parse(key_path)
+        cached = self._handles.get(cache_key)
+        if cached is not None:
+            handle, writable = cached
+            if handle is self._MISSING:
+                if not write:
+                    return None
+            elif writable or not write:
+                return handle
+            else:
+                self.key_api.close(handle)
+            del self._handles[cache_key]
+
+        if write:
+            handle = self.key_api.open(hive, sub_key, create=True, write=True)
+            self._handles[cache_key] = (handle, True)
+            return handle
+
+        try:
+            # Se intenta abrir ya con escritura para no reabrir si luego se escribe
+            handle, writable = self.key_api.open(hive, sub_key, write=True), True
+        except PermissionError:
+            handle, writable = self.key_api.open(hive, sub_key), False
+        except FileNotFoundError:
+            handle, writable = self._MISSING, False
+        self._handles[cache_key] = (handle, writable)
+        return None if handle is self._MISSING else handle
+
+    def get_value(self, key_path, value_name):
+        try:
+            handle = self._handle(key_path)
+        except FileNotFoundError:
+            return None
+        return None if handle is None else self.key_api.query(handle, value_name)
+
+    def set_value(self, key_path, value_name, value, value_type=REG_DWORD):
+        self.key_api.set(self._handle(key_path, write=True), value_name, value, value_type)
+
+    def delete_value(self, key_path, value_name):
+        handle = self._handle(key_path)
+        if handle is not None:
+            self.key_api.delete(self._handle(key_path, write=True), value_name)
+
+    def queue_value(self, key_path, value_name, value, value_type=REG_DWORD):
+        """Encola una escritura; se aplica en flush() junto con las de su clave"""
+        self._queue.setdefault(key_path, []).append((value_name, value, value_type))
+
+    def flush(self):
+        """Aplica la cola agrupada por clave. Devuelve {(ruta, valor): excepción} de las fallidas"""
+        errors = {}
+        groups = {}
+        for key_path, writes in self._queue.items():
+            groups.setdefault(self._parse(key_path)[2], []).append((key_path, writes))
+        self._queue = {}
+
+        for paths in groups.values():
+            try:
+                handle = self._handle(paths[0][0], write=True)
+            except Exception as e:
+                for key_path, writes in paths:
+                    for value_name, _, _ in writes:
+                        errors[(key_path, value_name)] = e
+                continue
+            for key_path, writes in paths:
+                for value_name, value, value_type in writes:
+                    try:
+                        self.key_api.set(handle, value_name, value, value_type)
+                    except Exception as e:
+                        errors[(key_path, value_name)] = e
+        return errors
+
+    def close(self):
+        """Cierra todos los handles abiertos por la sesión"""
+        handles, self._handles = self._handles, {}
+        for handle, _ in handles.values():
+            if handle is not self._MISSING:
+                try:
+                    self.key_api.close(handle)
+                except OSError:
+                    pass
+
+
+class RegistryBackend:
+    """Interfaz de acceso al registro usada por el motor de tweaks.
+
+    session() devuelve una RegistrySession para operaciones en lote; los
+    métodos sueltos abren una sesión propia. get_value devuelve
+    (valor, tipo) o None si el valor no existe; set_value y delete_value
+    lanzan OSError si fallan.
+    """
+
+    def session(self):
+        raise NotImplementedError
+
+    def get_value(self, key_path, value_name):
+        with self.session() as session:
+            return session.get_value(key_path, value_name)
+
+    def set_value(self, key_path, value_name, value, value_type=REG_DWORD):
+        with self.session() as session:
+            session.set_value(key_path, value_name, value, value_type)
+
+    def delete_value(self, key_path, value_name):
+        with self.session() as session:
+            session.delete_value(key_path, value_name)
+
+
+class WinRegBackend(RegistryBackend):
+    """Registro real de Windows a través de winreg (sin procesos externos)"""
+
+    def __init__(self):
+        self._key_api = WinRegKeyApi()
+
+    def session(self):
+        return RegistrySession(self._key_api)
+
+
+class MemoryRegistryBackend(RegistryBackend):
+    """Registro en memoria para probar el motor en cualquier plataforma.
+
+    Como el registro real, no distingue mayúsculas en claves ni en nombres.
+    Cuenta aperturas y cierres de claves para verificar el uso de handles.
+    """
+
+    def __init__(self, values=None):
+        self.keys = {}
+        self.writes = []
+        self.opens = 0
+        self.closes = 0
+        with self.session() as session:
+            for (key_path, value_name), (value, value_type) in (values or {}).items():
+                session.set_value(key_path, value_name, value, value_type)
+        self.writes = []
+        self.opens = self.closes = 0
+
+    def session(self):
+        return RegistrySession(MemoryKeyApi(self))
+
 
 def ensure_registry_key(key_path):
     """Asegura que la clave de registro exista, creándola si es necesario"""
     try:
-        if "HKEY_LOCAL_MACHINE" in key_path:
-            base_key = winreg.HKEY_LOCAL_MACHINE
-            sub_key = key_path.replace("HKEY_LOCAL_MACHINE\\", "")
-        elif "HKEY_CURRENT_USER" in key_path:
-            base_key = winreg.HKEY_CURRENT_USER
-            sub_key = key_path.replace("HKEY_CURRENT_USER\\", "")
-        else:
-            return False
-        winreg.CreateKeyEx(base_key, sub_key, 0, winreg.KEY_SET_VALUE)
+        with RegistrySession(WinRegKeyApi()) as session:
+            session._handle(key_path, write=True)
         return True
     except Exception as e:
         print(f"Error al crear clave de registro: {e}")
         return False
 
-def set_registry_value(key_path, value_name, value_data, value_type=winreg.REG_DWORD):
-    """Establece un valor en el registro de Windows"""
+def set_registry_value(key_path, value_name, value_data, value_type=REG_DWORD):
+    """Establece un valor en el registro de Windows (una sola apertura de la clave)"""
     try:
-        ensure_registry_key(key_path)
-        if "HKEY_LOCAL_MACHINE" in key_path:
-            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path.replace("HKEY_LOCAL_MACHINE\\", ""), 0, winreg.KEY_SET_VALUE)
-        elif "HKEY_CURRENT_USER" in key_path:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path.replace("HKEY_CURRENT_USER\\", ""), 0, winreg.KEY_SET_VALUE)
-        else:
-            return False
-        winreg.SetValueEx(key, value_name, 0, value_type, value_data)
-        winreg.CloseKey(key)
+        with RegistrySession(WinRegKeyApi()) as session:
+            session.set_value(key_path, value_name, value_data, value_type)
         return True
     except Exception as e:
         print(f"Error al modificar el registro: {e}")
@@ -37,14 +294,8 @@ def set_registry_value(key_path, value_name, value_data, value_type=winreg.REG_D
 def get_registry_value(key_path, value_name):
     """Obtiene un valor del registro de Windows"""
     try:
-        if "HKEY_LOCAL_MACHINE" in key_path:
-            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path.replace("HKEY_LOCAL_MACHINE\\", ""), 0, winreg.KEY_READ)
-        elif "HKEY_CURRENT_USER" in key_path:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path.replace("HKEY_CURRENT_USER\\", ""), 0, winreg.KEY_READ)
-        else:
-            return None
-        value, regtype = winreg.QueryValueEx(key, value_name)
-        winreg.CloseKey(key)
-        return value
+        with RegistrySession(WinRegKeyApi()) as session:
+            current = session.get_value(key_path, value_name)
+        return None if current is None else current[0]
     except Exception:
         return None
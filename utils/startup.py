@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+import time
+from contextlib import contextmanager
+
+# Sólo biblioteca estándar: se importa antes que Qt para medir todo el arranque
+_PROCESS_START = time.perf_counter()
+
+
+class StartupProfiler:
+    """Mide las fases del arranque (imports e inicialización de la ventana).
+
+    Se activa con la variable de entorno CACHE_CORE_PROFILE_STARTUP=1 o con
+    el argumento --profile-startup. Desactivado, phase() no registra nada.
+    dump() imprime el desglose en stderr y lo guarda en PROFILE_FILE.
+    """
+
+    ENV_VAR = "CACHE_CORE_PROFILE_STARTUP"
+    FLAG = "--profile-startup"
+    PROFILE_FILE = "data/startup_profile.json"
+
+    enabled = os.environ.get(ENV_VAR, "") not in ("", "0") or FLAG in sys.argv
+    phases = []
+    _depth = 0
+
+    @staticmethod
+    @contextmanager
+    def phase(name):
+        """Registra la duración del bloque (las fases anidadas se indentan)"""
+        if not StartupProfiler.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        entry = {"name": name, "start_ms": round((start - _PROCESS_START) * 1000, 1),
+                 "depth": StartupProfiler._depth}
+        StartupProfiler.phases.append(entry)
+        StartupProfiler._depth += 1
+        try:
+            yield
+        finally:
+            StartupProfiler._depth -= 1
+            entry["ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    @staticmethod
+    def report():
+        return {
+            "total_ms": round((time.perf_counter() - _PROCESS_START) * 1000, 1),
+            "phases": [dict(entry) for entry in StartupProfiler.phases]
+        }
+
+    @staticmethod
+    def dump(path=None):
+        """Imprime el desglose y lo guarda como JSON. No hace nada si está desactivado"""
+        if not StartupProfiler.enabled:
+            return None
+        report = StartupProfiler.report()
+        lines = [f"[PROFILE] Arranque: {report['total_ms']:.1f} ms desde la carga del perfilador"]
+        for entry in report["phases"]:
+            lines.append(f"[PROFILE] {'  ' * entry['depth']}{entry['name']:<{40 - 2 * entry['depth']}} "
+                         f"{entry.get('ms', 0):>8.1f} ms  (t={entry['start_ms']:.0f} ms)")
+        sys.stderr.write("\n".join(lines) + "\n")
+
+        path = path or StartupProfiler.PROFILE_FILE
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            sys.stderr.write(f"[WARN] No se pudo guardar el perfil de arranque: {e}\n")
+        return report
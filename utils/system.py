@@ -1,6 +1,11 @@
 import subprocess
 import sys
+import time
 import ctypes
+import asyncio
+import locale
+import threading
+import functools
 
 def is_admin():
     """Verifica permisos de administrador"""
@@ -9,16 +14,143 @@ def is_admin():
     except Exception:
         return False
 
-def run_command_in_shell(command, timeout=30):
-    """Ejecuta un comando en shell y devuelve si fue exitoso (True/False)"""
-    try:
+class CommandExecutor:
+    """Ejecuta programas sin shell con asyncio, en paralelo y con límite de concurrencia.
+
+    Cada comando es una lista de argumentos o una tupla (argumentos, timeout)
+    si necesita un timeout propio. Devuelve un resultado por comando, en el
+    mismo orden:
+        {"args", "returncode", "stdout", "stderr", "elapsed_s", "timed_out", "error"}
+    Un comando que supera su timeout se mata y queda con timed_out=True y
+    returncode None. Con logger_func cada resultado se informa al terminar.
+
+    Todas las instancias comparten un bucle asyncio que vive en un hilo
+    propio, así cada llamada no crea y destruye un bucle nuevo.
+    """
+
+    _loop = None
+    _loop_lock = threading.Lock()
+
+    def __init__(self, max_concurrency=4, timeout=30, logger_func=None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.logger_func = logger_func
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _popen_kwargs():
+        if sys.platform != "win32":
+            return {}
+        # Sin ventana de consola por proceso; se arma una sola vez y no se modifica
         startupinfo = subprocess.STARTUPINFO()
         startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
         startupinfo.wShowWindow = 0
-        
-        result = subprocess.run(command, shell=True, capture_output=True, 
-                              text=True, timeout=timeout, startupinfo=startupinfo)
-        
-        return result.returncode == 0
-    except Exception:
-        return False
+        return {"startupinfo": startupinfo}
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _encoding():
+        if sys.platform == "win32":
+            # Las herramientas de consola (bcdedit, powercfg...) escriben en la
+            # página de códigos OEM, no en la ANSI que devuelve locale
+            try:
+                return f"cp{ctypes.windll.kernel32.GetOEMCP()}"
+            except Exception:
+                pass
+        return locale.getpreferredencoding(False)
+
+    @staticmethod
+    def _decode(data):
+        return data.decode(CommandExecutor._encoding(), errors="replace") if data else ""
+
+    @staticmethod
+    def describe_error(result):
+        """Motivo del fallo de un resultado (None si terminó bien)"""
+        if result["returncode"] == 0:
+            return None
+        if result["timed_out"]:
+            return f"sin respuesta tras {result['elapsed_s']:.1f}s"
+        if result["error"]:
+            return result["error"]
+        detail = (result["stderr"] or result["stdout"]).strip().splitlines()
+        return f"código {result['returncode']}" + (f" - {detail[-1]}" if detail else "")
+
+    def _log(self, result):
+        if self.logger_func is None:
+            return
+        command = " ".join(result["args"])
+        error = self.describe_error(result)
+        if error is None:
+            self.logger_func(f"[OK] {command} ({result['elapsed_s']:.2f}s)")
+        else:
+            self.logger_func(f"[ERR] {command}: {error}")
+
+    async def _run(self, args, timeout, semaphore):
+        args = [str(arg) for arg in args]
+        result = {"args": args, "returncode": None, "stdout": "", "stderr": "",
+                  "elapsed_s": 0.0, "timed_out": False, "error": None}
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                    stdin=asyncio.subprocess.DEVNULL, **self._popen_kwargs())
+                try:
+                    stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+                    result["returncode"] = process.returncode
+                    result["stdout"] = self._decode(stdout)
+                    result["stderr"] = self._decode(stderr)
+                except asyncio.TimeoutError:
+                    result["timed_out"] = True
+                    process.kill()
+                    await process.wait()
+            except OSError as e:
+                result["error"] = str(e)
+            result["elapsed_s"] = round(time.perf_counter() - start, 3)
+        self._log(result)
+        return result
+
+    async def run_many_async(self, commands):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = []
+        for command in commands:
+            args, timeout = command if isinstance(command, tuple) else (command, None)
+            tasks.append(self._run(args, timeout or self.timeout, semaphore))
+        return await asyncio.gather(*tasks)
+
+    @staticmethod
+    def _event_loop():
+        """Bucle compartido; se crea la primera vez en un hilo daemon"""
+        with CommandExecutor._loop_lock:
+            if CommandExecutor._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True).start()
+                CommandExecutor._loop = loop
+            return CommandExecutor._loop
+
+    def run_many(self, commands):
+        """Ejecuta comandos independientes en paralelo (desde código sin bucle asyncio)"""
+        if not commands:
+            return []
+        future = asyncio.run_coroutine_threadsafe(self.run_many_async(commands), self._event_loop())
+        return future.result()
+
+    def run(self, args, timeout=None):
+        return self.run_many([(args, timeout)])[0]
+
+
+def run_command(args, timeout=30, logger_func=None):
+    """Ejecuta un programa sin shell (lista de argumentos) y devuelve su resultado.
+
+    El resultado es el dict de CommandExecutor; el éxito es returncode == 0.
+    """
+    return CommandExecutor(timeout=timeout, logger_func=logger_func).run(args)
+
+def run_commands(commands, timeout=30, logger_func=None):
+    """Ejecuta comandos independientes en paralelo; un resultado por comando"""
+    return CommandExecutor(timeout=timeout, logger_func=logger_func).run_many(commands)
+
+def run_command_output(args, timeout=30, logger_func=None):
+    """Ejecuta un programa sin shell y devuelve su salida estándar (None si falla)"""
+    result = run_command(args, timeout, logger_func)
+    return result["stdout"] if result["returncode"] == 0 else None